@@ -5,34 +5,44 @@ from fastapi.exceptions import HTTPException
 
 from app.admin.schema import BlogCreate, BlogUpdate, TagCreate, TagUpdate
 from app.blogs.models import Blog, Comment, Tag
+from app.blogs.search.memory import blog_search_index
+from app.blogs.search.service import blog_search_condition
+from app.blogs.services.feed_cache import invalidate_blog_feeds
+from app.blogs.services.leaderboard import popular_leaderboard
+from app.blogs.services.tag_cache import tag_cache
+from app.models.schema import CountMode
+from app.utils.pagination import count_rows, split_page
 
 
 # BLOGS
 async def list_blogs(
-    search: str | None, limit: int, offset: int, session: AsyncSession
+    search: str | None,
+    limit: int,
+    offset: int,
+    session: AsyncSession,
+    count: CountMode = CountMode.EXACT,
 ):
     query = select(Blog)
     total_query = select(func.count()).select_from(Blog)
 
     if search:
-        search_term = f"%{search.lower()}%"
-        condition = func.lower(Blog.title).like(search_term)
+        condition = await blog_search_condition(session, search)
         query = query.where(condition)
         total_query = total_query.where(condition)
 
     query = query.order_by(desc(Blog.created_at)) # type: ignore
 
-    total = await session.execute(total_query)
-    total_result = total.scalar_one()
+    total_result = await count_rows(session, total_query, count)
 
-    blogs = await session.execute(query.limit(limit).offset(offset))
-    blogs_result = blogs.scalars().all()
+    blogs = await session.execute(query.limit(limit + 1).offset(offset))
+    blogs_result, has_more = split_page(blogs.scalars().all(), limit)
 
     return {
         "total": total_result,
         "limit": limit,
         "offset": offset,
         "data": blogs_result,
+        "has_more": has_more if count != CountMode.EXACT else None,
     }
 
 
@@ -54,6 +64,8 @@ async def create_blog(session: AsyncSession, blog_data: BlogCreate, author_id: i
     session.add(blog)
     await session.commit()
     await session.refresh(blog)
+    await blog_search_index.sync(session, blog)
+    await invalidate_blog_feeds()
     return blog
 
 
@@ -67,6 +79,9 @@ async def update_blog(session: AsyncSession, blog_id: int, blog_data: BlogUpdate
 
     await session.commit()
     await session.refresh(blog)
+    await blog_search_index.sync(session, blog)
+    await popular_leaderboard.sync(blog)
+    await invalidate_blog_feeds()
     return blog
 
 
@@ -78,12 +93,19 @@ async def delete_blog(session: AsyncSession, blog_id: int) -> str:
     title = blog.title
     await session.delete(blog)
     await session.commit()
+    await blog_search_index.remove(blog_id)
+    await popular_leaderboard.remove(blog_id)
+    await invalidate_blog_feeds()
     return title
 
 
 # TAGS
 async def list_tags(
-    search: str | None, limit: int, offset: int, session: AsyncSession
+    search: str | None,
+    limit: int,
+    offset: int,
+    session: AsyncSession,
+    count: CountMode = CountMode.EXACT,
 ):
     query = select(Tag)
     total_query = select(func.count()).select_from(Tag)
@@ -94,17 +116,17 @@ async def list_tags(
         query = query.where(condition)
         total_query = total_query.where(condition)
 
-    total = await session.execute(total_query)
-    total_result = total.scalar_one()
+    total_result = await count_rows(session, total_query, count)
 
-    tags = await session.execute(query.limit(limit).offset(offset))
-    tags_result = tags.scalars().all()
+    tags = await session.execute(query.limit(limit + 1).offset(offset))
+    tags_result, has_more = split_page(tags.scalars().all(), limit)
 
     return {
         "total": total_result,
         "limit": limit,
         "offset": offset,
         "data": tags_result,
+        "has_more": has_more if count != CountMode.EXACT else None,
     }
 
 
@@ -119,6 +141,7 @@ async def create_tag(session: AsyncSession, tag_data: TagCreate):
     session.add(tag)
     await session.commit()
     await session.refresh(tag)
+    await tag_cache.invalidate(tag.title)  # type: ignore
     return tag
 
 
@@ -136,10 +159,13 @@ async def update_tag(session: AsyncSession, tag_id: int, tag_data: TagUpdate):
                 status_code=400,
                 detail="Tag already exists with this name",
             )
+        old_title = tag.title
         tag.title = tag_data.title
 
     await session.commit()
     await session.refresh(tag)
+    if tag_data.title:
+        await tag_cache.invalidate(old_title, tag.title)  # type: ignore
     return tag
 
 
@@ -151,12 +177,17 @@ async def delete_tag(session: AsyncSession, tag_id: int):
     title = tag.title
     await session.delete(tag)
     await session.commit()
+    await tag_cache.invalidate(title)  # type: ignore
     return title
 
 
 # COMMENTS
 async def list_comments(
-    search: str | None, limit: int, offset: int, session: AsyncSession
+    search: str | None,
+    limit: int,
+    offset: int,
+    session: AsyncSession,
+    count: CountMode = CountMode.EXACT,
 ):
     query = select(Comment)
     total_query = select(func.count()).select_from(Comment)
@@ -169,17 +200,17 @@ async def list_comments(
 
     query = query.order_by(desc(Comment.created_at))
 
-    total = await session.execute(total_query)
-    total_result = total.scalar_one()
+    total_result = await count_rows(session, total_query, count)
 
-    comments = await session.execute(query.limit(limit).offset(offset))
-    comments_result = comments.scalars().all()
+    comments = await session.execute(query.limit(limit + 1).offset(offset))
+    comments_result, has_more = split_page(comments.scalars().all(), limit)
 
     return {
         "total": total_result,
         "limit": limit,
         "offset": offset,
         "data": comments_result,
+        "has_more": has_more if count != CountMode.EXACT else None,
     }
 
 
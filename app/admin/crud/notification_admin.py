@@ -4,11 +4,17 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from app.admin.schema import NotificationCreate
+from app.models.schema import CountMode
 from app.notifications.models import Notification
+from app.utils.pagination import count_rows, split_page
 
 
 async def list_notifications(
-    search: str | None, limit: int, offset: int, session: AsyncSession
+    search: str | None,
+    limit: int,
+    offset: int,
+    session: AsyncSession,
+    count: CountMode = CountMode.EXACT,
 ):
     query = select(Notification)
     total_query = select(func.count()).select_from(Notification)
@@ -17,20 +23,23 @@ async def list_notifications(
         search_term = f"%{search.lower()}%"
         condition = func.lower(Notification.message).like(search_term)
         query = query.where(condition)
+        total_query = total_query.where(condition)
 
     query = query.order_by(Notification.created_at.desc())
 
-    total = await session.execute(total_query)
-    total_result = total.scalars().one()
+    total_result = await count_rows(session, total_query, count)
 
-    notifications = await session.execute(query.limit(limit).offset(offset))
-    notifications_result = notifications.scalars().all()
+    notifications = await session.execute(query.limit(limit + 1).offset(offset))
+    notifications_result, has_more = split_page(
+        notifications.scalars().all(), limit
+    )
 
     return {
         "total": total_result,
         "limit": limit,
         "offset": offset,
         "data": notifications_result,
+        "has_more": has_more if count != CountMode.EXACT else None,
     }
 
 
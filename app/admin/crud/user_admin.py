@@ -6,13 +6,20 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
 from app.admin.schema import UserCreate, UserUpdate
-from app.auth.hashing import hash_password
+from app.auth.hashing import password_hasher
+from app.auth.principal_cache import principal_cache, principal_subjects
 from app.auth.security import check_password_strength
+from app.models.schema import CountMode
 from app.users.models import User
+from app.utils.pagination import count_rows, split_page
 
 
 async def list_users(
-    search: str | None, limit: int, offset: int, session: AsyncSession
+    search: str | None,
+    limit: int,
+    offset: int,
+    session: AsyncSession,
+    count: CountMode = CountMode.EXACT,
 ):
     query = select(User)
     total_query = select(func.count()).select_from(User)
@@ -21,17 +28,18 @@ async def list_users(
         search_term = f"%{search.lower()}%"
         condition = func.lower(User.full_name).like(search_term)
         query = query.where(condition)
+        total_query = total_query.where(condition)
 
-    total = await session.execute(total_query.limit(limit).offset(offset))
-    total_result = total.scalars().one()
-    users = await session.execute(query)
-    users_result = users.scalars().all()
+    total_result = await count_rows(session, total_query, count)
+    users = await session.execute(query.limit(limit + 1).offset(offset))
+    users_result, has_more = split_page(users.scalars().all(), limit)
 
     return {
         "total": total_result,
         "limit": limit,
         "offset": offset,
         "data": users_result,
+        "has_more": has_more if count != CountMode.EXACT else None,
     }
 
 
@@ -68,7 +76,7 @@ async def create_user(session: AsyncSession, user_data: UserCreate):
         f"{(user_data.first_name).capitalize()} {(user_data.last_name).capitalize()}"
     )
 
-    hashed_password = hash_password(user_data.password)
+    hashed_password = await password_hasher.hash(user_data.password)
 
     new_user = User(
         username=user_data.username,
@@ -88,6 +96,9 @@ async def update_user(session: AsyncSession, user_id: int, user_data: UserUpdate
     if not user:
         raise HTTPException(status_code=404, detail="User not found!")
 
+    # tokens issued under the old username resolve to the old snapshot
+    subjects = principal_subjects(user)
+
     if user_data.username:
         user_data.username = re.sub(r"\s+", "", user_data.username)
         existing_user = await session.execute(
@@ -111,7 +122,7 @@ async def update_user(session: AsyncSession, user_id: int, user_data: UserUpdate
                 status_code=400,
                 detail={"password": user_data.password, "reasons": reasons},
             )
-        user.hashed_password = hash_password(user_data.password)
+        user.hashed_password = await password_hasher.hash(user_data.password)
 
     if user_data.is_active:
         user.is_active = user_data.is_active
@@ -122,6 +133,7 @@ async def update_user(session: AsyncSession, user_id: int, user_data: UserUpdate
     session.add(user)
     await session.commit()
     await session.refresh(user)
+    await principal_cache.invalidate(*subjects, *principal_subjects(user))
     return user
 
 
@@ -133,7 +145,9 @@ async def delete_user(session: AsyncSession, user_id: int) -> str | None:
         raise HTTPException(status_code=404, detail="User doesn't exist!")
 
     username = user.username
+    subjects = principal_subjects(user)
 
     await session.delete(user)
     await session.commit()
+    await principal_cache.invalidate(*subjects)
     return username
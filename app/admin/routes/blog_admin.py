@@ -36,6 +36,7 @@ async def list_blogs_route(
             search=params.search,
             limit=params.limit,
             offset=params.offset,
+            count=params.count,
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -140,6 +141,7 @@ async def list_tags_route(
             search=params.search,
             limit=params.limit,
             offset=params.offset,
+            count=params.count,
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -225,6 +227,7 @@ async def list_comments_route(
             search=params.search,
             limit=params.limit,
             offset=params.offset,
+            count=params.count,
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, Request
+
+from app.admin.utils import get_is_admin_user
+from app.auth.hashing import password_hasher
+from app.auth.principal_cache import principal_cache
+from app.core.services.cache import response_cache
+from app.notifications.fanout import notification_fanout
+from app.realtime.manager import sse_manager
+
+router = APIRouter(tags=["Admin - Metrics"])
+
+
+@router.get("/metrics", dependencies=[Depends(get_is_admin_user)])
+async def get_metrics_route(request: Request):
+    """Runtime counters of in-process services"""
+    return {
+        "response_cache": response_cache.stats(),
+        "principal_cache": principal_cache.stats(),
+        "token_blacklist": request.app.state.token_blacklist.stats(),
+        "password_hasher": password_hasher.stats(),
+        "notification_fanout": notification_fanout.stats(),
+        "sse": sse_manager.stats(),
+    }
@@ -32,6 +32,7 @@ async def list_notifications_route(
             search=params.search,
             limit=params.limit,
             offset=params.offset,
+            count=params.count,
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
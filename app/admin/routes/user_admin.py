@@ -35,6 +35,7 @@ async def list_users_route(
             search=params.search,
             limit=params.limit,
             offset=params.offset,
+            count=params.count,
         )
     except HTTPException:
         raise
@@ -2,8 +2,9 @@ from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.auth.dependency import get_user_by_identifier
-from app.auth.jwt_handler import bearer_scheme, decode_token
+from app.auth.dependency import get_user_by_subject
+from app.auth.jwt_handler import bearer_scheme, request_token_payload, token_subject
+from app.auth.principal_cache import principal_cache
 from app.auth.security import get_token_blacklist
 from app.core.services.database import get_session
 
@@ -18,7 +19,7 @@ async def get_is_admin_user(
     Validates token and checks blacklist.
     """
     token = credentials.credentials
-    payload = decode_token(token, expected_type="access")
+    payload = request_token_payload(request, token)
 
     if not payload:
         raise HTTPException(
@@ -38,15 +39,15 @@ async def get_is_admin_user(
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-    sub = payload.get("sub")
-    if not sub:
+    subject = token_subject(payload)
+    if not subject:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token payload",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = await get_user_by_identifier(session, sub)
+    user = await principal_cache.resolve(session, subject, get_user_by_subject)
 
     if not user:
         raise HTTPException(
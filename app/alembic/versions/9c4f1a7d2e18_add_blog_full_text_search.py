@@ -0,0 +1,100 @@
+"""add_blog_full_text_search
+
+Revision ID: 9c4f1a7d2e18
+Revises: 5b2e9d41c7a3
+Create Date: 2026-10-16 23:05:41.208117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4f1a7d2e18'
+down_revision: Union[str, Sequence[str], None] = '5b2e9d41c7a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _sqlite_has_fts5(bind) -> bool:
+    try:
+        result = bind.exec_driver_sql("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        return bool(result.scalar())
+    except Exception:
+        return False
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'postgresql':
+        op.execute(
+            """
+            ALTER TABLE blog ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(title, '')), 'A')
+                || setweight(to_tsvector('english', coalesce(content, '')), 'B')
+            ) STORED
+            """
+        )
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_blog_search_vector ON blog USING GIN (search_vector)"
+        )
+
+    elif bind.dialect.name == 'sqlite' and _sqlite_has_fts5(bind):
+        op.execute(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS blog_fts USING fts5(
+                title, content, content='blog', content_rowid='id',
+                tokenize='porter unicode61'
+            )
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS blog_fts_insert AFTER INSERT ON blog BEGIN
+                INSERT INTO blog_fts(rowid, title, content)
+                VALUES (new.id, new.title, new.content);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS blog_fts_delete AFTER DELETE ON blog BEGIN
+                INSERT INTO blog_fts(blog_fts, rowid, title, content)
+                VALUES ('delete', old.id, old.title, old.content);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS blog_fts_update AFTER UPDATE OF title, content
+            ON blog BEGIN
+                INSERT INTO blog_fts(blog_fts, rowid, title, content)
+                VALUES ('delete', old.id, old.title, old.content);
+                INSERT INTO blog_fts(rowid, title, content)
+                VALUES (new.id, new.title, new.content);
+            END
+            """
+        )
+        # index the blogs that already exist
+        op.execute("INSERT INTO blog_fts(blog_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_blog_search_vector")
+        op.execute("ALTER TABLE blog DROP COLUMN IF EXISTS search_vector")
+
+    elif bind.dialect.name == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS blog_fts_update")
+        op.execute("DROP TRIGGER IF EXISTS blog_fts_delete")
+        op.execute("DROP TRIGGER IF EXISTS blog_fts_insert")
+        op.execute("DROP TABLE IF EXISTS blog_fts")
@@ -6,7 +6,11 @@ from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
-from app.auth.jwt_handler import create_access_token, create_refresh_token
+from app.auth.jwt_handler import (
+    create_access_token,
+    create_refresh_token,
+    subject_claims,
+)
 from app.users.models import User
 
 # Load env vars
@@ -110,8 +114,9 @@ async def authenticate_with_google(code: str, session: AsyncSession):
             await session.refresh(user)
 
     # Create JWT tokens
-    jwt_access_token = create_access_token({"sub": user.google_id})
-    jwt_refresh_token = create_refresh_token({"sub": user.google_id})
+    claims = subject_claims(user.id)  # type: ignore
+    jwt_access_token = create_access_token(claims)
+    jwt_refresh_token = create_refresh_token(claims)
 
     return {
         "access_token": jwt_access_token,
@@ -5,10 +5,11 @@ from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
-from app.auth.dependency import get_user_by_identifier
-from app.auth.hashing import hash_password, verify_password
+from app.auth.dependency import get_user_by_subject
+from app.auth.hashing import password_hasher
 from app.auth.jwt_handler import (create_access_token, create_refresh_token,
-                                  decode_token)
+                                  decode_token, subject_claims, token_subject)
+from app.auth.principal_cache import principal_cache
 from app.auth.security import TokenBlacklist, check_password_strength
 from app.users.models import User
 
@@ -20,11 +21,24 @@ async def authenticate_user(session: AsyncSession, username: str, password: str)
     user = await session.execute(select(User).where(User.username == username))
     user_result = user.scalars().first()
 
-    if not user_result or not verify_password(password, user_result.hashed_password):  # type: ignore
+    if not user_result:
         raise HTTPException(status_code=400, detail="Incorrect username or password")
 
-    access_token = create_access_token({"sub": user_result.username})
-    refresh_token = create_refresh_token({"sub": user_result.username})
+    valid, new_hash = await password_hasher.verify(
+        password, user_result.hashed_password
+    )
+    if not valid:
+        raise HTTPException(status_code=400, detail="Incorrect username or password")
+
+    # hashed with an older cost factor: store it hashed with the current one
+    if new_hash:
+        user_result.hashed_password = new_hash
+        session.add(user_result)
+        await session.commit()
+
+    claims = subject_claims(user_result.id)  # type: ignore
+    access_token = create_access_token(claims)
+    refresh_token = create_refresh_token(claims)
 
     return {
         "access_token": access_token,
@@ -69,7 +83,7 @@ async def register_user(session: AsyncSession, user_data):
         username=user_data.username,
         email=user_data.email,
         full_name=full_name,
-        hashed_password=hash_password(user_data.password),
+        hashed_password=await password_hasher.hash(user_data.password),
         is_verified=False,  # User must verify email
     )
     session.add(new_user)
@@ -82,8 +96,9 @@ async def register_user(session: AsyncSession, user_data):
     except Exception:
         pass  # Log error is handled in the function
 
-    access_token = create_access_token({"sub": new_user.username})
-    refresh_token = create_refresh_token({"sub": new_user.username})
+    claims = subject_claims(new_user.id)  # type: ignore
+    access_token = create_access_token(claims)
+    refresh_token = create_refresh_token(claims)
 
     return {
         "access_token": access_token,
@@ -120,6 +135,9 @@ async def logout_user(token: str, blacklist: TokenBlacklist):
     else:
         await blacklist.blacklist_token(jti, expire=3600)
 
+    # the next login reads the user afresh
+    await principal_cache.invalidate(token_subject(payload))  # type: ignore
+
     return {"detail": "Logged out successfully"}
 
 
@@ -138,11 +156,11 @@ async def refresh_tokens(
     if jti and await blacklist.is_blacklisted(jti):
         raise HTTPException(status_code=401, detail="Refresh token has been revoked")
 
-    sub = payload.get("sub")
-    if not sub:
+    subject = token_subject(payload)
+    if not subject:
         raise HTTPException(status_code=401, detail="Invalid token payload")
 
-    user = await get_user_by_identifier(session, sub)
+    user = await get_user_by_subject(session, subject)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -155,8 +173,10 @@ async def refresh_tokens(
             if ttl > 0:
                 await blacklist.blacklist_token(jti, expire=ttl)
 
-    access_token = create_access_token({"sub": user.username or user.google_id})
-    new_refresh_token = create_refresh_token({"sub": user.username or user.google_id})
+    # tokens issued before ids were used are refreshed into id tokens
+    claims = subject_claims(user.id)  # type: ignore
+    access_token = create_access_token(claims)
+    new_refresh_token = create_refresh_token(claims)
 
     return {
         "access_token": access_token,
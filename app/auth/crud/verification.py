@@ -5,8 +5,9 @@ from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
-from app.auth.hashing import hash_password
+from app.auth.hashing import password_hasher
 from app.auth.models import VerificationToken
+from app.auth.principal_cache import principal_cache
 from app.auth.security import check_password_strength
 from app.core.services.email import EmailService
 from app.users.models import User
@@ -115,6 +116,7 @@ async def verify_email(session: AsyncSession, token: str) -> dict:
     verification_token.used = True
 
     await session.commit()
+    await principal_cache.invalidate_user(user)
 
     return {"detail": "Email verified successfully"}
 
@@ -253,7 +255,7 @@ async def reset_password(
         )
 
     # Update password and mark token as used
-    user.hashed_password = hash_password(new_password)
+    user.hashed_password = await password_hasher.hash(new_password)
     verification_token.used = True
 
     await session.commit()
@@ -1,9 +1,18 @@
-from fastapi import Depends, HTTPException, Query, Request, status
+from fastapi import (
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    WebSocket,
+    WebSocketException,
+    status,
+)
 from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
-from app.auth.jwt_handler import bearer_scheme, decode_token
+from app.auth.jwt_handler import bearer_scheme, request_token_payload, token_subject
+from app.auth.principal_cache import principal_cache
 from app.auth.security import get_token_blacklist
 from app.core.services.database import get_session
 from app.users.models import User
@@ -23,6 +32,20 @@ async def get_user_by_identifier(session: AsyncSession, identifier: str):
     return user_result
 
 
+async def get_user_by_subject(session: AsyncSession, subject: str):
+    """Get user by a principal from `token_subject`"""
+    kind, _, identifier = subject.partition(":")
+    if kind == "id":
+        try:
+            user_id = int(identifier)
+        except ValueError:
+            return None
+        # reuses the user if this session already loaded it
+        return await session.get(User, user_id)
+
+    return await get_user_by_identifier(session, identifier)
+
+
 async def get_current_user(
     request: Request,
     credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
@@ -40,7 +63,7 @@ async def get_current_user(
         )
 
     token = credentials.credentials
-    payload = decode_token(token, expected_type="access")
+    payload = request_token_payload(request, token)
 
     if not payload:
         raise HTTPException(
@@ -60,15 +83,15 @@ async def get_current_user(
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-    sub = payload.get("sub")
-    if not sub:
+    subject = token_subject(payload)
+    if not subject:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token payload",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = await get_user_by_identifier(session, sub)
+    user = await principal_cache.resolve(session, subject, get_user_by_subject)
 
     if not user:
         raise HTTPException(
@@ -87,7 +110,7 @@ async def get_current_user_from_query(
     """
     Get current authenticated user from JWT token passed in query params.
     """
-    payload = decode_token(token, expected_type="access")
+    payload = request_token_payload(request, token)
 
     if not payload:
         raise HTTPException(
@@ -107,15 +130,15 @@ async def get_current_user_from_query(
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-    sub = payload.get("sub")
-    if not sub:
+    subject = token_subject(payload)
+    if not subject:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token payload",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = await get_user_by_identifier(session, sub)
+    user = await principal_cache.resolve(session, subject, get_user_by_subject)
 
     if not user:
         raise HTTPException(
@@ -124,3 +147,26 @@ async def get_current_user_from_query(
         )
 
     return user
+
+
+async def get_current_user_from_websocket(
+    websocket: WebSocket,
+    token: str = Query(...),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Get current authenticated user from JWT token passed in the query params
+    of a WebSocket handshake, rejecting the handshake when it's not valid.
+    """
+    try:
+        user = await get_current_user_from_query(
+            websocket, token, session  # type: ignore
+        )
+    except HTTPException as e:
+        raise WebSocketException(
+            code=status.WS_1008_POLICY_VIOLATION, reason=str(e.detail)
+        )
+
+    # don't hold a database connection for the lifetime of the socket
+    await session.close()
+    return user
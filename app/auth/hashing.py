@@ -1,6 +1,36 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Tuple
+
+from fastapi import HTTPException
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt cost factor of new hashes; older hashes are upgraded on login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# Server processes on this host; each one starts its own hashing pool
+WEB_CONCURRENCY = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+
+# Processes hashing passwords off the event loop, per server process. The
+# default splits the CPUs between the server processes so that every pool
+# together runs about one hash per core; more only adds context switching
+HASHING_WORKERS = int(
+    os.getenv(
+        "HASHING_WORKERS", str(max(1, (os.cpu_count() or 1) // WEB_CONCURRENCY))
+    )
+)
+
+# Hashes queued or running at once before new ones are turned away
+HASHING_MAX_PENDING = int(
+    os.getenv("HASHING_MAX_PENDING", str(HASHING_WORKERS * 8))
+)
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS
+)
 
 
 def hash_password(password: str) -> str:
@@ -9,3 +39,100 @@ def hash_password(password: str) -> str:
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+
+def verify_and_update(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, str | None]:
+    """Whether the password matches, and its new hash if it should be upgraded"""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a pool of worker processes, so hashing a password never
+    blocks the event loop.
+
+    At most `max_pending` hashes wait for or run in the pool; past that,
+    requests are turned away with a 503 instead of queueing without bound.
+    Before `start`, hashing runs in the loop's default thread pool.
+    """
+
+    def __init__(
+        self,
+        workers: int = HASHING_WORKERS,
+        max_pending: int = HASHING_MAX_PENDING,
+    ):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.executor: ProcessPoolExecutor | None = None
+        self.pending = 0
+        self.busy_seconds = 0.0
+        self.metrics: Dict[str, int] = {
+            "hashes": 0,
+            "verifications": 0,
+            "rehashes": 0,
+            "rejected": 0,
+        }
+
+    def start(self):
+        # spawned workers don't inherit the server's threads and sockets
+        self.executor = ProcessPoolExecutor(
+            self.workers, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    def shutdown(self):
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    async def hash(self, password: str) -> str:
+        hashed_password = await self._run(hash_password, password)
+        self.metrics["hashes"] += 1
+        return hashed_password
+
+    async def verify(
+        self, password: str, hashed_password: str | None
+    ) -> Tuple[bool, str | None]:
+        """
+        Whether `password` matches `hashed_password`, and the hash to store
+        instead when it was made with outdated settings
+        """
+        valid, new_hash = await self._run(verify_and_update, password, hashed_password)
+        self.metrics["verifications"] += 1
+        if new_hash:
+            self.metrics["rehashes"] += 1
+        return valid, new_hash
+
+    def stats(self) -> Dict[str, Any]:
+        completed = self.metrics["hashes"] + self.metrics["verifications"]
+        return {
+            **self.metrics,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "workers": self.workers if self.executor else 0,
+            "mean_ms": round(self.busy_seconds / completed * 1000, 1)
+            if completed
+            else 0.0,
+        }
+
+    async def _run(self, function, *args):
+        if self.pending >= self.max_pending:
+            self.metrics["rejected"] += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Too many password checks in progress, try again shortly",
+                headers={"Retry-After": "1"},
+            )
+
+        self.pending += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, function, *args)
+        finally:
+            self.pending -= 1
+            self.busy_seconds += time.perf_counter() - started
+
+
+password_hasher = PasswordHasher()
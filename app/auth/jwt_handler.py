@@ -1,19 +1,52 @@
+import base64
 import os
 import uuid
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Optional
 
+import jwt
+from fastapi.requests import HTTPConnection
 from fastapi.security import HTTPBearer
-from jose import JWTError, jwt
+from jwt import PyJWK, PyJWTError
 
 SECRET_KEY = os.getenv("SECRET_KEY") or ""
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 REFRESH_TOKEN_EXPIRE_DAYS = 1
 
+# Marks tokens whose `sub` is the user's primary key. Tokens issued before it
+# carry the username or the Google id instead, and are accepted until they expire
+SUBJECT_TYPE = "user_id"
+
 bearer_scheme = HTTPBearer(auto_error=False)
 
 
+@lru_cache(maxsize=1)
+def signing_key() -> PyJWK:
+    """HS256 key object, built from SECRET_KEY once and reused by every token"""
+    secret = base64.urlsafe_b64encode(SECRET_KEY.encode()).rstrip(b"=").decode()
+    return PyJWK({"kty": "oct", "k": secret}, algorithm=ALGORITHM)
+
+
+def subject_claims(user_id: int) -> dict:
+    """Claims identifying the user a token is issued to"""
+    return {"sub": str(user_id), "sub_type": SUBJECT_TYPE}
+
+
+def token_subject(payload: dict) -> Optional[str]:
+    """
+    Principal identified by a decoded token: `id:<user id>`, or
+    `legacy:<username or Google id>` for tokens issued before ids were used
+    """
+    sub = payload.get("sub")
+    if not sub:
+        return None
+    if payload.get("sub_type") == SUBJECT_TYPE:
+        return f"id:{sub}"
+    return f"legacy:{sub}"
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (
@@ -21,7 +54,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     )
     to_encode.update({"exp": expire, "type": "access", "jti": str(uuid.uuid4())})
 
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    return jwt.encode(to_encode, signing_key(), algorithm=ALGORITHM)
 
 
 def create_refresh_token(data: dict, expires_delta: timedelta | None = None) -> str:
@@ -31,12 +64,12 @@ def create_refresh_token(data: dict, expires_delta: timedelta | None = None) ->
     )
     to_encode.update({"exp": expire, "type": "refresh", "jti": str(uuid.uuid4())})
 
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    return jwt.encode(to_encode, signing_key(), algorithm=ALGORITHM)
 
 
 def decode_token(token: str, expected_type: Optional[str] = None) -> Optional[dict]:
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, signing_key(), algorithms=[ALGORITHM])
 
         # validate token type if specified
         if expected_type and payload.get("type") != expected_type:
@@ -44,5 +77,19 @@ def decode_token(token: str, expected_type: Optional[str] = None) -> Optional[di
 
         return payload
 
-    except JWTError:
+    except PyJWTError:
         return None
+
+
+def request_token_payload(request: HTTPConnection, token: str) -> Optional[dict]:
+    """
+    Payload of the access token `token`, decoded once per request and kept on
+    `request.state` for the rate limiter and the auth dependencies
+    """
+    decoded = getattr(request.state, "access_token", None)
+    if decoded is not None and decoded[0] == token:
+        return decoded[1]
+
+    payload = decode_token(token, expected_type="access")
+    request.state.access_token = (token, payload)
+    return payload
@@ -0,0 +1,200 @@
+import json
+import math
+import os
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.services.cache import LRUCache
+from app.users.models import User
+from app.utils.logger import logger
+
+# Seconds a resolved user is trusted before it's read from the database again
+PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", "60"))
+
+# Max users kept in process memory
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+
+# User columns never cached; loaded on demand by the code that needs them
+EXCLUDED_COLUMNS = ("hashed_password",)
+
+
+def principal_subjects(user: User) -> List[str]:
+    """Token subjects that may identify `user`, including legacy ones"""
+    legacy = [
+        f"legacy:{identifier}"
+        for identifier in (user.username, user.google_id)
+        if identifier
+    ]
+    return [f"id:{user.id}", *legacy]
+
+
+class PrincipalCache:
+    """
+    Snapshots of authenticated users, by token subject.
+
+    Lookups go to the in-process LRU first, then to Redis when a Redis tier is
+    bound, so authenticating a known user costs no database query. Snapshots
+    expire after a short TTL and are dropped from Redis and from every
+    worker's LRU (through a pub/sub message) when the user changes.
+    """
+
+    prefix = "principal"
+    channel = "principal_cache:invalidate"
+
+    def __init__(
+        self,
+        max_entries: int = PRINCIPAL_CACHE_MAX_ENTRIES,
+        ttl: float = PRINCIPAL_CACHE_TTL,
+    ):
+        self.ttl = ttl
+        self.local = LRUCache(max_entries, ttl)
+        self.redis_manager = None
+        self.metrics: Dict[str, int] = {
+            "local_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "invalidations": 0,
+            "errors": 0,
+        }
+
+    def bind(self, redis_manager):
+        """Use `redis_manager` as the shared tier; drops users cached so far"""
+        self.redis_manager = redis_manager
+        self.local.clear()
+
+    async def resolve(
+        self, session: AsyncSession, subject: str, loader
+    ) -> User | None:
+        """
+        The user identified by `subject`, attached to `session` so it can be
+        updated like a loaded one. `loader(session, subject)` reads it on a miss.
+        """
+        snapshot = await self._get(subject)
+        if snapshot is not None:
+            return self._attach(session, snapshot)
+
+        self.metrics["misses"] += 1
+        user = await loader(session, subject)
+        if user is not None:
+            await self._set(subject, user)
+        return user
+
+    def forget(self, subjects: Iterable[str]):
+        """Drop `subjects` from this worker's LRU"""
+        for subject in subjects:
+            self.local.entries.pop(self._key(subject), None)
+
+    async def invalidate(self, *subjects: str):
+        """Drop `subjects` from every tier and every worker"""
+        subjects = tuple(dict.fromkeys(subject for subject in subjects if subject))
+        if not subjects:
+            return
+
+        self.metrics["invalidations"] += 1
+        self.forget(subjects)
+
+        if self.redis_manager is None:
+            return
+
+        try:
+            client = self.redis_manager.get_client()
+            await client.delete(*(self._key(subject) for subject in subjects))
+            await self.redis_manager.publish(self.channel, json.dumps(subjects))
+        except Exception as e:
+            self.metrics["errors"] += 1
+            logger.warning(f"Principal cache invalidation failed: {e}")
+
+    async def invalidate_user(self, user: User):
+        await self.invalidate(*principal_subjects(user))
+
+    async def listen(self):
+        """Apply invalidations published by other workers"""
+        try:
+            pubsub = await self.redis_manager.subscribe(self.channel)  # type: ignore
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    try:
+                        self.forget(json.loads(message["data"]))
+                    except Exception as e:
+                        logger.error(f"Error processing principal message: {e}")
+        except Exception as e:
+            logger.error(f"Principal cache listener error: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.metrics["local_hits"] + self.metrics["redis_hits"]
+        lookups = hits + self.metrics["misses"]
+        return {
+            **self.metrics,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "local_entries": len(self.local),
+        }
+
+    def _key(self, subject: str) -> str:
+        return f"{self.prefix}:{subject}"
+
+    async def _get(self, subject: str) -> Dict[str, Any] | None:
+        key = self._key(subject)
+        snapshot = self.local.get(key)
+        if snapshot is not None:
+            self.metrics["local_hits"] += 1
+            return snapshot
+
+        if self.redis_manager is None:
+            return None
+
+        try:
+            value = await self.redis_manager.get_client().get(key)
+        except Exception as e:
+            self.metrics["errors"] += 1
+            logger.warning(f"Principal cache read failed: {e}")
+            return None
+
+        if value is None:
+            return None
+
+        self.metrics["redis_hits"] += 1
+        snapshot = json.loads(value)
+        self.local.set(key, snapshot)
+        return snapshot
+
+    async def _set(self, subject: str, user: User):
+        key = self._key(subject)
+        snapshot = {
+            column.key: getattr(user, column.key)
+            for column in User.__table__.columns  # type: ignore
+            if column.key not in EXCLUDED_COLUMNS
+        }
+        value = json.dumps(snapshot, default=str)
+        # the local tier keeps what Redis would return
+        self.local.set(key, json.loads(value))
+
+        if self.redis_manager is None:
+            return
+
+        try:
+            await self.redis_manager.get_client().set(
+                key, value, ex=math.ceil(self.ttl)
+            )
+        except Exception as e:
+            self.metrics["errors"] += 1
+            logger.warning(f"Principal cache write failed: {e}")
+
+    @staticmethod
+    def _attach(session: AsyncSession, snapshot: Dict[str, Any]) -> User:
+        # already resolved in this session by another dependency
+        identity = session.sync_session.identity_key(User, snapshot["id"])
+        loaded = session.identity_map.get(identity)
+        if loaded is not None:
+            return loaded  # type: ignore
+
+        user = User.model_validate(snapshot)
+        make_transient_to_detached(user)
+        session.add(user)
+        # reading an excluded column must load it, never see a default
+        session.expire(user, EXCLUDED_COLUMNS)
+        return user
+
+
+principal_cache = PrincipalCache()
@@ -1,13 +1,64 @@
+import asyncio
+import os
+from typing import Any, Dict
+
 import redis.asyncio as redis
 from fastapi import Request
 
+from app.core.services.bloom import BloomFilter
+from app.utils.logger import logger
+
+# Revoked tokens the in-process filter is sized for; it grows on rebuild
+TOKEN_BLACKLIST_FILTER_CAPACITY = int(
+    os.getenv("TOKEN_BLACKLIST_FILTER_CAPACITY", "100000")
+)
+
+# Share of unrevoked tokens the filter sends to Redis anyway
+TOKEN_BLACKLIST_FILTER_ERROR_RATE = float(
+    os.getenv("TOKEN_BLACKLIST_FILTER_ERROR_RATE", "0.001")
+)
+
+# Seconds between rebuilds of the filter from Redis, dropping expired tokens
+TOKEN_BLACKLIST_REBUILD_INTERVAL = float(
+    os.getenv("TOKEN_BLACKLIST_REBUILD_INTERVAL", "300")
+)
+
 # Token blacklist
 
 
 class TokenBlacklist:
-    def __init__(self, redis_client: redis.Redis):
+    """
+    Revoked token ids, stored in Redis with the token's remaining lifetime.
+
+    Each worker keeps a bloom filter of the revoked ids, filled from Redis and
+    kept current by a pub/sub message per revocation. A token not in the
+    filter was not revoked, so only probable hits are checked in Redis. Until
+    the filter is built, or when the listener loses its subscription, every
+    check goes to Redis.
+    """
+
+    channel = "token_blacklist:revoked"
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        capacity: int = TOKEN_BLACKLIST_FILTER_CAPACITY,
+        error_rate: float = TOKEN_BLACKLIST_FILTER_ERROR_RATE,
+    ):
         self.redis = redis_client
         self.prefix = "blacklisted_token:"
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.filter = BloomFilter(capacity, error_rate)
+        self.ready = False
+        self._building: BloomFilter | None = None
+        self.metrics: Dict[str, int] = {
+            "local_checks": 0,
+            "redis_checks": 0,
+            "false_positives": 0,
+            "rebuilds": 0,
+            "errors": 0,
+        }
 
     async def blacklist_token(self, jti: str, expire: int | None = None):
         """
@@ -24,10 +75,26 @@ class TokenBlacklist:
             # set without expiration
             await self.redis.set(key, "1")
 
+        self._add(jti)
+        try:
+            await self.redis.publish(self.channel, jti)
+        except Exception as e:
+            # other workers still find it on their next rebuild
+            self.metrics["errors"] += 1
+            logger.warning(f"Token revocation publish failed: {e}")
+
     async def is_blacklisted(self, jti: str) -> bool:
+        # never revoked if the filter doesn't have it
+        if self.ready and jti not in self.filter:
+            self.metrics["local_checks"] += 1
+            return False
+
         # check if token is blacklisted
+        self.metrics["redis_checks"] += 1
         key = self.prefix + jti
         exists = await self.redis.exists(key)
+        if exists != 1 and self.ready:
+            self.metrics["false_positives"] += 1
         return exists == 1
 
     async def remove_token(self, jti: str):
@@ -35,6 +102,67 @@ class TokenBlacklist:
         key = self.prefix + jti
         await self.redis.delete(key)
 
+    async def rebuild(self):
+        """Build a new filter from the ids in Redis and swap it in"""
+        # sized for the revocations seen so far to keep the error rate
+        capacity = max(self.capacity, 2 * len(self.filter))
+        building = BloomFilter(capacity, self.error_rate)
+        # revocations received while scanning are kept too
+        self._building = building
+        try:
+            async for key in self.redis.scan_iter(match=self.prefix + "*"):
+                building.add(key[len(self.prefix) :])
+        finally:
+            self._building = None
+
+        self.filter = building
+        self.ready = True
+        self.metrics["rebuilds"] += 1
+
+    async def listen(self):
+        """Apply revocations published by other workers"""
+        try:
+            pubsub = self.redis.pubsub()
+            await pubsub.subscribe(self.channel)
+            # subscribed first, so no revocation falls between scan and listen
+            await self.rebuild()
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    self._add(message["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Token blacklist listener error: {e}")
+        finally:
+            # revocations may be missed from now on
+            self.ready = False
+
+    async def run_rebuilder(self, interval: float = TOKEN_BLACKLIST_REBUILD_INTERVAL):
+        """Rebuild the filter every `interval` seconds until cancelled"""
+        while True:
+            await asyncio.sleep(interval)
+            if not self.ready:
+                # the listener isn't applying revocations
+                continue
+            try:
+                await self.rebuild()
+            except Exception as e:
+                self.metrics["errors"] += 1
+                logger.error(f"Error rebuilding token blacklist filter: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.metrics,
+            "ready": self.ready,
+            "filter_entries": len(self.filter),
+            "filter_bytes": (self.filter.size + 7) // 8,
+        }
+
+    def _add(self, jti: str):
+        self.filter.add(jti)
+        if self._building is not None:
+            self._building.add(jti)
+
 
 async def get_token_blacklist(request: Request) -> TokenBlacklist:
     return request.app.state.token_blacklist
@@ -1,23 +1,36 @@
 import asyncio
 from typing import List
 
-from fastapi import HTTPException, Request, UploadFile
+from fastapi import HTTPException, UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
-from sqlmodel import and_, col, delete, exists, func, select
-
-from app.blogs.models import Blog, BlogTagLink, Comment, Tag
+from sqlmodel import and_, delete, func, select
+
+from app.blogs.crud.tags import link_tags, parse_tags, upsert_tags
+from app.blogs.models import Blog, BlogTagLink, Comment
+from app.blogs.search.memory import blog_search_index
+from app.blogs.search.service import blog_search_condition, match_blogs
+from app.blogs.services.feed_cache import invalidate_blog_feeds
+from app.blogs.services.leaderboard import popular_leaderboard
+from app.blogs.services.tag_cache import tag_cache, tag_filter_condition
+from app.blogs.services.views import view_counter
+from app.models.schema import CountMode
+from app.notifications.fanout import notification_fanout
 from app.notifications.models import NotificationType
-from app.notifications.service import create_notifications
-from app.users.models import User, UserFollowLink
+from app.users.models import User
 from app.users.schema import CurrentUserRead
+from app.utils.pagination import (
+    build_next_cursor,
+    count_rows,
+    keyset_condition,
+    split_page,
+)
 from app.utils.remove_image import remove_image
 from app.utils.save_image import save_image
 
 
 async def create_new_blog(
     session: AsyncSession,
-    request: Request,
     title: str,
     thumbnail_url: str | None,
     content: str,
@@ -47,47 +60,36 @@ async def create_new_blog(
     )
 
     session.add(new_blog)
+
+    # tags and their links go in the same transaction as the blog
+    tag_titles = parse_tags(tags)
+    created_tags: List[str] = []
+    if tag_titles:
+        await session.flush()
+        tag_ids, created_tags = await upsert_tags(session, tag_titles)
+        await link_tags(session, new_blog.id, list(tag_ids.values()))  # type: ignore
+
     await session.commit()
     await session.refresh(new_blog)
 
-    # Only send notifications if not a draft
-    if not is_draft:
-
-        # listing followers of current user to create notification for them
-        followers = await session.execute(
-            select(UserFollowLink.follower_id).where(
-                UserFollowLink.following_id == current_user.id
-            )
-        )
-        followers_ids: List[int] = list(followers.scalars().all())
+    if created_tags:
+        await tag_cache.invalidate(*created_tags)
 
-        await create_notifications(
-            request=request,
-            session=session,
-            owner_ids=followers_ids,
-            triggered_by_user_id=current_user.id,
+    # Followers are notified in the background, only about published blogs
+    if not is_draft:
+        await notification_fanout.enqueue(
+            session,
+            author_id=current_user.id,
             notification_type=NotificationType.NEW_BLOG,
             blog_id=new_blog.id,
             message=f"{current_user.full_name} uploaded new blog {new_blog.title}",
         )
-        # creating notification for all users in single query
 
-    if tags:
-        # split tags by #
-        tag_list = [t.strip() for t in tags.split("#") if t.strip()]
-        for tag in tag_list:
-            result = await session.execute(select(Tag).where(Tag.title == tag))
-            current_tag = result.scalars().first()
-            if not current_tag:
-                current_tag = Tag(title=tag)
-                session.add(current_tag)
-                await session.flush()
-
-            new_link = BlogTagLink(blog_id=new_blog.id, tag_id=current_tag.id)
-            session.add(new_link)
-
-        await session.commit()
-        await session.refresh(new_blog)
+    await blog_search_index.sync(session, new_blog)
+
+    # drafts aren't listed in any feed
+    if not is_draft:
+        await invalidate_blog_feeds()
 
     return new_blog
 
@@ -98,33 +100,28 @@ async def get_all_blogs(
     limit: int,
     offset: int,
     tags: List[str] | None,
+    cursor: str | None = None,
+    count: CountMode = CountMode.EXACT,
 ):
     """
     Retrieve paginated list of blogs, optionally filtered by a search term in the title.
 
-    Returns a dict with total count, pagination info, and blog data.
+    Pages by `cursor` (keyset on blog id) when given, otherwise by `offset`.
+
+    Returns a tuple of (blogs, total_count, has_more, next_cursor).
     """
+    order_key = (Blog.id,)
 
     base_query = select(Blog).where(Blog.is_public == True, Blog.is_draft == False)
 
     conditions = []
 
     if search:
-        search_term = f"%{search.lower()}%"
-        conditions.append(func.lower(Blog.title).like(search_term))
+        conditions.append(await blog_search_condition(session, search))
 
     # Tag filtering
     if tags:
-        # Create a subquery that checks if a blog has all required tags
-        tag_subquery = (
-            select(BlogTagLink.blog_id)
-            .join(Tag, BlogTagLink.tag_id == Tag.id)  # type: ignore
-            .where(and_(BlogTagLink.blog_id == Blog.id, col(Tag.title).in_(tags)))
-            .group_by(BlogTagLink.blog_id)  # type: ignore
-            .having(func.count(func.distinct(Tag.id)) == len(tags))
-        )
-
-        conditions.append(exists(tag_subquery))
+        conditions.append(await tag_filter_condition(session, tags))
 
     if conditions:
         filtered_query = base_query.where(and_(*conditions))
@@ -135,10 +132,15 @@ async def get_all_blogs(
     blogs_query = (
         filtered_query.options(selectinload(Blog.tags))  # type: ignore
         .order_by(Blog.id)  # type: ignore
-        .limit(limit)
-        .offset(offset)
+        .limit(limit + 1)  # one extra row tells whether another page exists
     )
 
+    # seek past the cursor instead of scanning and discarding OFFSET rows
+    if cursor:
+        blogs_query = blogs_query.where(keyset_condition(order_key, cursor))
+    else:
+        blogs_query = blogs_query.offset(offset)
+
     # create count query
     count_query = select(func.count(Blog.id)).where(  # type: ignore
         Blog.is_public == True, Blog.is_draft == False
@@ -149,53 +151,159 @@ async def get_all_blogs(
         count_query = count_query.where(and_(*conditions))
 
     # Execute both queries concurrently
-    blogs_result, total_result = await asyncio.gather(
-        session.execute(blogs_query), session.execute(count_query)
+    blogs_result, total = await asyncio.gather(
+        session.execute(blogs_query), count_rows(session, count_query, count)
     )
 
-    blogs = blogs_result.scalars().all()
-    total = total_result.scalar_one()
+    blogs, has_more = split_page(blogs_result.scalars().all(), limit)
 
-    return blogs, total
+    return blogs, total, has_more, build_next_cursor(blogs, has_more, order_key)
 
 
 async def get_popular_blogs(
     session: AsyncSession,
     limit: int,
     offset: int,
+    cursor: str | None = None,
+    count: CountMode = CountMode.EXACT,
 ):
     """
-    Retrieve paginated list of popular blogs, optionally filtered by a search term in the title.
+    Retrieve paginated list of blogs with the highest all-time engagement score.
+
+    Offset pages are read from the Redis leaderboard when it's available,
+    `cursor` pages (keyset on engagement score and id) from the database.
 
-    Returns a dict with total count, pagination info, and blog data.
+    Returns a tuple of (blogs, total_count, has_more, next_cursor).
     """
+    ranked = None if cursor else await popular_leaderboard.page(offset, limit)
+    if ranked is None:
+        return await _get_ranked_blogs(
+            session, Blog.engagement_score, limit, offset, cursor, count
+        )
 
-    base_query = select(Blog).where(
-        (Blog.is_public) & (Blog.engagement_score > 0) & (Blog.is_draft == False)
+    blog_ids, total = ranked
+    blog_ids, has_more = split_page(blog_ids, limit)
+
+    result = await session.execute(
+        select(Blog)
+        .where(Blog.id.in_(blog_ids))  # type: ignore
+        .options(selectinload(Blog.tags))  # type: ignore
+    )
+    blogs_by_id = {blog.id: blog for blog in result.scalars().all()}
+    blogs = [blogs_by_id[blog_id] for blog_id in blog_ids if blog_id in blogs_by_id]
+
+    order_key = (Blog.engagement_score, Blog.id)
+    return (
+        blogs,
+        total if count != CountMode.NONE else None,
+        has_more,
+        build_next_cursor(blogs, has_more, order_key),
+    )
+
+
+async def get_trending_blogs(
+    session: AsyncSession,
+    limit: int,
+    offset: int,
+    cursor: str | None = None,
+    count: CountMode = CountMode.EXACT,
+):
+    """
+    Retrieve paginated list of blogs with the most recent engagement.
+
+    Ordered by the time decayed trending score, see app.blogs.services.trending.
+
+    Returns a tuple of (blogs, total_count, has_more, next_cursor).
+    """
+    return await _get_ranked_blogs(
+        session, Blog.trending_score, limit, offset, cursor, count
     )
 
+
+async def _get_ranked_blogs(
+    session: AsyncSession,
+    score_column,
+    limit: int,
+    offset: int,
+    cursor: str | None,
+    count: CountMode,
+):
+    """Public blogs with a positive `score_column`, highest first (index scan)"""
+    order_key = (score_column, Blog.id)
+
+    condition = (Blog.is_public) & (score_column > 0) & (Blog.is_draft == False)
+
     # main query with pagination
     blogs_query = (
-        base_query.options(selectinload(Blog.tags))  # type: ignore
-        .order_by(Blog.engagement_score)  # type: ignore
-        .limit(limit)
-        .offset(offset)
+        select(Blog)
+        .where(condition)
+        .options(selectinload(Blog.tags))  # type: ignore
+        .order_by(score_column.desc(), Blog.id.desc())  # type: ignore
+        .limit(limit + 1)  # one extra row tells whether another page exists
     )
 
+    if cursor:
+        blogs_query = blogs_query.where(
+            keyset_condition(order_key, cursor, descending=True)
+        )
+    else:
+        blogs_query = blogs_query.offset(offset)
+
     # create count query
-    count_query = select(func.count(Blog.id)).where(  # type: ignore
-        (Blog.is_public) & (Blog.engagement_score > 0) & (Blog.is_draft == False)
-    )
+    count_query = select(func.count(Blog.id)).where(condition)  # type: ignore
 
     # Execute both queries concurrently
-    blogs_result, total_result = await asyncio.gather(
-        session.execute(blogs_query), session.execute(count_query)
+    blogs_result, total = await asyncio.gather(
+        session.execute(blogs_query), count_rows(session, count_query, count)
+    )
+
+    blogs, has_more = split_page(blogs_result.scalars().all(), limit)
+
+    return blogs, total, has_more, build_next_cursor(blogs, has_more, order_key)
+
+
+async def search_blogs(
+    session: AsyncSession,
+    query: str,
+    limit: int,
+    offset: int,
+    count: CountMode = CountMode.EXACT,
+):
+    """
+    Retrieve public blogs matching a full-text `query`, most relevant first.
+
+    Returns a tuple of (blogs, total_count, has_more).
+    """
+    matches = await match_blogs(session, query)
+    if matches is None:
+        return [], 0, False
+
+    matches = matches.subquery()
+    condition = (Blog.is_public) & (Blog.is_draft == False)
+
+    blogs_query = (
+        select(Blog)
+        .join(matches, matches.c.blog_id == Blog.id)  # type: ignore
+        .where(condition)
+        .options(selectinload(Blog.tags))  # type: ignore
+        .order_by(matches.c.rank.desc(), Blog.id.desc())  # type: ignore
+        .limit(limit + 1)
+        .offset(offset)
+    )
+
+    count_query = (
+        select(func.count(Blog.id))  # type: ignore
+        .join(matches, matches.c.blog_id == Blog.id)  # type: ignore
+        .where(condition)
+    )
+
+    blogs_result, total = await asyncio.gather(
+        session.execute(blogs_query), count_rows(session, count_query, count)
     )
 
-    blogs = blogs_result.scalars().all()
-    total = total_result.scalar_one()
+    blogs, has_more = split_page(blogs_result.scalars().all(), limit)
 
-    return blogs, total
+    return blogs, total, has_more
 
 
 async def get_blog_by_id(session: AsyncSession, blog_id: int) -> Blog | None:
@@ -204,14 +312,15 @@ async def get_blog_by_id(session: AsyncSession, blog_id: int) -> Blog | None:
 
     Raises 404 if not found.
 
+    The view is buffered and flushed to the database in batches,
+    so reading a blog doesn't write to it.
+
     Returns Blog instance.
     """
     blog = await session.get(Blog, blog_id)
     if not blog:
         raise HTTPException(status_code=404, detail="Blog not found")
-    blog.views += 1
-    session.add(blog)
-    await session.commit()
+    await view_counter.record(blog_id)
     return blog
 
 
@@ -222,12 +331,17 @@ async def list_user_blogs(
     offset: int,
     user_id: int,
     tags: List[str] | None,
+    cursor: str | None = None,
+    count: CountMode = CountMode.EXACT,
 ):
     """
     Retrieve paginated blogs authored by a specific user, optionally filtered by a search term.
 
-    Returns a dict with total count, pagination info, and blog data.
+    Pages by `cursor` (keyset on blog id) when given, otherwise by `offset`.
+
+    Returns a tuple of (blogs, total_count, has_more, next_cursor).
     """
+    order_key = (Blog.id,)
     if not await session.get(User, user_id):
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -236,21 +350,11 @@ async def list_user_blogs(
     conditions = []
 
     if search:
-        search_term = f"%{search.lower()}%"
-        conditions.append(func.lower(Blog.title).like(search_term))
+        conditions.append(await blog_search_condition(session, search))
 
     # Tag filtering
     if tags:
-        # Create a subquery that checks if a blog has all required tags
-        tag_subquery = (
-            select(BlogTagLink.blog_id)
-            .join(Tag, BlogTagLink.tag_id == Tag.id)  # type: ignore
-            .where(and_(BlogTagLink.blog_id == Blog.id, col(Tag.title).in_(tags)))
-            .group_by(BlogTagLink.blog_id)  # type: ignore
-            .having(func.count(func.distinct(Tag.id)) == len(tags))
-        )
-
-        conditions.append(exists(tag_subquery))
+        conditions.append(await tag_filter_condition(session, tags))
 
     if conditions:
         filtered_query = base_query.where(and_(*conditions))
@@ -261,10 +365,15 @@ async def list_user_blogs(
     blogs_query = (
         filtered_query.options(selectinload(Blog.tags))  # type: ignore
         .order_by(Blog.id)  # type: ignore
-        .limit(limit)
-        .offset(offset)
+        .limit(limit + 1)  # one extra row tells whether another page exists
     )
 
+    # seek past the cursor instead of scanning and discarding OFFSET rows
+    if cursor:
+        blogs_query = blogs_query.where(keyset_condition(order_key, cursor))
+    else:
+        blogs_query = blogs_query.offset(offset)
+
     # create count query
     count_query = select(func.count(Blog.id)).where(  # type: ignore
         Blog.author == user_id
@@ -275,14 +384,13 @@ async def list_user_blogs(
         count_query = count_query.where(and_(*conditions))
 
     # Execute both queries concurrently
-    blogs_result, total_result = await asyncio.gather(
-        session.execute(blogs_query), session.execute(count_query)
+    blogs_result, total = await asyncio.gather(
+        session.execute(blogs_query), count_rows(session, count_query, count)
     )
 
-    blogs = blogs_result.scalars().all()
-    total = total_result.scalar_one()
+    blogs, has_more = split_page(blogs_result.scalars().all(), limit)
 
-    return blogs, total
+    return blogs, total, has_more, build_next_cursor(blogs, has_more, order_key)
 
 
 async def get_recommended_blogs(
@@ -373,6 +481,9 @@ async def update_blog(
     session.add(blog)
     await session.commit()
     await session.refresh(blog)
+    await blog_search_index.sync(session, blog)
+    await popular_leaderboard.sync(blog)
+    await invalidate_blog_feeds()
     return blog.title
 
 
@@ -401,6 +512,9 @@ async def delete_blog(blog_id: int, session: AsyncSession, current_user: int):
     # Delete the blog itself
     await session.delete(blog)
     await session.commit()
+    await blog_search_index.remove(blog_id)
+    await popular_leaderboard.remove(blog_id)
+    await invalidate_blog_feeds()
 
     return blog.title
 
@@ -410,12 +524,19 @@ async def get_user_drafts(
     user_id: int,
     limit: int = 10,
     offset: int = 0,
+    cursor: str | None = None,
+    count: CountMode = CountMode.EXACT,
 ):
     """
-    Retrieve paginated draft blogs for a specific user.
+    Retrieve paginated draft blogs for a specific user, newest first.
+
+    Pages by `cursor` (keyset on blog id) when given, otherwise by `offset`.
 
-    Returns a tuple of (blogs, total_count).
+    Returns a tuple of (blogs, total_count, has_more, next_cursor).
     """
+    # ids are assigned in creation order, so id desc is newest first and keeps
+    # the keyset on the primary key
+    order_key = (Blog.id,)
     base_query = select(Blog).where(
         Blog.author == user_id,
         Blog.is_draft == True,
@@ -424,11 +545,17 @@ async def get_user_drafts(
     # Main query with pagination
     blogs_query = (
         base_query.options(selectinload(Blog.tags))  # type: ignore
-        .order_by(Blog.created_at.desc())  # type: ignore
-        .limit(limit)
-        .offset(offset)
+        .order_by(Blog.id.desc())  # type: ignore
+        .limit(limit + 1)  # one extra row tells whether another page exists
     )
 
+    if cursor:
+        blogs_query = blogs_query.where(
+            keyset_condition(order_key, cursor, descending=True)
+        )
+    else:
+        blogs_query = blogs_query.offset(offset)
+
     # Count query
     count_query = select(func.count(Blog.id)).where(  # type: ignore
         Blog.author == user_id,
@@ -436,21 +563,19 @@ async def get_user_drafts(
     )
 
     # Execute both queries concurrently
-    blogs_result, total_result = await asyncio.gather(
-        session.execute(blogs_query), session.execute(count_query)
+    blogs_result, total = await asyncio.gather(
+        session.execute(blogs_query), count_rows(session, count_query, count)
     )
 
-    blogs = blogs_result.scalars().all()
-    total = total_result.scalar_one()
+    blogs, has_more = split_page(blogs_result.scalars().all(), limit)
 
-    return blogs, total
+    return blogs, total, has_more, build_next_cursor(blogs, has_more, order_key)
 
 
 async def publish_draft(
     blog_id: int,
     session: AsyncSession,
     current_user: int,
-    request: Request,
 ):
     """
     Convert a draft blog to a published blog.
@@ -478,30 +603,22 @@ async def publish_draft(
     blog.is_draft = False
     session.add(blog)
     await session.commit()
+    await popular_leaderboard.sync(blog)
+    await invalidate_blog_feeds()
 
-    # Send notifications to followers
+    # Send notifications to followers in the background
     result = await session.execute(
-        select(User).where(User.id == current_user)
+        select(User.full_name).where(User.id == current_user)
     )
-    user = result.scalars().first()
-
-    followers = await session.execute(
-        select(UserFollowLink.follower_id).where(
-            UserFollowLink.following_id == current_user
-        )
+    full_name = result.scalars().first()
+
+    await notification_fanout.enqueue(
+        session,
+        author_id=current_user,
+        notification_type=NotificationType.NEW_BLOG,
+        blog_id=blog.id,
+        message=f"{full_name} uploaded new blog {blog.title}",
     )
-    followers_ids: List[int] = list(followers.scalars().all())
-
-    if followers_ids and user:
-        await create_notifications(
-            request=request,
-            session=session,
-            owner_ids=followers_ids,
-            triggered_by_user_id=current_user,
-            notification_type=NotificationType.NEW_BLOG,
-            blog_id=blog.id,
-            message=f"{user.full_name} uploaded new blog {blog.title}",
-        )
 
     return blog
 
@@ -1,10 +1,13 @@
-import asyncio
-
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
-from app.blogs.models import Blog
+from app.blogs.services.leaderboard import popular_leaderboard
+from app.blogs.services.trending import (
+    EngagementEvent,
+    lock_blog,
+    record_engagement,
+)
 from app.users.models import BookMark, User
 
 
@@ -13,9 +16,8 @@ async def add_blog_to_bookmark(
     user_id: int,
     blog_id: int,
 ):
-    user, blog = await asyncio.gather(
-        session.get(User, user_id), session.get(Blog, blog_id)
-    )
+    user = await session.get(User, user_id)
+    blog = await lock_blog(session, blog_id)
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
     if not blog:
@@ -26,17 +28,21 @@ async def add_blog_to_bookmark(
             (BookMark.blog_id == blog_id) & (BookMark.user_id == user_id)
         )
     )
-    blog.bookmarks_count += 1
-    session.add(blog)
     existing_bookmarks = bookmark.scalars().first()
     if existing_bookmarks:
         await session.delete(existing_bookmarks)
         blog.bookmarks_count -= 1
+        record_engagement(blog, EngagementEvent.BOOKMARK, -1)
         session.add(blog)
         await session.commit()
+        await popular_leaderboard.sync(blog)
         return {"detail": "Successfully removed from bookmark"}
 
     new_bookmark = BookMark(user_id=user_id, blog_id=blog_id)
+    blog.bookmarks_count += 1
+    record_engagement(blog, EngagementEvent.BOOKMARK)
     session.add(new_bookmark)
+    session.add(blog)
     await session.commit()
+    await popular_leaderboard.sync(blog)
     return {"detail": "Successfully added to bookmark"}
@@ -6,6 +6,12 @@ from sqlalchemy.orm import selectinload
 from sqlmodel import select
 
 from app.blogs.models import Blog, Comment
+from app.blogs.services.leaderboard import popular_leaderboard
+from app.blogs.services.trending import (
+    EngagementEvent,
+    lock_blog,
+    record_engagement,
+)
 
 
 async def create_comment(
@@ -30,7 +36,7 @@ async def create_comment(
     if content.strip() == "":
         raise HTTPException(status_code=400, detail="The field cannot be empty")
 
-    blog = await session.get(Blog, blog_id)
+    blog = await lock_blog(session, blog_id)
     if not blog:
         raise HTTPException(status_code=404, detail="Blog not found")
 
@@ -54,11 +60,13 @@ async def create_comment(
         parent_id=parent_id,
     )
     blog.comments_count += 1
+    record_engagement(blog, EngagementEvent.COMMENT)
 
     session.add(new_comment)
     session.add(blog)
     await session.commit()
     await session.refresh(new_comment)
+    await popular_leaderboard.sync(blog)
 
     return new_comment
 
@@ -155,10 +163,13 @@ async def delete_comment(comment_id: int, session: AsyncSession, current_user: i
         raise HTTPException(
             status_code=403, detail="You are not the owner of the comment"
         )
-    blog = await session.get(Blog, comment.blog_id)
+    blog = await lock_blog(session, comment.blog_id)
     if blog:
         blog.comments_count -= 1
+        record_engagement(blog, EngagementEvent.COMMENT, -1)
         session.add(blog)
     await session.delete(comment)
     await session.commit()
+    if blog:
+        await popular_leaderboard.sync(blog)
     return {"detail": "Successfully deleted comment"}
@@ -5,13 +5,28 @@ from aiosqlite import IntegrityError
 from fastapi import HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
-from sqlmodel import and_, col, delete, exists, func, select
-
-from app.blogs.models import Blog, BlogTagLink, Tag
+from sqlmodel import and_, delete, func, select
+
+from app.blogs.models import Blog
+from app.blogs.search.service import blog_search_condition
+from app.blogs.services.leaderboard import popular_leaderboard
+from app.blogs.services.tag_cache import tag_filter_condition
+from app.blogs.services.trending import (
+    EngagementEvent,
+    lock_blog,
+    record_engagement,
+)
 from app.models.blog_like_link import BlogLikeLink
+from app.models.schema import CountMode
 from app.notifications.models import Notification, NotificationType
 from app.notifications.service import create_notification
 from app.users.schema import CurrentUserRead
+from app.utils.pagination import (
+    build_next_cursor,
+    count_rows,
+    keyset_condition,
+    split_page,
+)
 
 
 async def like_unlike_blog(
@@ -37,13 +52,14 @@ async def like_unlike_blog(
 
     existing_like = result.scalars().first()
 
-    blog = await session.get(Blog, blog_id)
+    blog = await lock_blog(session, blog_id)
 
     if not blog:
         raise HTTPException(status_code=404, detail="Blog doesn't exist")
 
     if existing_like:
         blog.likes_count -= 1  # decrement like count
+        record_engagement(blog, EngagementEvent.LIKE, -1)
         session.add(blog)
 
         await session.delete(existing_like)
@@ -61,6 +77,7 @@ async def like_unlike_blog(
                 )
             )
         await session.commit()
+        await popular_leaderboard.sync(blog)
 
         return {"detail": "removed from liked blogs"}
 
@@ -69,10 +86,12 @@ async def like_unlike_blog(
         new_link = BlogLikeLink(blog_id=blog_id, user_id=current_user.id)
 
         blog.likes_count += 1  # Update like counter
+        record_engagement(blog, EngagementEvent.LIKE)
 
         session.add(new_link)
         session.add(blog)
         await session.commit()
+        await popular_leaderboard.sync(blog)
 
         # create notification only if not self-like
         if current_user.id != blog.author:
@@ -100,12 +119,17 @@ async def get_liked_blogs(
     offset: int,
     user_id: int,
     tags: List[str] | None,
+    cursor: str | None = None,
+    count: CountMode = CountMode.EXACT,
 ):
     """
     Retrieve paginated blogs liked by a user, optionally filtered by a search term.
 
-    Returns a dict with total count, pagination info, and blog data.
+    Pages by `cursor` (keyset on blog id) when given, otherwise by `offset`.
+
+    Returns a tuple of (blogs, total_count, has_more, next_cursor).
     """
+    order_key = (Blog.id,)
 
     base_query = (
         select(Blog)
@@ -116,21 +140,11 @@ async def get_liked_blogs(
     conditions = []
 
     if search:
-        search_term = f"%{search.lower()}%"
-        conditions.append(func.lower(Blog.title).like(search_term))
+        conditions.append(await blog_search_condition(session, search))
 
     # Tag filtering
     if tags:
-        # Create a subquery that checks if a blog has all required tags
-        tag_subquery = (
-            select(BlogTagLink.blog_id)
-            .join(Tag, BlogTagLink.tag_id == Tag.id)  # type: ignore
-            .where(and_(BlogTagLink.blog_id == Blog.id, col(Tag.title).in_(tags)))
-            .group_by(BlogTagLink.blog_id)  # type: ignore
-            .having(func.count(func.distinct(Tag.id)) == len(tags))
-        )
-
-        conditions.append(exists(tag_subquery))
+        conditions.append(await tag_filter_condition(session, tags))
 
     if conditions:
         filtered_query = base_query.where(and_(*conditions))
@@ -142,10 +156,14 @@ async def get_liked_blogs(
         filtered_query.where(Blog.is_public)
         .options(selectinload(Blog.tags))  # type: ignore
         .order_by(Blog.id)  # type: ignore
-        .limit(limit)
-        .offset(offset)
+        .limit(limit + 1)  # one extra row tells whether another page exists
     )
 
+    if cursor:
+        blogs_query = blogs_query.where(keyset_condition(order_key, cursor))
+    else:
+        blogs_query = blogs_query.offset(offset)
+
     # create count query
     count_query = (
         select(func.count(Blog.id))  # type: ignore
@@ -158,11 +176,10 @@ async def get_liked_blogs(
         count_query = count_query.where(and_(*conditions))
 
     # Execute both queries concurrently
-    blogs_result, total_result = await asyncio.gather(
-        session.execute(blogs_query), session.execute(count_query)
+    blogs_result, total = await asyncio.gather(
+        session.execute(blogs_query), count_rows(session, count_query, count)
     )
 
-    blogs = blogs_result.scalars().all()
-    total = total_result.scalar_one()
+    blogs, has_more = split_page(blogs_result.scalars().all(), limit)
 
-    return blogs, total
+    return blogs, total, has_more, build_next_cursor(blogs, has_more, order_key)
@@ -0,0 +1,84 @@
+from typing import Dict, List, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as postgres_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import col, select
+
+from app.blogs.models import BlogTagLink, Tag
+
+# INSERT constructs supporting ON CONFLICT, by dialect
+_UPSERTS = {"postgresql": postgres_insert, "sqlite": sqlite_insert}
+
+
+def parse_tags(tags: str | None) -> List[str]:
+    """Split a `#tag1#tag2` string into unique tag titles, keeping their order"""
+    if not tags:
+        return []
+    return list(dict.fromkeys(t.strip() for t in tags.split("#") if t.strip()))
+
+
+async def upsert_tags(
+    session: AsyncSession, titles: List[str]
+) -> Tuple[Dict[str, int], List[str]]:
+    """
+    Resolve tag titles to ids, creating the missing tags.
+
+    One SELECT for the existing tags and one INSERT ... ON CONFLICT DO NOTHING
+    RETURNING for the rest. Tags a concurrent request inserted first are
+    skipped by the insert and picked up by a last SELECT.
+
+    Doesn't commit. Returns a dict of title -> tag id and the titles of the
+    tags it created.
+    """
+    if not titles:
+        return {}, []
+
+    tag_ids = await _select_tag_ids(session, titles)
+    created: List[str] = []
+
+    missing = [title for title in titles if title not in tag_ids]
+    if missing:
+        dialect = session.get_bind().dialect.name
+        values = [{"title": title} for title in missing]
+
+        upsert = _UPSERTS.get(dialect)
+        if upsert is not None:
+            statement = (
+                upsert(Tag)
+                .values(values)
+                .on_conflict_do_nothing(index_elements=["title"])
+            )
+        else:
+            # no portable ON CONFLICT: a concurrent insert of the same tag fails
+            statement = insert(Tag).values(values)
+
+        result = await session.execute(
+            statement.returning(Tag.id, Tag.title)  # type: ignore
+        )
+        for tag_id, title in result.all():
+            tag_ids[title] = tag_id
+            created.append(title)
+
+        raced = [title for title in missing if title not in tag_ids]
+        if raced:
+            tag_ids.update(await _select_tag_ids(session, raced))
+
+    return tag_ids, created
+
+
+async def link_tags(session: AsyncSession, blog_id: int, tag_ids: List[int]):
+    """Link a blog to tags in a single INSERT; doesn't commit"""
+    if tag_ids:
+        await session.execute(
+            insert(BlogTagLink),
+            [{"blog_id": blog_id, "tag_id": tag_id} for tag_id in tag_ids],
+        )
+
+
+async def _select_tag_ids(session: AsyncSession, titles: List[str]) -> Dict[str, int]:
+    result = await session.execute(
+        select(Tag.title, Tag.id).where(col(Tag.title).in_(titles))
+    )
+    return {title: tag_id for title, tag_id in result.all()}  # type: ignore
@@ -9,6 +9,7 @@ from sqlalchemy.orm import Mapper
 from sqlmodel import (TIMESTAMP, Column, Field, Relationship, SQLModel, Text,
                       func)
 
+from app.blogs.search.ddl import register_search_ddl
 from app.models.blog_like_link import BlogLikeLink
 
 if TYPE_CHECKING:
@@ -49,17 +50,10 @@ class Blog(SQLModel, table=True):
     bookmarks_count: int = Field(default=0)
     views: int = Field(default=0)
 
-    # Score for engagemnet, trending and popular
+    # Scores for popular (all-time) and trending (time decayed) blogs,
+    # maintained incrementally by app.blogs.services.trending
     engagement_score: float = Field(default=0, index=True)
-
-    def update_engagement_score(self) -> None:
-        """Update engagement score"""
-        self.engagement_score = (
-            self.likes_count * 1.0
-            + self.comments_count * 3.0
-            + self.bookmarks_count * 2.0
-            + self.views * 0.1
-        )
+    trending_score: float = Field(default=0, index=True)
 
 
 # Generate slug whenever new blog is inserted
@@ -69,15 +63,8 @@ def generate_slug(mapper: Mapper[Blog], connection: Connection, target: Blog):
         target.slug = slugify(f"{target.title}-{generate(size=10)}")
 
 
-# Realtime update for engagement_score
-@sa_event.listens_for(Blog, "before_update")
-def update_engagement_score_realtime(
-    mapper: Mapper[Blog], connection: Connection, target: Blog
-):
-    """
-    Automatically update engagement score before saving blog changes.
-    """
-    target.update_engagement_score()
+# Full-text search index objects, kept in sync by the database
+register_search_ddl(Blog.__table__)  # type: ignore
 
 
 class Tag(SQLModel, table=True):
@@ -1,9 +1,10 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, Form, Query, Request, UploadFile
+from fastapi import APIRouter, Depends, Form, Query, Response, UploadFile
 from fastapi.exceptions import HTTPException
 from fastapi.responses import JSONResponse
 from fastapi_limiter.depends import RateLimiter
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependency import get_current_user
@@ -14,13 +15,17 @@ from app.blogs.crud.blogs import (
     get_blog_by_id,
     get_popular_blogs,
     get_recommended_blogs,
+    get_trending_blogs,
     get_user_drafts,
     publish_draft,
+    search_blogs,
     update_blog,
 )
 from app.blogs.schema import BlogContentResponse, BlogResponse
+from app.blogs.services.feed_cache import BLOG_FEED_CACHE
+from app.core.services.cache import response_cache
 from app.core.services.database import get_session
-from app.models.schema import CommonParams, PaginatedResponse
+from app.models.schema import CommonParams, CountMode, PaginatedResponse
 from app.users.schema import CurrentUserRead
 from app.utils.common_params import get_common_params
 from app.utils.rate_limiter import user_identifier
@@ -30,6 +35,8 @@ router = APIRouter(tags=["Blogs - CRUD"])
 
 thumbnail_path: str = "blogs/thumbnail"
 
+BlogListAdapter = TypeAdapter(List[BlogResponse])
+
 
 @router.post(
     "/blogs",
@@ -38,7 +45,6 @@ thumbnail_path: str = "blogs/thumbnail"
     ],
 )
 async def create_blog_route(
-    request: Request,
     title: str = Form(..., max_length=500),
     content: str = Form(...),
     tags: str | None = Form(None),
@@ -53,7 +59,6 @@ async def create_blog_route(
         thumbnail_url = await save_image(thumbnail, thumbnail_path)
         new_blog = await create_new_blog(
             session=session,
-            request=request,
             title=title,
             thumbnail_url=thumbnail_url,
             content=content,
@@ -88,13 +93,16 @@ async def get_all_blogs_route(
     session: AsyncSession = Depends(get_session),
 ):
     """Retrieve all blogs with optional search and pagination."""
-    try:
-        blogs_result, total_result = await get_all_blogs(
+
+    async def load_page() -> str:
+        blogs_result, total_result, has_more, next_cursor = await get_all_blogs(
             session=session,
             search=params.search,
             limit=params.limit,
             offset=params.offset,
             tags=tags,
+            cursor=params.cursor,
+            count=params.count,
         )
         # validates response and set tags as list of strings
         data = [
@@ -105,8 +113,21 @@ async def get_all_blogs_route(
         ]
 
         return PaginatedResponse[BlogResponse](
-            total=total_result, limit=params.limit, offset=params.offset, data=data
+            total=total_result,
+            limit=params.limit,
+            offset=params.offset,
+            data=data,
+            has_more=has_more if params.count != CountMode.EXACT else None,
+            next_cursor=next_cursor,
+        ).model_dump_json()
+
+    try:
+        content = await response_cache.get_or_set(
+            BLOG_FEED_CACHE,
+            {"feed": "all", "tags": tags, **params.model_dump()},
+            load_page,
         )
+        return Response(content=content, media_type="application/json")
 
     except HTTPException:
         raise
@@ -127,12 +148,74 @@ async def get_all_blogs_route(
 async def get_popular_blogs_route(
     limit: int = Query(default=10),
     offset: int = Query(default=0),
+    cursor: str | None = Query(default=None),
+    count: CountMode = Query(default=CountMode.EXACT),
     session: AsyncSession = Depends(get_session),
 ):
-    """Retrieve all blogs with optional search and pagination."""
+    """Retrieve blogs with the highest all-time engagement."""
+
+    async def load_page() -> str:
+        blogs_result, total_result, has_more, next_cursor = await get_popular_blogs(
+            session=session, limit=limit, offset=offset, cursor=cursor, count=count
+        )
+        # validates response and set tags as list of strings
+        data = [
+            BlogResponse.model_validate(
+                blog.model_copy(update={"tags": [tag.title for tag in blog.tags]})
+            )
+            for blog in blogs_result
+        ]
+
+        return PaginatedResponse[BlogResponse](
+            total=total_result,
+            limit=limit,
+            offset=offset,
+            data=data,
+            has_more=has_more if count != CountMode.EXACT else None,
+            next_cursor=next_cursor,
+        ).model_dump_json()
+
+    try:
+        content = await response_cache.get_or_set(
+            BLOG_FEED_CACHE,
+            {
+                "feed": "popular",
+                "limit": limit,
+                "offset": offset,
+                "cursor": cursor,
+                "count": count,
+            },
+            load_page,
+        )
+        return Response(content=content, media_type="application/json")
+
+    except HTTPException:
+        raise
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Something went wrong while getting blogs {str(e)}"
+        )
+
+
+@router.get(
+    "/blogs/trending",
+    response_model=PaginatedResponse[BlogResponse],
+    dependencies=[
+        Depends(RateLimiter(times=60, minutes=1, identifier=user_identifier))
+    ],
+)
+async def get_trending_blogs_route(
+    limit: int = Query(default=10),
+    offset: int = Query(default=0),
+    cursor: str | None = Query(default=None),
+    count: CountMode = Query(default=CountMode.EXACT),
+    session: AsyncSession = Depends(get_session),
+):
+    """Retrieve blogs with the most recent engagement."""
     try:
-        blogs_result, total_result = await get_popular_blogs(
-            session=session, limit=limit, offset=offset
+        blogs_result, total_result, has_more, next_cursor = await get_trending_blogs(
+            session=session, limit=limit, offset=offset, cursor=cursor, count=count
         )
         # validates response and set tags as list of strings
         data = [
@@ -143,7 +226,12 @@ async def get_popular_blogs_route(
         ]
 
         return PaginatedResponse[BlogResponse](
-            total=total_result, limit=limit, offset=offset, data=data
+            total=total_result,
+            limit=limit,
+            offset=offset,
+            data=data,
+            has_more=has_more if count != CountMode.EXACT else None,
+            next_cursor=next_cursor,
         )
 
     except HTTPException:
@@ -155,6 +243,50 @@ async def get_popular_blogs_route(
         )
 
 
+@router.get(
+    "/blogs/search",
+    response_model=PaginatedResponse[BlogResponse],
+    dependencies=[
+        Depends(RateLimiter(times=60, minutes=1, identifier=user_identifier))
+    ],
+)
+async def search_blogs_route(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(default=10),
+    offset: int = Query(default=0),
+    count: CountMode = Query(default=CountMode.EXACT),
+    session: AsyncSession = Depends(get_session),
+):
+    """Full-text search over blog titles and content, ranked by relevance."""
+    try:
+        blogs_result, total_result, has_more = await search_blogs(
+            session=session, query=q, limit=limit, offset=offset, count=count
+        )
+        # validates response and set tags as list of strings
+        data = [
+            BlogResponse.model_validate(
+                blog.model_copy(update={"tags": [tag.title for tag in blog.tags]})
+            )
+            for blog in blogs_result
+        ]
+
+        return PaginatedResponse[BlogResponse](
+            total=total_result,
+            limit=limit,
+            offset=offset,
+            data=data,
+            has_more=has_more if count != CountMode.EXACT else None,
+        )
+
+    except HTTPException:
+        raise
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Something went wrong while searching blogs {str(e)}"
+        )
+
+
 @router.get(
     "/blogs/drafts",
     response_model=PaginatedResponse[BlogResponse],
@@ -165,16 +297,20 @@ async def get_popular_blogs_route(
 async def get_draft_blogs_route(
     limit: int = Query(default=10),
     offset: int = Query(default=0),
+    cursor: str | None = Query(default=None),
+    count: CountMode = Query(default=CountMode.EXACT),
     session: AsyncSession = Depends(get_session),
     current_user: CurrentUserRead = Depends(get_current_user),
 ):
     """Retrieve current user's draft blogs."""
     try:
-        blogs_result, total_result = await get_user_drafts(
+        blogs_result, total_result, has_more, next_cursor = await get_user_drafts(
             session=session,
             user_id=current_user.id,
             limit=limit,
             offset=offset,
+            cursor=cursor,
+            count=count,
         )
         # validates response and set tags as list of strings
         data = [
@@ -185,7 +321,12 @@ async def get_draft_blogs_route(
         ]
 
         return PaginatedResponse[BlogResponse](
-            total=total_result, limit=limit, offset=offset, data=data
+            total=total_result,
+            limit=limit,
+            offset=offset,
+            data=data,
+            has_more=has_more if count != CountMode.EXACT else None,
+            next_cursor=next_cursor,
         )
 
     except HTTPException:
@@ -210,7 +351,8 @@ async def get_blog_recommendation_route(
     session: AsyncSession = Depends(get_session),
 ):
     """Route to get recommended blog"""
-    try:
+
+    async def load_recommendations() -> str:
         blogs_result = await get_recommended_blogs(
             session=session,
             limit=limit,
@@ -224,7 +366,15 @@ async def get_blog_recommendation_route(
             for blog in blogs_result
         ]
 
-        return data
+        return BlogListAdapter.dump_json(data).decode()
+
+    try:
+        content = await response_cache.get_or_set(
+            BLOG_FEED_CACHE,
+            {"feed": "recommendation", "blog_id": blog_id, "limit": limit},
+            load_recommendations,
+        )
+        return Response(content=content, media_type="application/json")
 
     except HTTPException:
         raise
@@ -333,7 +483,6 @@ async def delete_blog_route(
     ],
 )
 async def publish_draft_route(
-    request: Request,
     blog_id: int,
     session: AsyncSession = Depends(get_session),
     current_user: CurrentUserRead = Depends(get_current_user),
@@ -344,7 +493,6 @@ async def publish_draft_route(
             blog_id=blog_id,
             session=session,
             current_user=current_user.id,
-            request=request,
         )
         
         # Format tags
@@ -0,0 +1,78 @@
+import re
+from typing import List
+
+from sqlalchemy import Float, func, literal, literal_column, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+
+from app.blogs.models import Blog
+
+_TERM_RE = re.compile(r"\w+")
+
+
+def search_terms(query: str) -> List[str]:
+    """Lowercased words of a user's search query"""
+    return _TERM_RE.findall(query.lower())
+
+
+class SearchBackend:
+    """
+    Finds blogs matching a search query.
+
+    `match` returns a SELECT of `(blog_id, rank)` rows, higher rank first, that
+    callers either use as a filter (`Blog.id IN (...)`) or join to order by
+    relevance. Every term must match the start of a word in the blog.
+    """
+
+    name: str = "base"
+
+    async def match(self, session: AsyncSession, terms: List[str]) -> Select:
+        raise NotImplementedError
+
+
+class PostgresSearchBackend(SearchBackend):
+    """`tsvector` column with a GIN index, ranked by `ts_rank_cd`"""
+
+    name = "postgres"
+
+    async def match(self, session: AsyncSession, terms: List[str]) -> Select:
+        tsquery = func.to_tsquery(
+            "english", " & ".join(f"{term}:*" for term in terms)
+        )
+        search_vector = literal_column("blog.search_vector")
+        return select(
+            Blog.id.label("blog_id"),  # type: ignore
+            func.ts_rank_cd(search_vector, tsquery).label("rank"),
+        ).where(search_vector.op("@@")(tsquery))
+
+
+class SqliteFtsSearchBackend(SearchBackend):
+    """FTS5 virtual table, ranked by BM25 with title matches weighted up"""
+
+    name = "sqlite_fts5"
+
+    async def match(self, session: AsyncSession, terms: List[str]) -> Select:
+        # quoting keeps FTS5 operators in user input from being interpreted
+        fts_query = " ".join(f'"{term}"*' for term in terms)
+        return (
+            select(
+                literal_column("blog_fts.rowid").label("blog_id"),
+                # bm25() is lower for better matches
+                (-func.bm25(literal_column("blog_fts"), 10.0, 1.0)).label("rank"),
+            )
+            .select_from(text("blog_fts"))
+            .where(literal_column("blog_fts").op("MATCH")(fts_query))
+        )
+
+
+class LikeSearchBackend(SearchBackend):
+    """Unindexed substring match on the title, for databases without FTS"""
+
+    name = "like"
+
+    async def match(self, session: AsyncSession, terms: List[str]) -> Select:
+        conditions = [func.lower(Blog.title).like(f"%{term}%") for term in terms]
+        return select(
+            Blog.id.label("blog_id"),  # type: ignore
+            literal(0.0, Float).label("rank"),
+        ).where(*conditions)
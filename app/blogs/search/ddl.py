@@ -0,0 +1,86 @@
+"""
+Database objects backing full-text search on the blog table.
+
+Postgres gets a generated, GIN indexed `search_vector` column and SQLite an
+external content FTS5 table kept in sync by triggers, so both follow every
+insert, update and delete of a blog without application code.
+"""
+
+from sqlalchemy import DDL, Table, event
+
+# Weighted document: title matches rank above content matches
+POSTGRES_SEARCH_DDL = [
+    """
+    ALTER TABLE blog ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(content, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_blog_search_vector ON blog USING GIN (search_vector)",
+]
+
+SQLITE_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS blog_fts USING fts5(
+        title, content, content='blog', content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blog_fts_insert AFTER INSERT ON blog BEGIN
+        INSERT INTO blog_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blog_fts_delete AFTER DELETE ON blog BEGIN
+        INSERT INTO blog_fts(blog_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blog_fts_update AFTER UPDATE OF title, content
+    ON blog BEGIN
+        INSERT INTO blog_fts(blog_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO blog_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+]
+
+SQLITE_DROP_SEARCH_DDL = ["DROP TABLE IF EXISTS blog_fts"]
+
+
+def sqlite_has_fts5(connection) -> bool:
+    """Whether the SQLite library behind `connection` was built with FTS5"""
+    try:
+        result = connection.exec_driver_sql(
+            "SELECT sqlite_compileoption_used('ENABLE_FTS5')"
+        )
+        return bool(result.scalar())
+    except Exception:
+        return False
+
+
+def _sqlite_fts5(ddl, target, bind, **kw) -> bool:
+    return bind.dialect.name == "sqlite" and sqlite_has_fts5(bind)
+
+
+def register_search_ddl(table: Table) -> None:
+    """Create the search objects whenever `table` is created (and drop them with it)"""
+    for statement in POSTGRES_SEARCH_DDL:
+        event.listen(
+            table, "after_create", DDL(statement).execute_if(dialect="postgresql")
+        )
+
+    for statement in SQLITE_SEARCH_DDL:
+        event.listen(
+            table, "after_create", DDL(statement).execute_if(callable_=_sqlite_fts5)
+        )
+
+    for statement in SQLITE_DROP_SEARCH_DDL:
+        event.listen(
+            table, "before_drop", DDL(statement).execute_if(dialect="sqlite")
+        )
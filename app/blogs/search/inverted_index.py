@@ -0,0 +1,299 @@
+"""
+Pure-Python inverted index with BM25 ranking.
+
+Each term maps to a posting list of the documents containing it. Posting lists
+keep doc ids in increasing order as deltas from the previous id in an
+`array("I")`, next to an array of term frequencies, which keeps them a few
+bytes per entry instead of a Python object each. New documents usually have
+the highest id yet, so adding them is an append.
+"""
+
+import base64
+import json
+import math
+import os
+import sys
+import zlib
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from app.blogs.search.backends import search_terms
+
+# A term in the title counts as much as this many occurrences in the content
+TITLE_WEIGHT = 3
+TAG_WEIGHT = 2
+CONTENT_WEIGHT = 1
+
+SNAPSHOT_VERSION = 1
+
+
+class PostingList:
+    """
+    Doc ids (delta encoded) and term frequencies of one term, in id order.
+
+    Removing a document, or changing its frequency, is recorded in `changes`
+    (a frequency of 0 marks a removed document) instead of rewriting the
+    arrays; the changes are folded in once they cover half the list.
+    """
+
+    __slots__ = ("deltas", "freqs", "last_id", "changes", "live")
+
+    def __init__(self):
+        self.deltas = array("I")
+        self.freqs = array("I")
+        self.last_id = 0
+        self.changes: Dict[int, int] = {}
+        self.live = 0
+
+    def __len__(self) -> int:
+        return self.live
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        doc_id = 0
+        changes = self.changes
+        for delta, freq in zip(self.deltas, self.freqs):
+            doc_id += delta
+            if changes and doc_id in changes:
+                freq = changes[doc_id]
+                if not freq:
+                    continue
+            yield doc_id, freq
+
+    def add(self, doc_id: int, freq: int):
+        if doc_id > self.last_id:
+            self.deltas.append(doc_id - self.last_id)
+            self.freqs.append(freq)
+            self.last_id = doc_id
+            self.live += 1
+            return
+
+        if doc_id in self.changes:
+            # still encoded: re-added after a removal, e.g. an edit
+            if not self.changes[doc_id]:
+                self.live += 1
+            self.changes[doc_id] = freq
+            self._compact_if_needed()
+            return
+
+        # out of order (or re-added without a removal), so re-encode the list
+        postings = dict(self)
+        postings[doc_id] = freq
+        self._encode(sorted(postings.items()))
+
+    def remove(self, doc_id: int):
+        """Remove `doc_id`, which must be in the list"""
+        if self.changes.get(doc_id, -1) == 0:
+            return
+        self.changes[doc_id] = 0
+        self.live -= 1
+        self._compact_if_needed()
+
+    def compact(self):
+        """Fold pending changes into the arrays"""
+        if self.changes:
+            self._encode(list(self))
+
+    def _compact_if_needed(self):
+        if 2 * len(self.changes) >= len(self.deltas):
+            self.compact()
+
+    def _encode(self, postings: Iterable[Tuple[int, int]]):
+        self.deltas = array("I")
+        self.freqs = array("I")
+        self.last_id = 0
+        self.changes = {}
+        for doc_id, freq in postings:
+            self.deltas.append(doc_id - self.last_id)
+            self.freqs.append(freq)
+            self.last_id = doc_id
+        self.live = len(self.deltas)
+
+
+class InvertedIndex:
+    """
+    Inverted index over documents made of a title, content and tags.
+
+    Query terms match as word prefixes and a document must match all of them;
+    results are ranked by BM25 over the field weighted term frequencies.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, PostingList] = {}
+        # sorted terms, for prefix lookups
+        self.vocabulary: List[str] = []
+        self.doc_lengths: Dict[int, int] = {}
+        # terms of each document, to remove it without scanning every list
+        self.doc_terms: Dict[int, Tuple[str, ...]] = {}
+        self.total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def __contains__(self, doc_id: int) -> bool:
+        return doc_id in self.doc_lengths
+
+    @property
+    def max_doc_id(self) -> int:
+        return max(self.doc_lengths, default=0)
+
+    def add(self, doc_id: int, title: str, content: str, tags: Iterable[str] = ()):
+        """Index a document, replacing its previous version"""
+        self.remove(doc_id)
+
+        freqs: Counter[str] = Counter()
+        for text, weight in (
+            (title, TITLE_WEIGHT),
+            (content, CONTENT_WEIGHT),
+            (" ".join(tags), TAG_WEIGHT),
+        ):
+            for term in search_terms(text or ""):
+                freqs[term] += weight
+
+        if not freqs:
+            return
+
+        for term, freq in freqs.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = PostingList()
+                insort(self.vocabulary, term)
+            postings.add(doc_id, freq)
+
+        length = sum(freqs.values())
+        self.doc_lengths[doc_id] = length
+        self.doc_terms[doc_id] = tuple(freqs)
+        self.total_length += length
+
+    def remove(self, doc_id: int):
+        terms = self.doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+
+        self.total_length -= self.doc_lengths.pop(doc_id)
+        for term in terms:
+            postings = self.postings[term]
+            postings.remove(doc_id)
+            if not postings:
+                del self.postings[term]
+                del self.vocabulary[bisect_left(self.vocabulary, term)]
+
+    def expand(self, prefix: str) -> List[str]:
+        """Indexed terms starting with `prefix`"""
+        terms = []
+        for i in range(bisect_left(self.vocabulary, prefix), len(self.vocabulary)):
+            if not self.vocabulary[i].startswith(prefix):
+                break
+            terms.append(self.vocabulary[i])
+        return terms
+
+    def search(
+        self, terms: List[str], limit: int | None = None
+    ) -> List[Tuple[int, float]]:
+        """`(doc_id, score)` of documents matching every term, best first"""
+        if not terms or not self.doc_lengths:
+            return []
+
+        doc_count = len(self.doc_lengths)
+        avg_length = self.total_length / doc_count
+
+        scores: Dict[int, float] | None = None
+        for query_term in dict.fromkeys(terms):
+            term_scores: Dict[int, float] = defaultdict(float)
+
+            for term in self.expand(query_term):
+                postings = self.postings[term]
+                idf = math.log(
+                    1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5)
+                )
+                for doc_id, freq in postings:
+                    norm = self.k1 * (
+                        1 - self.b + self.b * self.doc_lengths[doc_id] / avg_length
+                    )
+                    term_scores[doc_id] += idf * freq * (self.k1 + 1) / (freq + norm)
+
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {
+                    doc_id: score + term_scores[doc_id]
+                    for doc_id, score in scores.items()
+                    if doc_id in term_scores
+                }
+
+            if not scores:
+                return []
+
+        ranked = sorted(
+            scores.items(), key=lambda item: (-item[1], -item[0])  # type: ignore
+        )
+        return ranked[:limit] if limit else ranked
+
+    def save(self, path: str, **meta: Any):
+        """Write a compressed snapshot of the index to `path` atomically"""
+        for postings in self.postings.values():
+            postings.compact()
+
+        data = {
+            "version": SNAPSHOT_VERSION,
+            "byteorder": sys.byteorder,
+            "meta": meta,
+            "doc_lengths": self.doc_lengths,
+            "postings": {
+                term: [
+                    base64.b64encode(postings.deltas.tobytes()).decode(),
+                    base64.b64encode(postings.freqs.tobytes()).decode(),
+                ]
+                for term, postings in self.postings.items()
+            },
+        }
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(zlib.compress(json.dumps(data, separators=(",", ":")).encode()))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Tuple["InvertedIndex", Dict[str, Any]]:
+        """
+        Read a snapshot written by `save`.
+
+        Returns the index and the meta saved with it; raises ValueError if the
+        snapshot is unreadable or was written by an incompatible version.
+        """
+        try:
+            with open(path, "rb") as f:
+                data = json.loads(zlib.decompress(f.read()))
+        except (zlib.error, json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise ValueError(f"Corrupt search index snapshot: {e}")
+
+        if (
+            data.get("version") != SNAPSHOT_VERSION
+            or data.get("byteorder") != sys.byteorder
+        ):
+            raise ValueError("Incompatible search index snapshot")
+
+        index = cls()
+        index.doc_lengths = {
+            int(doc_id): length for doc_id, length in data["doc_lengths"].items()
+        }
+        index.total_length = sum(index.doc_lengths.values())
+
+        doc_terms: Dict[int, List[str]] = defaultdict(list)
+        for term, (deltas, freqs) in data["postings"].items():
+            postings = PostingList()
+            postings.deltas.frombytes(base64.b64decode(deltas))
+            postings.freqs.frombytes(base64.b64decode(freqs))
+            postings.last_id = sum(postings.deltas)
+            postings.live = len(postings.deltas)
+            for doc_id, _ in postings:
+                doc_terms[doc_id].append(term)
+            index.postings[term] = postings
+
+        index.vocabulary = sorted(index.postings)
+        index.doc_terms = {doc_id: tuple(terms) for doc_id, terms in doc_terms.items()}
+
+        return index, data["meta"]
@@ -0,0 +1,336 @@
+import asyncio
+import json
+import os
+import uuid
+import zlib
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set
+
+from sqlalchemy import (
+    ARRAY,
+    Float,
+    Integer,
+    any_,
+    bindparam,
+    case,
+    column,
+    false,
+    func,
+    literal,
+)
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import ColumnElement
+from sqlmodel import select
+
+from app.blogs.models import Blog, BlogTagLink, Tag
+from app.blogs.search.backends import SearchBackend
+from app.blogs.search.inverted_index import InvertedIndex
+from app.utils.logger import logger
+
+# Index snapshot written on shutdown and loaded on startup (unset: always rebuild)
+SEARCH_INDEX_SNAPSHOT = os.getenv("SEARCH_INDEX_SNAPSHOT")
+
+# Best matches ranked by relevance per query; the other matches follow by id
+SEARCH_MAX_RESULTS = int(os.getenv("SEARCH_MAX_RESULTS", "1000"))
+
+# Blogs read per query while building the index
+INDEX_BATCH_SIZE = 500
+
+
+def _fingerprint(title: str, content: str, tags: Iterable[str]) -> int:
+    """Checksum of what's indexed for a blog, to tell when it has changed"""
+    text = "\0".join([title or "", content or "", *sorted(tags)])
+    return zlib.crc32(text.encode())
+
+
+class BlogSearchIndex:
+    """
+    Process-wide inverted index of blog titles, content and tag names.
+
+    Built from the database on first use, or warm started from a snapshot
+    file, and kept current by the blog CRUD calling `sync` and `remove` after
+    each write. Writes are announced to the other workers over Redis pub/sub,
+    and each reindexes the blogs from the database. Matches are filtered
+    against the blog table afterwards, so a blog deleted behind the index's
+    back just stops showing up.
+    """
+
+    channel = "search_index:changed"
+
+    def __init__(self, snapshot_path: str | None = SEARCH_INDEX_SNAPSHOT):
+        self.snapshot_path = snapshot_path
+        self.index: InvertedIndex | None = None
+        self.redis_manager = None
+        # skips this worker's own announcements
+        self.worker_id = uuid.uuid4().hex
+        # checksum of the indexed text of each blog
+        self.fingerprints: Dict[int, int] = {}
+        self._lock = asyncio.Lock()
+        # blogs written while the index is being built
+        self._dirty: Set[int] = set()
+
+    @property
+    def is_built(self) -> bool:
+        return self.index is not None
+
+    def bind(self, redis_manager):
+        """
+        Announce writes to other workers through `redis_manager`; only bound
+        when the index is the search backend, otherwise writes stay local
+        """
+        self.redis_manager = redis_manager
+
+    async def ensure_built(self, session: AsyncSession) -> InvertedIndex:
+        """Return the index, loading or building it on first use"""
+        if self.index is None:
+            async with self._lock:
+                if self.index is None:
+                    index = await self._warm_start(session)
+                    if index is None:
+                        index = InvertedIndex()
+                        self.fingerprints = {}
+                        await self._index_blogs(session, index)
+                    await self._apply_dirty(session, index)
+                    self.index = index
+                    logger.info(f"Search index ready with {len(index)} blogs")
+
+        return self.index
+
+    async def rebuild(self, session: AsyncSession) -> int:
+        """Reindex every blog from scratch; returns how many were indexed"""
+        async with self._lock:
+            index = InvertedIndex()
+            self.fingerprints = {}
+            await self._index_blogs(session, index)
+            await self._apply_dirty(session, index)
+            self.index = index
+        return len(index)
+
+    async def sync(self, session: AsyncSession, blog: Blog):
+        """Reindex `blog` after it was created or changed"""
+        if self._lock.locked():
+            self._dirty.add(blog.id)  # type: ignore
+        if self.index is not None:
+            blog_id: int = blog.id  # type: ignore
+            tags = await _tag_titles(session, [blog_id])
+            self._add(self.index, blog_id, blog.title, blog.content, tags[blog_id])
+
+        await self._announce([blog.id])  # type: ignore
+
+    async def remove(self, blog_id: int):
+        if self._lock.locked():
+            self._dirty.add(blog_id)
+        if self.index is not None:
+            self.index.remove(blog_id)
+            self.fingerprints.pop(blog_id, None)
+
+        await self._announce([blog_id])
+
+    async def refresh(self, session: AsyncSession, blog_ids: List[int]):
+        """Reindex `blog_ids` from the database, dropping the deleted ones"""
+        if self._lock.locked():
+            self._dirty.update(blog_ids)
+        if self.index is not None:
+            await self._reindex(session, self.index, blog_ids)
+
+    async def listen(self, session_factory: async_sessionmaker[AsyncSession]):
+        """Reindex the blogs written by other workers"""
+        try:
+            pubsub = await self.redis_manager.subscribe(self.channel)  # type: ignore
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                try:
+                    data = json.loads(message["data"])
+                    if data["worker"] == self.worker_id:
+                        continue
+                    async with session_factory() as session:
+                        await self.refresh(session, data["blog_ids"])
+                except Exception as e:
+                    logger.error(f"Error processing search index message: {e}")
+        except Exception as e:
+            logger.error(f"Search index listener error: {e}")
+
+    def save_snapshot(self):
+        """Write the index to the snapshot file, if one is configured"""
+        if self.index is None or not self.snapshot_path:
+            return
+
+        try:
+            self.index.save(self.snapshot_path, fingerprints=self.fingerprints)
+        except OSError as e:
+            logger.warning(f"Could not save search index snapshot: {e}")
+
+    def reset(self):
+        self.index = None
+        self.fingerprints = {}
+        self._dirty.clear()
+
+    async def _announce(self, blog_ids: List[int]):
+        if self.redis_manager is None:
+            return
+        try:
+            await self.redis_manager.publish(
+                self.channel,
+                json.dumps({"worker": self.worker_id, "blog_ids": blog_ids}),
+            )
+        except Exception as e:
+            logger.warning(f"Search index announcement failed: {e}")
+
+    def _add(
+        self,
+        index: InvertedIndex,
+        blog_id: int,
+        title: str,
+        content: str,
+        tags: List[str],
+    ):
+        index.add(blog_id, title, content, tags)
+        self.fingerprints[blog_id] = _fingerprint(title, content, tags)
+
+    async def _warm_start(self, session: AsyncSession) -> InvertedIndex | None:
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return None
+
+        try:
+            index, meta = InvertedIndex.load(self.snapshot_path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring search index snapshot: {e}")
+            return None
+
+        # catch up with blogs created, edited and deleted since the snapshot;
+        # unchanged blogs are only checksummed, not tokenized again
+        self.fingerprints = {}
+        fingerprints = {
+            int(blog_id): fingerprint
+            for blog_id, fingerprint in meta.get("fingerprints", {}).items()
+        }
+        blog_ids = await self._index_blogs(session, index, fingerprints)
+        for doc_id in set(index.doc_lengths) - blog_ids:
+            index.remove(doc_id)
+            self.fingerprints.pop(doc_id, None)
+
+        return index
+
+    async def _index_blogs(
+        self,
+        session: AsyncSession,
+        index: InvertedIndex,
+        fingerprints: Dict[int, int] | None = None,
+    ) -> Set[int]:
+        """
+        Index every blog, in batches, skipping those whose text has the
+        checksum in `fingerprints`. Returns the ids of the blogs read.
+        """
+        fingerprints = fingerprints or {}
+        blog_ids: Set[int] = set()
+        after_id = 0
+        while True:
+            result = await session.execute(
+                select(Blog.id, Blog.title, Blog.content)
+                .where(Blog.id > after_id)  # type: ignore
+                .order_by(Blog.id)  # type: ignore
+                .limit(INDEX_BATCH_SIZE)
+            )
+            rows = result.all()
+            if not rows:
+                return blog_ids
+
+            tags = await _tag_titles(session, [row.id for row in rows])
+            for row in rows:
+                blog_ids.add(row.id)
+                fingerprint = _fingerprint(row.title, row.content, tags[row.id])
+                if fingerprints.get(row.id) == fingerprint and row.id in index:
+                    self.fingerprints[row.id] = fingerprint
+                    continue
+                self._add(index, row.id, row.title, row.content, tags[row.id])
+
+            after_id = rows[-1].id
+
+    async def _apply_dirty(self, session: AsyncSession, index: InvertedIndex):
+        while self._dirty:
+            blog_ids = list(self._dirty)
+            self._dirty.clear()
+            await self._reindex(session, index, blog_ids)
+
+    async def _reindex(
+        self, session: AsyncSession, index: InvertedIndex, blog_ids: List[int]
+    ):
+        result = await session.execute(
+            select(Blog.id, Blog.title, Blog.content).where(
+                Blog.id.in_(blog_ids)  # type: ignore
+            )
+        )
+        rows = result.all()
+        tags = await _tag_titles(session, blog_ids)
+        for blog_id in blog_ids:
+            index.remove(blog_id)
+            self.fingerprints.pop(blog_id, None)
+        for row in rows:
+            self._add(index, row.id, row.title, row.content, tags[row.id])
+
+
+async def _tag_titles(
+    session: AsyncSession, blog_ids: List[int]
+) -> Dict[int, List[str]]:
+    result = await session.execute(
+        select(BlogTagLink.blog_id, Tag.title)
+        .join(Tag, BlogTagLink.tag_id == Tag.id)  # type: ignore
+        .where(BlogTagLink.blog_id.in_(blog_ids))  # type: ignore
+    )
+    tags: Dict[int, List[str]] = defaultdict(list)
+    for blog_id, title in result.all():
+        tags[blog_id].append(title)
+    return tags
+
+
+class MemorySearchBackend(SearchBackend):
+    """In-process inverted index ranked by BM25, for SQLite without FTS5"""
+
+    name = "memory"
+
+    def __init__(self, search_index: BlogSearchIndex):
+        self.search_index = search_index
+
+    async def match(self, session: AsyncSession, terms: List[str]) -> Select:
+        index = await self.search_index.ensure_built(session)
+        matches = index.search(terms)
+
+        if not matches:
+            return select(
+                Blog.id.label("blog_id"),  # type: ignore
+                literal(0.0, Float).label("rank"),
+            ).where(false())
+
+        # every match is kept, so filters applied afterwards don't lose any;
+        # only the best are ranked, to bound the size of the CASE
+        scores = dict(matches[:SEARCH_MAX_RESULTS])
+        return select(
+            Blog.id.label("blog_id"),  # type: ignore
+            case(scores, value=Blog.id, else_=0.0).label("rank"),
+        ).where(_is_one_of(session, [blog_id for blog_id, _ in matches]))
+
+
+def _is_one_of(session: AsyncSession, blog_ids: List[int]) -> ColumnElement[bool]:
+    """
+    `Blog.id IN blog_ids`, with the ids sent as a single array or JSON
+    parameter where the database can unpack one, so the statement stays the
+    same size however many blogs match
+    """
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        ids = bindparam("search_blog_ids", blog_ids, type_=ARRAY(Integer))
+        return Blog.id == any_(ids)  # type: ignore
+    if dialect == "sqlite":
+        ids = bindparam("search_blog_ids", json.dumps(blog_ids))
+        return Blog.id.in_(  # type: ignore
+            select(column("value")).select_from(func.json_each(ids))
+        )
+
+    return Blog.id.in_(  # type: ignore
+        bindparam("search_blog_ids", blog_ids, expanding=True)
+    )
+
+
+blog_search_index = BlogSearchIndex()
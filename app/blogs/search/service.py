@@ -0,0 +1,86 @@
+import os
+from typing import Dict
+
+from sqlalchemy import false, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import ColumnElement
+from sqlmodel import select
+
+from app.blogs.models import Blog
+from app.blogs.search.backends import (
+    LikeSearchBackend,
+    PostgresSearchBackend,
+    SearchBackend,
+    SqliteFtsSearchBackend,
+    search_terms,
+)
+from app.blogs.search.memory import MemorySearchBackend, blog_search_index
+
+# "database" uses the database's full-text index, "memory" the in-process
+# inverted index, and "auto" the database's unless it's SQLite without FTS5
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "auto")
+
+postgres_backend = PostgresSearchBackend()
+sqlite_fts_backend = SqliteFtsSearchBackend()
+like_backend = LikeSearchBackend()
+memory_backend = MemorySearchBackend(blog_search_index)
+
+# database url -> whether the FTS5 table exists
+_sqlite_fts_tables: Dict[str, bool] = {}
+
+
+async def get_search_backend(session: AsyncSession) -> SearchBackend:
+    """Pick the search backend for the database behind `session`"""
+    if SEARCH_BACKEND == "memory":
+        return memory_backend
+
+    bind = session.get_bind()
+    dialect = bind.dialect.name
+
+    if dialect == "postgresql":
+        return postgres_backend
+
+    if dialect == "sqlite":
+        url = str(bind.url)
+        if url not in _sqlite_fts_tables:
+            # the FTS5 table is only created when SQLite was built with FTS5
+            result = await session.execute(
+                text(
+                    "SELECT 1 FROM sqlite_master "
+                    "WHERE type = 'table' AND name = 'blog_fts'"
+                )
+            )
+            _sqlite_fts_tables[url] = result.first() is not None
+        if _sqlite_fts_tables[url]:
+            return sqlite_fts_backend
+
+    if SEARCH_BACKEND == "auto":
+        return memory_backend
+
+    return like_backend
+
+
+async def match_blogs(session: AsyncSession, query: str) -> Select | None:
+    """`(blog_id, rank)` rows of blogs matching `query`, None if it has no terms"""
+    terms = search_terms(query)
+    if not terms:
+        return None
+
+    backend = await get_search_backend(session)
+    return await backend.match(session, terms)
+
+
+async def blog_search_condition(
+    session: AsyncSession, query: str
+) -> ColumnElement[bool]:
+    """
+    WHERE condition keeping only blogs that match `query`; a query without
+    any terms matches no blog
+    """
+    matches = await match_blogs(session, query)
+    if matches is None:
+        return false()
+
+    matches = matches.subquery()
+    return Blog.id.in_(select(matches.c.blog_id))  # type: ignore
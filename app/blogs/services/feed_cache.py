@@ -0,0 +1,9 @@
+from app.core.services.cache import response_cache
+
+# Namespace of the cached anonymous blog feeds (all, popular, recommendations)
+BLOG_FEED_CACHE = "blog_feed"
+
+
+async def invalidate_blog_feeds():
+    """Drop cached blog feeds after a blog is created, changed or removed"""
+    await response_cache.invalidate(BLOG_FEED_CACHE)
@@ -0,0 +1,219 @@
+import uuid
+from typing import Dict, List, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlmodel import select
+
+from app.blogs.models import Blog
+from app.utils.logger import logger
+
+# Members written per ZADD while rebuilding or syncing
+REBUILD_CHUNK_SIZE = 1000
+
+# Seconds a rebuild may take before its journal of concurrent writes expires
+REBUILD_TIMEOUT = 300
+
+# ZADD/ZREM on the leaderboard, also journaled while a rebuild is running
+_WRITE_SCRIPT = """
+local args = {}
+for i = 2, #ARGV do args[#args + 1] = ARGV[i] end
+if ARGV[1] == 'add' then
+    redis.call('ZADD', KEYS[1], unpack(args))
+else
+    redis.call('ZREM', KEYS[1], unpack(args))
+end
+local journal = redis.call('GET', KEYS[2])
+if journal then
+    redis.call('RPUSH', journal, cjson.encode(ARGV))
+    redis.call('PEXPIRE', journal, redis.call('PTTL', KEYS[2]))
+end
+"""
+
+# Replays the journal on the rebuilt set and swaps it in, all at once
+_SWAP_SCRIPT = """
+for _, entry in ipairs(redis.call('LRANGE', KEYS[4], 0, -1)) do
+    local write = cjson.decode(entry)
+    local args = {}
+    for i = 2, #write do args[#args + 1] = write[i] end
+    if write[1] == 'add' then
+        redis.call('ZADD', KEYS[3], unpack(args))
+    else
+        redis.call('ZREM', KEYS[3], unpack(args))
+    end
+end
+if redis.call('EXISTS', KEYS[3]) == 1 then
+    redis.call('RENAME', KEYS[3], KEYS[1])
+    redis.call('PERSIST', KEYS[1])
+else
+    redis.call('DEL', KEYS[1])
+end
+redis.call('DEL', KEYS[2], KEYS[4])
+redis.call('SET', KEYS[5], '1')
+"""
+
+
+def member(blog_id: int) -> str:
+    """
+    Sorted set member of a blog. Zero-padded so that blogs with equal scores
+    rank by descending id under ZREVRANGE, like the SQL keyset order
+    """
+    return f"{blog_id:020d}"
+
+
+class PopularLeaderboard:
+    """
+    Redis sorted set of public, published blogs scored by `engagement_score`.
+
+    Kept in sync as blogs are engaged with or change visibility, so the popular
+    feed is a ZREVRANGE + ZCARD instead of an ORDER BY and COUNT over the blog
+    table. Until it has been built (see `rebuild`), reads return None and callers
+    fall back to SQL.
+
+    Writes made while a rebuild reads the blog table are journaled and replayed
+    on the new set before it replaces the live one, so none of them are lost.
+    """
+
+    key = "leaderboard:popular:v2"
+    built_key = "leaderboard:popular:v2:built"
+    # holds the journal key while a rebuild is running
+    rebuilding_key = "leaderboard:popular:v2:rebuilding"
+
+    def __init__(self):
+        self.redis = None
+
+    def bind(self, redis_client):
+        """Use `redis_client` for the leaderboard"""
+        self.redis = redis_client
+
+    @staticmethod
+    def is_ranked(blog: Blog) -> bool:
+        """Whether a blog belongs on the leaderboard"""
+        return bool(
+            blog.is_public and not blog.is_draft and (blog.engagement_score or 0) > 0
+        )
+
+    async def sync(self, blog: Blog):
+        """Update (or remove) a blog's entry after it changed"""
+        if self.is_ranked(blog):
+            await self.sync_scores({blog.id: blog.engagement_score})  # type: ignore
+        else:
+            await self.remove(blog.id)  # type: ignore
+
+    async def sync_scores(self, scores: Dict[int, float]):
+        """Set the score of each ranked blog in `scores`"""
+        if self.redis is None or not scores:
+            return
+        pairs = list(scores.items())
+        for start in range(0, len(pairs), REBUILD_CHUNK_SIZE):
+            args = []
+            for blog_id, score in pairs[start : start + REBUILD_CHUNK_SIZE]:
+                args += [score, member(blog_id)]
+            await self._write("add", args)
+
+    async def remove(self, *blog_ids: int):
+        """Drop blogs from the leaderboard"""
+        if self.redis is None or not blog_ids:
+            return
+        await self._write("rem", [member(blog_id) for blog_id in blog_ids])
+
+    async def _write(self, operation: str, args: list):
+        try:
+            await self.redis.eval(  # type: ignore
+                _WRITE_SCRIPT, 2, self.key, self.rebuilding_key, operation, *args
+            )
+        except Exception as e:
+            logger.warning(f"Failed to update popular leaderboard: {e}")
+
+    async def page(self, offset: int, limit: int) -> Tuple[List[int], int] | None:
+        """
+        Ids of the blogs ranked `offset` to `offset + limit` (inclusive, so one extra
+        row tells whether another page exists), highest first, and the total.
+
+        Returns None when the leaderboard isn't available.
+        """
+        if self.redis is None:
+            return None
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.exists(self.built_key)
+                pipe.zrevrange(self.key, offset, offset + limit)
+                pipe.zcard(self.key)
+                built, members, total = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Popular leaderboard unavailable: {e}")
+            return None
+
+        if not built:
+            return None
+        return [int(value) for value in members], total
+
+    async def rebuild(self, session: AsyncSession) -> int:
+        """
+        Rebuild the leaderboard from the blog table; returns the number of blogs.
+
+        The new set is written under a temporary key and swapped in with RENAME,
+        so readers never see a partial leaderboard. Writes made from the start of
+        the rebuild are journaled and replayed on the new set when it's swapped in.
+        """
+        if self.redis is None:
+            raise RuntimeError("Popular leaderboard is not bound to Redis")
+
+        rebuild_id = uuid.uuid4().hex
+        temp_key = f"{self.key}:rebuild:{rebuild_id}"
+        journal_key = f"{self.key}:journal:{rebuild_id}"
+        # journal writes before reading, so none falls between read and swap
+        started = await self.redis.set(
+            self.rebuilding_key, journal_key, nx=True, ex=REBUILD_TIMEOUT
+        )
+        if not started:
+            raise RuntimeError("Popular leaderboard is already being rebuilt")
+
+        try:
+            result = await session.execute(
+                select(Blog.id, Blog.engagement_score).where(
+                    (Blog.is_public)
+                    & (Blog.is_draft == False)
+                    & (Blog.engagement_score > 0)
+                )
+            )
+            rows = result.all()
+
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for start in range(0, len(rows), REBUILD_CHUNK_SIZE):
+                    chunk = rows[start : start + REBUILD_CHUNK_SIZE]
+                    pipe.zadd(
+                        temp_key,
+                        {member(blog_id): score for blog_id, score in chunk},
+                    )
+                # dropped with the journal if the rebuild never finishes
+                pipe.expire(temp_key, REBUILD_TIMEOUT)
+                await pipe.execute()
+
+            await self.redis.eval(
+                _SWAP_SCRIPT,
+                5,
+                self.key,
+                self.rebuilding_key,
+                temp_key,
+                journal_key,
+                self.built_key,
+            )
+        except BaseException:
+            await self.redis.delete(self.rebuilding_key, temp_key, journal_key)
+            raise
+
+        return len(rows)
+
+    async def ensure_built(self, session_factory: async_sessionmaker[AsyncSession]):
+        """Build the leaderboard unless another worker already has"""
+        if self.redis is None or await self.redis.exists(self.built_key):
+            return
+        if await self.redis.exists(self.rebuilding_key):
+            # another worker is building it
+            return
+        async with session_factory() as session:
+            total = await self.rebuild(session)
+        logger.info(f"Built popular leaderboard with {total} blogs")
+
+
+popular_leaderboard = PopularLeaderboard()
@@ -0,0 +1,117 @@
+import json
+from typing import Dict, Iterable, List
+
+from sqlalchemy import false
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+from sqlmodel import col, exists, func, select
+
+from app.blogs.models import Blog, BlogTagLink, Tag
+from app.utils.logger import logger
+
+
+class TagCache:
+    """
+    Process-wide map of tag titles to ids.
+
+    Lets tag filters run against `BlogTagLink.tag_id` without joining `Tag`.
+    Warm loaded at startup; titles it doesn't know are looked up in the
+    database and remembered. Changed tags are dropped from every worker's map
+    through a Redis pub/sub message carrying their titles (no titles: drop all).
+    """
+
+    channel = "tag_cache:invalidate"
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.loaded = False
+        self.redis_manager = None
+
+    def bind(self, redis_manager):
+        """Publish invalidations through `redis_manager`; drops cached tags"""
+        self.redis_manager = redis_manager
+        self.forget([])
+
+    async def load(self, session: AsyncSession):
+        result = await session.execute(select(Tag.title, Tag.id))
+        self.ids = {title: tag_id for title, tag_id in result.all()}  # type: ignore
+        self.loaded = True
+
+    async def resolve(
+        self, session: AsyncSession, titles: List[str]
+    ) -> Dict[str, int]:
+        """Ids of the existing tags among `titles`"""
+        if not self.loaded:
+            await self.load(session)
+
+        missing = [title for title in titles if title not in self.ids]
+        if missing:
+            result = await session.execute(
+                select(Tag.title, Tag.id).where(col(Tag.title).in_(missing))
+            )
+            self.ids.update(dict(result.all()))  # type: ignore
+
+        return {title: self.ids[title] for title in titles if title in self.ids}
+
+    def forget(self, titles: Iterable[str]):
+        """Drop `titles` from this worker's map, or everything if none are given"""
+        titles = list(titles)
+        if not titles:
+            self.ids = {}
+            self.loaded = False
+            return
+
+        for title in titles:
+            self.ids.pop(title, None)
+
+    async def invalidate(self, *titles: str):
+        """Drop `titles` (or everything) from the map of every worker"""
+        self.forget(titles)
+
+        if self.redis_manager is None:
+            return
+
+        try:
+            await self.redis_manager.publish(self.channel, json.dumps(titles))
+        except Exception as e:
+            logger.warning(f"Tag cache invalidation failed: {e}")
+
+    async def listen(self):
+        """Apply invalidations published by other workers"""
+        try:
+            pubsub = await self.redis_manager.subscribe(self.channel)  # type: ignore
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    try:
+                        self.forget(json.loads(message["data"]))
+                    except Exception as e:
+                        logger.error(f"Error processing tag cache message: {e}")
+        except Exception as e:
+            logger.error(f"Tag cache listener error: {e}")
+
+
+async def tag_filter_condition(
+    session: AsyncSession, tags: List[str]
+) -> ColumnElement[bool]:
+    """WHERE condition keeping only blogs that have all of `tags`"""
+    titles = list(dict.fromkeys(tags))
+    tag_ids = await tag_cache.resolve(session, titles)
+
+    # a tag that doesn't exist can't be on any blog
+    if len(tag_ids) < len(titles):
+        return false()
+
+    # Create a subquery that checks if a blog has all required tags
+    tag_subquery = (
+        select(BlogTagLink.blog_id)
+        .where(
+            BlogTagLink.blog_id == Blog.id,
+            col(BlogTagLink.tag_id).in_(tag_ids.values()),
+        )
+        .group_by(BlogTagLink.blog_id)  # type: ignore
+        .having(func.count() == len(tag_ids))
+    )
+    return exists(tag_subquery)
+
+
+tag_cache = TagCache()
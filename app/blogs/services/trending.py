@@ -0,0 +1,123 @@
+import math
+import os
+from datetime import datetime, timezone
+from enum import Enum
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.blogs.models import Blog
+
+# Time for an engagement's contribution to the trending score to halve
+TRENDING_HALF_LIFE_HOURS = float(os.getenv("TRENDING_HALF_LIFE_HOURS", "24"))
+
+# Decay rate per second
+DECAY_RATE = math.log(2) / (TRENDING_HALF_LIFE_HOURS * 3600)
+
+# Scores are stored as if decayed back to this instant (see `decayed_add`)
+TRENDING_EPOCH = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+# Stored score of a blog without any engagement
+EMPTY_SCORE = 0.0
+
+
+class EngagementEvent(str, Enum):
+    LIKE = "like"
+    COMMENT = "comment"
+    BOOKMARK = "bookmark"
+    VIEW = "view"
+
+
+EVENT_WEIGHTS: dict[EngagementEvent, float] = {
+    EngagementEvent.LIKE: 1.0,
+    EngagementEvent.COMMENT: 3.0,
+    EngagementEvent.BOOKMARK: 2.0,
+    EngagementEvent.VIEW: 0.1,
+}
+
+
+def _log_weight(weight: float, at: datetime | None) -> float:
+    """Log of `weight` scaled by e^(rate * (at - epoch))"""
+    at = at or datetime.now(timezone.utc)
+    elapsed = (at - TRENDING_EPOCH).total_seconds()
+    return math.log(weight) + DECAY_RATE * elapsed
+
+
+def decayed_add(score: float, weight: float, at: datetime | None = None) -> float:
+    """
+    Add an engagement of `weight` happening `at` to a stored trending score.
+
+    The decayed score at time t is sum(w_i * e^(-rate * (t - t_i))). Every blog's
+    score shares the same e^(-rate * t) factor, so only
+    log(sum(w_i * e^(rate * (t_i - epoch)))) is stored. It never has to be decayed
+    over time, ordering by it orders by the current decayed score, and an event
+    only touches its own blog's row.
+
+    A negative `weight` removes engagement, e.g. an unlike. The original time of
+    the engagement isn't known, so it's removed as if it happened `at`; this errs
+    towards a lower score and is clamped at EMPTY_SCORE.
+    """
+    if weight == 0:
+        return score
+
+    current = score if score > EMPTY_SCORE else -math.inf
+    x = _log_weight(abs(weight), at)
+
+    if weight > 0:
+        new = max(current, x) + math.log1p(math.exp(-abs(current - x)))
+    elif x >= current:
+        return EMPTY_SCORE
+    else:
+        new = current + math.log1p(-math.exp(x - current))
+
+    return new if new > EMPTY_SCORE else EMPTY_SCORE
+
+
+def current_score(score: float, now: datetime | None = None) -> float:
+    """Decayed engagement of a stored score as of `now`"""
+    if score <= EMPTY_SCORE:
+        return 0.0
+    now = now or datetime.now(timezone.utc)
+    return math.exp(score - DECAY_RATE * (now - TRENDING_EPOCH).total_seconds())
+
+
+async def lock_blog(session: AsyncSession, blog_id: int) -> Blog | None:
+    """
+    Load a blog locked until commit, with the values it has in the database
+    even if the session already holds it. The view flush updates the same
+    scores under the same lock.
+    """
+    return await session.get(
+        Blog, blog_id, with_for_update=True, populate_existing=True
+    )
+
+
+def record_engagement(
+    blog: Blog, event: EngagementEvent, count: int = 1, at: datetime | None = None
+) -> None:
+    """
+    Apply `count` engagements of type `event` to a blog's scores.
+
+    Maintains both the all-time `engagement_score` and the decayed
+    `trending_score`; the caller adds the blog to the session and commits.
+    The scores are written back whole, so the blog must be loaded with
+    `lock_blog`.
+    """
+    weight = EVENT_WEIGHTS[event] * count
+    blog.engagement_score = max((blog.engagement_score or 0) + weight, 0)
+    blog.trending_score = decayed_add(blog.trending_score or EMPTY_SCORE, weight, at)
+
+
+async def recompute_engagement_scores(session: AsyncSession) -> None:
+    """Recompute every blog's all-time `engagement_score` from its counters"""
+    await session.execute(
+        update(Blog)
+        .values(
+            engagement_score=Blog.likes_count * EVENT_WEIGHTS[EngagementEvent.LIKE]
+            + Blog.comments_count * EVENT_WEIGHTS[EngagementEvent.COMMENT]
+            + Blog.bookmarks_count * EVENT_WEIGHTS[EngagementEvent.BOOKMARK]
+            + Blog.views * EVENT_WEIGHTS[EngagementEvent.VIEW]
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
@@ -0,0 +1,170 @@
+import asyncio
+import os
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict
+
+from redis.exceptions import ResponseError
+from sqlalchemy import case, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.blogs.models import Blog
+from app.blogs.services.leaderboard import popular_leaderboard
+from app.blogs.services.trending import EVENT_WEIGHTS, EngagementEvent, decayed_add
+from app.utils.logger import logger
+
+# Seconds between flushes of buffered views to the database
+VIEW_FLUSH_INTERVAL = float(os.getenv("VIEW_FLUSH_INTERVAL", "5"))
+
+# Max blogs updated by a single UPDATE statement
+VIEW_FLUSH_BATCH_SIZE = 500
+
+
+class ViewCounter:
+    """
+    Buffers blog views so the read path never writes to the database.
+
+    Views are accumulated in a Redis hash when Redis is available (shared by all
+    workers), otherwise in process memory, and periodically flushed with batched
+    `UPDATE blog SET views = views + n` statements.
+    """
+
+    pending_key = "blog_views:pending"
+
+    def __init__(self):
+        self.redis = None
+        self.local: Counter[int] = Counter()
+
+    def bind(self, redis_client):
+        """Use `redis_client` as the shared buffer"""
+        self.redis = redis_client
+
+    async def record(self, blog_id: int) -> int:
+        """Buffer one view for a blog; returns the views not yet flushed for it"""
+        if self.redis is not None:
+            try:
+                return int(await self.redis.hincrby(self.pending_key, blog_id, 1))
+            except Exception as e:
+                logger.warning(f"Buffering view in memory, Redis failed: {e}")
+
+        self.local[blog_id] += 1
+        return self.local[blog_id]
+
+    async def flush(self, session: AsyncSession) -> int:
+        """Write buffered views to the database; returns the number of blogs updated"""
+        counts = await self._drain()
+        if not counts:
+            return 0
+
+        try:
+            await apply_view_counts(session, counts)
+        except Exception:
+            # put the views back so the next flush retries them
+            await self._restore(counts)
+            raise
+
+        return len(counts)
+
+    async def run_flusher(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        interval: float = VIEW_FLUSH_INTERVAL,
+    ):
+        """Flush buffered views every `interval` seconds until cancelled"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with session_factory() as session:
+                    await self.flush(session)
+            except Exception as e:
+                logger.error(f"Error flushing blog views: {e}")
+
+    async def _drain(self) -> Dict[int, int]:
+        counts: Counter[int] = self.local
+        self.local = Counter()
+
+        if self.redis is not None:
+            # rename first so views recorded during the flush land in a fresh hash
+            flushing_key = f"{self.pending_key}:{uuid.uuid4().hex}"
+            try:
+                await self.redis.rename(self.pending_key, flushing_key)
+            except ResponseError:
+                # no views were recorded since the last flush
+                return dict(counts)
+
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.hgetall(flushing_key)
+                pipe.delete(flushing_key)
+                buffered, _ = await pipe.execute()
+
+            for blog_id, views in buffered.items():
+                counts[int(blog_id)] += int(views)
+
+        return dict(counts)
+
+    async def _restore(self, counts: Dict[int, int]):
+        if self.redis is not None:
+            try:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    for blog_id, views in counts.items():
+                        pipe.hincrby(self.pending_key, blog_id, views)
+                    await pipe.execute()
+                return
+            except Exception as e:
+                logger.warning(f"Keeping unflushed views in memory, Redis failed: {e}")
+
+        self.local.update(counts)
+
+
+async def apply_view_counts(session: AsyncSession, counts: Dict[int, int]):
+    """
+    Add `counts` (blog id -> new views) to the blog rows, their scores and the
+    popular leaderboard.
+
+    One UPDATE per batch, using a CASE on the blog id for the per-row values.
+    """
+    weight = EVENT_WEIGHTS[EngagementEvent.VIEW]
+    now = datetime.now(timezone.utc)
+    items = list(counts.items())
+    ranked: Dict[int, float] = {}
+
+    for start in range(0, len(items), VIEW_FLUSH_BATCH_SIZE):
+        batch = dict(items[start : start + VIEW_FLUSH_BATCH_SIZE])
+
+        # trending scores are combined in Python, lock the rows until commit
+        result = await session.execute(
+            select(Blog.id, Blog.trending_score)
+            .where(Blog.id.in_(batch.keys()))  # type: ignore
+            .with_for_update()
+        )
+        trending = {
+            blog_id: decayed_add(score, batch[blog_id] * weight, now)
+            for blog_id, score in result.all()
+        }
+        if not trending:
+            continue  # blogs were deleted
+
+        increment = case(batch, value=Blog.id, else_=0)
+        result = await session.execute(
+            update(Blog)
+            .where(Blog.id.in_(trending.keys()))  # type: ignore
+            .values(
+                views=Blog.views + increment,
+                engagement_score=Blog.engagement_score + increment * weight,
+                trending_score=case(trending, value=Blog.id),
+            )
+            .returning(Blog.id, Blog.engagement_score, Blog.is_public, Blog.is_draft)
+            .execution_options(synchronize_session=False)
+        )
+        ranked.update(
+            (blog_id, score)
+            for blog_id, score, is_public, is_draft in result.all()
+            if is_public and not is_draft and score > 0
+        )
+
+    await session.commit()
+    await popular_leaderboard.sync_scores(ranked)
+
+
+view_counter = ViewCounter()
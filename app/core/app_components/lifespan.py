@@ -6,10 +6,20 @@ from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi_limiter import FastAPILimiter
 
+from app.auth.hashing import password_hasher
+from app.auth.principal_cache import principal_cache
 from app.auth.security import TokenBlacklist
-from app.core.services.database import init_db
+from app.blogs.search.memory import blog_search_index
+from app.blogs.search.service import get_search_backend, memory_backend
+from app.blogs.services.leaderboard import popular_leaderboard
+from app.blogs.services.tag_cache import tag_cache
+from app.blogs.services.views import view_counter
+from app.core.services.cache import response_cache
+from app.core.services.database import AsyncSessionLocal, init_db
 from app.core.services.redis import redis_manager
+from app.notifications.fanout import notification_fanout
 from app.realtime.manager import sse_manager
+from app.utils.logger import logger
 
 load_dotenv()
 
@@ -33,21 +43,97 @@ async def lifespan(app: FastAPI):
     app.state.token_blacklist = TokenBlacklist(redis_connection)  # type: ignore
     app.state.redis_manager = redis_manager
 
+    # Hash passwords in worker processes, off the event loop
+    if not testing:
+        password_hasher.start()
+
+    # Background tasks, cancelled together on shutdown
+    tasks: list[asyncio.Task] = []
+
+    # Answer most revocation checks from an in-process filter of revoked tokens
+    if not testing:
+        tasks.append(asyncio.create_task(app.state.token_blacklist.listen()))
+        tasks.append(asyncio.create_task(app.state.token_blacklist.run_rebuilder()))
+
+    # Share cached feed responses between workers, versions bumped over pub/sub
+    response_cache.bind(redis_connection)
+    if not testing:
+        tasks.append(asyncio.create_task(response_cache.listen()))
+
+    # Resolve authenticated users without a query, invalidated over pub/sub
+    principal_cache.bind(redis_manager)
+    if not testing:
+        tasks.append(asyncio.create_task(principal_cache.listen()))
+
+    # Serve the popular feed from a Redis sorted set
+    popular_leaderboard.bind(redis_connection)
+    if not testing:
+        try:
+            await popular_leaderboard.ensure_built(AsyncSessionLocal)
+        except Exception as e:
+            logger.error(f"Error building popular leaderboard: {e}")
+
+    # Load the in-process search index up front when it's the one searched,
+    # and share index writes with the other workers
+    if not testing:
+        try:
+            async with AsyncSessionLocal() as session:
+                if await get_search_backend(session) is memory_backend:
+                    blog_search_index.bind(redis_manager)
+                    tasks.append(
+                        asyncio.create_task(blog_search_index.listen(AsyncSessionLocal))
+                    )
+                    await blog_search_index.ensure_built(session)
+        except Exception as e:
+            logger.error(f"Error loading search index: {e}")
+
+    # Map tag titles to ids in memory, invalidated across workers over pub/sub
+    tag_cache.bind(redis_manager)
+    if not testing:
+        try:
+            async with AsyncSessionLocal() as session:
+                await tag_cache.load(session)
+        except Exception as e:
+            logger.error(f"Error loading tag cache: {e}")
+        tasks.append(asyncio.create_task(tag_cache.listen()))
+
+    # Buffer blog views in Redis and flush them to the database periodically
+    view_counter.bind(redis_connection)
+    if not testing:
+        tasks.append(asyncio.create_task(view_counter.run_flusher(AsyncSessionLocal)))
+
+    # Fan out follower notifications from a Redis stream in the background
+    notification_fanout.bind(redis_connection, inline=testing)
+    if not testing:
+        tasks.append(
+            asyncio.create_task(notification_fanout.run_worker(AsyncSessionLocal))
+        )
+
     # Start SSE Redis listener (if not testing or if you want to test SSE)
-    listener_task = None
     if not testing or os.environ.get("TEST_SSE") == "1":
-        listener_task = asyncio.create_task(
-            sse_manager.start_redis_listener(redis_manager)
+        tasks.append(
+            asyncio.create_task(sse_manager.start_redis_listener(redis_manager))
         )
+        tasks.append(asyncio.create_task(sse_manager.run_heartbeat()))
 
     yield
 
     # Cleanup
-    if listener_task:
-        listener_task.cancel()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    # write out views buffered since the flusher's last run
+    if not testing:
         try:
-            await listener_task
-        except asyncio.CancelledError:
-            pass
+            async with AsyncSessionLocal() as session:
+                await view_counter.flush(session)
+        except Exception as e:
+            logger.error(f"Error flushing blog views on shutdown: {e}")
+
+    password_hasher.shutdown()
+
+    # warm start the search index next time
+    blog_search_index.save_snapshot()
 
     await redis_manager.disconnect()
@@ -0,0 +1,45 @@
+import hashlib
+import math
+
+
+class BloomFilter:
+    """
+    Set membership test with no false negatives and a bounded rate of false
+    positives, in a fixed bit array sized for `capacity` items.
+
+    Items can't be removed; a filter is rebuilt from the source of truth
+    instead.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.size = math.ceil(
+            -self.capacity * math.log(error_rate) / math.log(2) ** 2
+        )
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def add(self, item: str):
+        for index in self._indexes(item):
+            self._bits[index >> 3] |= 1 << (index & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[index >> 3] & (1 << (index & 7))
+            for index in self._indexes(item)
+        )
+
+    def __len__(self) -> int:
+        """Items added, counting repeated ones"""
+        return self.count
+
+    def _indexes(self, item: str):
+        # double hashing: k indexes from two 64-bit halves of one digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "big")
+        second = int.from_bytes(digest[8:], "big") | 1
+        for i in range(self.hashes):
+            yield (first + i * second) % self.size
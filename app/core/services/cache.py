@@ -0,0 +1,232 @@
+import json
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from app.utils.logger import logger
+
+# Seconds a cached response is served before it's rebuilt
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "30"))
+
+# Max responses kept in process memory
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+
+# Seconds a namespace version is trusted before it's read from Redis again;
+# bounds staleness when an invalidation message is missed
+RESPONSE_CACHE_VERSION_TTL = float(os.getenv("RESPONSE_CACHE_VERSION_TTL", "5"))
+
+
+class LRUCache:
+    """In-process LRU cache whose entries expire after a TTL"""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> Any | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self.entries[key]
+            return None
+
+        self.entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float | None = None):
+        self.entries[key] = (time.monotonic() + (ttl or self.ttl), value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+class ResponseCache:
+    """
+    Read-through cache for serialized responses.
+
+    Lookups go to the in-process LRU first, then to Redis when a Redis tier is
+    bound, and only then to the loader. Entries are grouped in namespaces whose
+    version is part of every key: invalidating a namespace bumps the version, so
+    stale entries are never read again and simply expire. With Redis the version
+    is shared: each worker keeps the versions it has read, a bump is published
+    to every worker over pub/sub, and versions are read again after
+    `RESPONSE_CACHE_VERSION_TTL` in case a message was missed. A local hit
+    never leaves the process.
+    """
+
+    prefix = "response_cache"
+    channel = "response_cache:versions"
+
+    def __init__(
+        self,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        ttl: float = RESPONSE_CACHE_TTL,
+    ):
+        self.ttl = ttl
+        self.local = LRUCache(max_entries, ttl)
+        self.redis = None
+        self.versions: Dict[str, int] = {}
+        # when each version was last read from Redis or announced
+        self.versions_seen: Dict[str, float] = {}
+        self.metrics: Dict[str, int] = {
+            "local_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "invalidations": 0,
+            "version_reads": 0,
+            "errors": 0,
+        }
+
+    def bind(self, redis_client):
+        """Use `redis_client` as the shared tier; drops entries cached so far"""
+        self.redis = redis_client
+        self.local.clear()
+        self.versions.clear()
+        self.versions_seen.clear()
+
+    @staticmethod
+    def make_key(params: Dict[str, Any]) -> str:
+        """Normalize request params into a key, ignoring order and unset params"""
+        normalized = sorted(
+            (name, sorted(value) if isinstance(value, (list, tuple, set)) else value)
+            for name, value in params.items()
+            if value is not None
+        )
+        return json.dumps(normalized, separators=(",", ":"), default=str)
+
+    async def get_or_set(
+        self,
+        namespace: str,
+        params: Dict[str, Any],
+        loader: Callable[[], Awaitable[str]],
+        ttl: float | None = None,
+    ) -> str:
+        """Return the cached value for `params`, calling `loader` on a miss"""
+        version = await self._version(namespace)
+        if version is None:
+            # can't tell whether cached entries are still valid
+            self.metrics["misses"] += 1
+            return await loader()
+
+        key = f"{self.prefix}:{namespace}:{version}:{self.make_key(params)}"
+        ttl = ttl or self.ttl
+
+        value = self.local.get(key)
+        if value is not None:
+            self.metrics["local_hits"] += 1
+            return value
+
+        if self.redis is not None:
+            try:
+                value = await self.redis.get(key)
+            except Exception as e:
+                self.metrics["errors"] += 1
+                logger.warning(f"Response cache read failed: {e}")
+            if value is not None:
+                self.metrics["redis_hits"] += 1
+                self.local.set(key, value, ttl)
+                return value
+
+        self.metrics["misses"] += 1
+        value = await loader()
+        self.local.set(key, value, ttl)
+
+        if self.redis is not None:
+            try:
+                await self.redis.set(key, value, ex=math.ceil(ttl))
+            except Exception as e:
+                self.metrics["errors"] += 1
+                logger.warning(f"Response cache write failed: {e}")
+
+        return value
+
+    async def invalidate(self, *namespaces: str):
+        """Discard every entry cached under `namespaces`"""
+        for namespace in namespaces:
+            self.metrics["invalidations"] += 1
+            if self.redis is None:
+                self.versions[namespace] = self.versions.get(namespace, 0) + 1
+                continue
+
+            try:
+                version = await self.redis.incr(self._version_key(namespace))
+                self._set_version(namespace, version)
+                await self.redis.publish(
+                    self.channel,
+                    json.dumps({"namespace": namespace, "version": version}),
+                )
+            except Exception as e:
+                # at least stop serving this worker's copies
+                self.metrics["errors"] += 1
+                self.local.clear()
+                self.versions_seen.pop(namespace, None)
+                logger.warning(f"Response cache invalidation failed: {e}")
+
+    async def listen(self):
+        """Apply namespace versions bumped by other workers"""
+        try:
+            pubsub = self.redis.pubsub()  # type: ignore
+            await pubsub.subscribe(self.channel)
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    try:
+                        data = json.loads(message["data"])
+                        namespace, version = data["namespace"], data["version"]
+                        # messages from different workers may cross
+                        if version > self.versions.get(namespace, -1):
+                            self._set_version(namespace, version)
+                    except Exception as e:
+                        logger.error(f"Error processing response cache message: {e}")
+        except Exception as e:
+            logger.error(f"Response cache listener error: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and the current size of the local tier"""
+        hits = self.metrics["local_hits"] + self.metrics["redis_hits"]
+        lookups = hits + self.metrics["misses"]
+        return {
+            **self.metrics,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "local_entries": len(self.local),
+        }
+
+    def _version_key(self, namespace: str) -> str:
+        return f"{self.prefix}:{namespace}:version"
+
+    def _set_version(self, namespace: str, version: int):
+        self.versions[namespace] = version
+        self.versions_seen[namespace] = time.monotonic()
+
+    async def _version(self, namespace: str) -> str | None:
+        if self.redis is None:
+            return str(self.versions.get(namespace, 0))
+
+        seen = self.versions_seen.get(namespace)
+        if seen is not None and time.monotonic() - seen < RESPONSE_CACHE_VERSION_TTL:
+            return str(self.versions[namespace])
+
+        self.metrics["version_reads"] += 1
+        try:
+            version = await self.redis.get(self._version_key(namespace))
+        except Exception as e:
+            self.metrics["errors"] += 1
+            logger.warning(f"Response cache version read failed: {e}")
+            return None
+
+        self._set_version(namespace, int(version or 0))
+        return str(self.versions[namespace])
+
+
+response_cache = ResponseCache()
@@ -1,6 +1,11 @@
+from typing import Iterable, Tuple
+
 import redis.asyncio as redis
 from fakeredis import FakeAsyncRedis
 
+# Commands sent per pipeline round trip by publish_many
+PUBLISH_BATCH_SIZE = 1000
+
 
 class RedisManager:
     def __init__(self):
@@ -30,6 +35,31 @@ class RedisManager:
         if self.redis_client:
             await self.redis_client.publish(channel, message)
 
+    async def publish_many(
+        self,
+        messages: Iterable[Tuple[str, str]],
+        batch_size: int = PUBLISH_BATCH_SIZE,
+    ) -> int:
+        """
+        Publish (channel, message) pairs, pipelining `batch_size` of them per
+        round trip. Returns how many were published.
+        """
+        if not self.redis_client:
+            return 0
+
+        published = 0
+        pipe = self.redis_client.pipeline(transaction=False)
+        for channel, message in messages:
+            pipe.publish(channel, message)
+            published += 1
+            if published % batch_size == 0:
+                await pipe.execute()
+
+        if published % batch_size:
+            await pipe.execute()
+
+        return published
+
     async def subscribe(self, channel: str):
         """Subscribe to Redis channel"""
         if self.redis_client:
@@ -1,18 +1,38 @@
+from enum import Enum
 from typing import Generic, List, TypeVar
 
-from pydantic import BaseModel
+from pydantic import BaseModel, model_serializer
 
 T = TypeVar("T")
 
 
+class CountMode(str, Enum):
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+    NONE = "none"
+
+
 class PaginatedResponse(BaseModel, Generic[T]):
-    total: int
+    total: int | None
     limit: int
     offset: int
     data: List[T]
+    has_more: bool | None = None
+    next_cursor: str | None = None
+
+    @model_serializer(mode="wrap")
+    def _omit_unused_fields(self, handler):
+        # keep the plain offset response shape unless has_more/cursor are in use
+        data = handler(self)
+        for field in ("has_more", "next_cursor"):
+            if data.get(field) is None:
+                data.pop(field, None)
+        return data
 
 
 class CommonParams(BaseModel):
     search: str | None
     limit: int
     offset: int
+    cursor: str | None = None
+    count: CountMode = CountMode.EXACT
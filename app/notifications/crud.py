@@ -2,7 +2,9 @@ from fastapi.exceptions import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import func, select
 
+from app.models.schema import CountMode
 from app.notifications.models import Notification
+from app.utils.pagination import count_rows, split_page
 
 
 async def get_notifications(
@@ -11,11 +13,12 @@ async def get_notifications(
     offset: int,
     session: AsyncSession,
     current_user: int,
+    count: CountMode = CountMode.EXACT,
 ):
     query = (
         select(Notification)
         .where(Notification.owner_id == current_user)
-        .limit(limit)
+        .limit(limit + 1)
         .offset(offset)
     )
     total_query = (
@@ -31,11 +34,12 @@ async def get_notifications(
         total_query = total_query.where(condition)
 
     notifications = await session.execute(query)
-    notifications_result = notifications.scalars().all()
-    total = await session.execute(total_query)
-    total_result = total.scalars().one()
+    notifications_result, has_more = split_page(
+        notifications.scalars().all(), limit
+    )
+    total_result = await count_rows(session, total_query, count)
 
-    return notifications_result, total_result
+    return notifications_result, total_result, has_more
 
 
 async def mark_notification_as_read(
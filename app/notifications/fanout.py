@@ -0,0 +1,340 @@
+import asyncio
+import json
+import os
+import socket
+import time
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List
+
+from redis.exceptions import ResponseError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlmodel import insert, select
+
+from app.notifications.models import Notification, NotificationType
+from app.realtime.events import publish_notifications
+from app.users.models import UserFollowLink
+from app.utils.logger import logger
+
+# Followers notified per INSERT (and per pipelined publish)
+FANOUT_BATCH_SIZE = int(os.getenv("NOTIFICATION_FANOUT_BATCH_SIZE", "1000"))
+
+# Jobs kept in the stream, acknowledged ones are deleted right away
+FANOUT_STREAM_MAXLEN = int(os.getenv("NOTIFICATION_FANOUT_STREAM_MAXLEN", "100000"))
+
+# Jobs left unacknowledged this long by a dead worker are taken over
+FANOUT_CLAIM_IDLE_MS = int(os.getenv("NOTIFICATION_FANOUT_CLAIM_IDLE_MS", "60000"))
+
+# Seconds between two sweeps of the stream for jobs left unacknowledged
+FANOUT_RECLAIM_INTERVAL = float(
+    os.getenv("NOTIFICATION_FANOUT_RECLAIM_INTERVAL", "30")
+)
+
+# Jobs taken over per sweep
+FANOUT_RECLAIM_COUNT = 100
+
+# Runs of a job before it's moved to the dead-letter stream
+FANOUT_MAX_ATTEMPTS = int(os.getenv("NOTIFICATION_FANOUT_MAX_ATTEMPTS", "5"))
+
+
+class NotificationFanout:
+    """
+    Fan-out-on-write of notifications to an author's followers.
+
+    Requests only append a small job (author, type, blog, message) to a Redis
+    stream; a background worker reads it through a consumer group, pages
+    through the followers in batches, bulk inserts a batch of notifications
+    per transaction and publishes their real-time events in one pipeline.
+    Progress is checkpointed after each batch and a job is acknowledged only
+    once done, so a job interrupted by a crash is resumed, not repeated.
+
+    Jobs left unacknowledged, by a failure or a dead worker, are swept up
+    periodically and retried; after `FANOUT_MAX_ATTEMPTS` runs a job is
+    moved to the dead-letter stream instead.
+
+    Without Redis, or when bound inline (tests), jobs run in the request.
+    """
+
+    stream = "notification_jobs"
+    group = "fanout"
+    progress_key = "notification_jobs:progress"
+    attempts_key = "notification_jobs:attempts"
+    dead_letter_stream = "notification_jobs:dead"
+
+    def __init__(self):
+        self.redis = None
+        self.inline = True
+        self.consumer = f"{socket.gethostname()}-{os.getpid()}"
+        self._group_ready = False
+        self.metrics: Dict[str, int] = {
+            "completed": 0,
+            "failed": 0,
+            "reclaimed": 0,
+            "dead_lettered": 0,
+        }
+
+    def bind(self, redis_client, inline: bool = False):
+        self.redis = redis_client
+        self.inline = inline
+        self._group_ready = False
+
+    async def enqueue(
+        self,
+        session: AsyncSession,
+        author_id: int,
+        notification_type: NotificationType,
+        blog_id: int | None,
+        message: str,
+    ) -> str | None:
+        """
+        Queue notifying the followers of `author_id`.
+
+        Returns the job's stream id, None if it ran inline.
+        """
+        job = {
+            "author_id": author_id,
+            "notification_type": notification_type.value,
+            "blog_id": blog_id,
+            "message": message,
+        }
+
+        if self.redis is not None and not self.inline:
+            try:
+                return await self.redis.xadd(
+                    self.stream,
+                    {"job": json.dumps(job)},
+                    maxlen=FANOUT_STREAM_MAXLEN,
+                    approximate=True,
+                )
+            except Exception as e:
+                logger.error(f"Could not queue notification job: {e}")
+
+        await self.fan_out(session, job)
+        return None
+
+    async def fan_out(
+        self,
+        session: AsyncSession,
+        job: Dict[str, Any],
+        after_follower_id: int = 0,
+        checkpoint: Callable[[int], Awaitable[None]] | None = None,
+    ) -> int:
+        """
+        Notify the followers of the job's author with an id above
+        `after_follower_id`, one batch per transaction.
+
+        Returns how many notifications were created.
+        """
+        notification_type = NotificationType(job["notification_type"])
+        created = 0
+
+        while True:
+            result = await session.execute(
+                select(UserFollowLink.follower_id)
+                .where(
+                    UserFollowLink.following_id == job["author_id"],
+                    UserFollowLink.follower_id > after_follower_id,  # type: ignore
+                )
+                .order_by(UserFollowLink.follower_id)  # type: ignore
+                .limit(FANOUT_BATCH_SIZE)
+            )
+            follower_ids: List[int] = list(result.scalars().all())  # type: ignore
+            if not follower_ids:
+                break
+
+            result = await session.execute(
+                insert(Notification)
+                .values(
+                    [
+                        {
+                            "owner_id": follower_id,
+                            "triggered_by_user_id": job["author_id"],
+                            "blog_id": job["blog_id"],
+                            "notification_type": notification_type,
+                            "message": job["message"],
+                        }
+                        for follower_id in follower_ids
+                    ]
+                )
+                .returning(Notification)
+            )
+            notifications = list(result.scalars().all())
+            await session.commit()
+            created += len(notifications)
+
+            try:
+                await publish_notifications(notifications)
+            except Exception as e:
+                logger.error(f"Failed to publish notifications: {e}")
+
+            after_follower_id = follower_ids[-1]
+            if checkpoint:
+                await checkpoint(after_follower_id)
+
+            if len(follower_ids) < FANOUT_BATCH_SIZE:
+                break
+
+        return created
+
+    async def process(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        count: int = 10,
+        block_ms: int | None = None,
+    ) -> int:
+        """Run the next queued jobs; returns how many were processed"""
+        await self._ensure_group()
+
+        response = await self.redis.xreadgroup(  # type: ignore
+            self.group, self.consumer, {self.stream: ">"}, count=count, block=block_ms
+        )
+        messages = [message for _, entries in response or [] for message in entries]
+        await self._run_jobs(session_factory, messages)
+        return len(messages)
+
+    async def recover(self, session_factory: async_sessionmaker[AsyncSession]) -> int:
+        """Run jobs left unacknowledged by this consumer or by dead workers"""
+        await self._ensure_group()
+
+        response = await self.redis.xreadgroup(  # type: ignore
+            self.group, self.consumer, {self.stream: "0"}
+        )
+        messages = [message for _, entries in response or [] for message in entries]
+
+        pending_ids = {message_id for message_id, _ in messages}
+        messages.extend(
+            message
+            for message in await self._claim_idle()
+            if message[0] not in pending_ids
+        )
+
+        await self._run_jobs(session_factory, messages)
+        return len(messages)
+
+    async def reclaim(self, session_factory: async_sessionmaker[AsyncSession]) -> int:
+        """
+        Retry jobs left unacknowledged for `FANOUT_CLAIM_IDLE_MS`, whichever
+        consumer they were delivered to; returns how many were taken over
+        """
+        await self._ensure_group()
+
+        messages = await self._claim_idle()
+        await self._run_jobs(session_factory, messages)
+        return len(messages)
+
+    async def run_worker(
+        self, session_factory: async_sessionmaker[AsyncSession], block_ms: int = 5000
+    ):
+        """Process queued jobs, and sweep up failed ones, until cancelled"""
+        try:
+            await self.recover(session_factory)
+        except Exception as e:
+            logger.error(f"Error recovering notification jobs: {e}")
+        last_reclaim = time.monotonic()
+
+        while True:
+            try:
+                if time.monotonic() - last_reclaim >= FANOUT_RECLAIM_INTERVAL:
+                    last_reclaim = time.monotonic()
+                    await self.reclaim(session_factory)
+                await self.process(session_factory, block_ms=block_ms)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Notification fan-out worker error: {e}")
+                await asyncio.sleep(1)
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self.metrics)
+
+    async def _run_jobs(
+        self, session_factory: async_sessionmaker[AsyncSession], messages: list
+    ):
+        for message_id, fields in messages:
+            if not fields:
+                # deleted while pending
+                await self._ack(message_id)
+                continue
+
+            try:
+                attempts = await self.redis.hincrby(  # type: ignore
+                    self.attempts_key, message_id, 1
+                )
+                if attempts > FANOUT_MAX_ATTEMPTS:
+                    await self._dead_letter(message_id, fields, attempts - 1)
+                    continue
+
+                job = json.loads(fields["job"])
+                # followers already notified before an interruption
+                progress = await self.redis.hget(  # type: ignore
+                    self.progress_key, message_id
+                )
+
+                async with session_factory() as session:
+                    await self.fan_out(
+                        session,
+                        job,
+                        int(progress or 0),
+                        checkpoint=partial(self._checkpoint, message_id),
+                    )
+                await self._ack(message_id)
+                self.metrics["completed"] += 1
+
+            except Exception as e:
+                # left pending, retried by `reclaim`
+                self.metrics["failed"] += 1
+                logger.error(f"Notification job {message_id} failed: {e}")
+
+    async def _claim_idle(self) -> list:
+        _, claimed, *_ = await self.redis.xautoclaim(  # type: ignore
+            self.stream,
+            self.group,
+            self.consumer,
+            FANOUT_CLAIM_IDLE_MS,
+            "0-0",
+            count=FANOUT_RECLAIM_COUNT,
+        )
+        self.metrics["reclaimed"] += len(claimed)
+        return claimed
+
+    async def _dead_letter(self, message_id: str, fields: dict, attempts: int):
+        """Set aside a job that keeps failing, for inspection"""
+        await self.redis.xadd(  # type: ignore
+            self.dead_letter_stream,
+            {**fields, "message_id": message_id, "attempts": attempts},
+            maxlen=FANOUT_STREAM_MAXLEN,
+            approximate=True,
+        )
+        await self._ack(message_id)
+        self.metrics["dead_lettered"] += 1
+        logger.error(
+            f"Notification job {message_id} dead-lettered after {attempts} attempts"
+        )
+
+    async def _checkpoint(self, message_id: str, follower_id: int):
+        await self.redis.hset(  # type: ignore
+            self.progress_key, message_id, follower_id
+        )
+
+    async def _ack(self, message_id: str):
+        pipe = self.redis.pipeline(transaction=False)  # type: ignore
+        pipe.xack(self.stream, self.group, message_id)
+        pipe.xdel(self.stream, message_id)
+        pipe.hdel(self.progress_key, message_id)
+        pipe.hdel(self.attempts_key, message_id)
+        await pipe.execute()
+
+    async def _ensure_group(self):
+        if self._group_ready:
+            return
+
+        try:
+            await self.redis.xgroup_create(  # type: ignore
+                self.stream, self.group, id="0", mkstream=True
+            )
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
+
+
+notification_fanout = NotificationFanout()
@@ -5,7 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.auth.dependency import get_current_user
 from app.auth.schemas import UserRead
 from app.core.services.database import get_session
-from app.models.schema import CommonParams, PaginatedResponse
+from app.models.schema import CommonParams, CountMode, PaginatedResponse
 from app.notifications.crud import get_notifications, mark_notification_as_read
 from app.notifications.schema import NotificationResponse
 from app.utils.common_params import get_common_params
@@ -27,12 +27,13 @@ async def get_notifications_route(
     current_user: UserRead = Depends(get_current_user),
 ):
     try:
-        notifications_result, total_result = await get_notifications(
+        notifications_result, total_result, has_more = await get_notifications(
             session=session,
             search=params.search,
             limit=params.limit,
             offset=params.offset,
             current_user=current_user.id,
+            count=params.count,
         )
 
         return PaginatedResponse[NotificationResponse](
@@ -42,6 +43,7 @@ async def get_notifications_route(
             data=[
                 NotificationResponse.model_validate(obj) for obj in notifications_result
             ],
+            has_more=has_more if params.count != CountMode.EXACT else None,
         )
 
     except HTTPException:
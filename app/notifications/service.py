@@ -5,7 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import insert
 
 from app.notifications.models import Notification, NotificationType
-from app.realtime.events import publish_notification
+from app.realtime.events import publish_notification, publish_notifications
 from app.utils.logger import logger
 
 
@@ -79,17 +79,14 @@ async def create_notifications(
             await session.commit()
             inserted_notifications = list(result.scalars().all())
 
-            # Publish real-time events
+            # Publish real-time events in pipelined batches
             if request and hasattr(request.app.state, "redis_manager"):
-                for notification in inserted_notifications:
-                    try:
-                        await publish_notification(
-                            notification, request.app.state.redis_manager
-                        )
-                    except Exception as e:
-                        logger.error(
-                            f"Failed to publish notification {notification.id}: {e}"
-                        )
+                try:
+                    await publish_notifications(
+                        inserted_notifications, request.app.state.redis_manager
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to publish notifications: {e}")
             else:
                 logger.warning(
                     "Redis manager not available, notifications not published to real-time"
@@ -0,0 +1,143 @@
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from typing import Any, Dict, List
+
+from sse_starlette import ServerSentEvent
+
+# Messages buffered per SSE connection before the oldest are dropped
+SSE_QUEUE_SIZE = int(os.getenv("SSE_QUEUE_SIZE", "100"))
+
+# Seconds a full queue's oldest message may wait before the client is evicted
+SSE_MAX_LAG = float(os.getenv("SSE_MAX_LAG", "30"))
+
+# Seconds between the heartbeats keeping idle connections open through proxies
+SSE_HEARTBEAT_INTERVAL = float(os.getenv("SSE_HEARTBEAT_INTERVAL", "30"))
+
+# Queued in place of messages once a connection is closed by the server
+CLOSED = object()
+
+# Heartbeat frame, encoded once and queued as is to every idle connection
+HEARTBEAT = ServerSentEvent(
+    event="heartbeat", data=json.dumps({"timestamp": "now"})
+).encode()
+
+
+def notification_frame(event_id: int, data: str) -> bytes:
+    """
+    SSE frame of one notification, built once and queued by reference to
+    every connection of its user. `data` is the single-line JSON payload as
+    published to Redis.
+    """
+    return b"id: %d\r\nevent: notification\r\ndata: %s\r\n\r\n" % (
+        event_id,
+        data.encode(),
+    )
+
+
+def frame_event_id(frame: bytes) -> int:
+    """Event id of a notification frame"""
+    return int(frame[4 : frame.index(b"\r\n")])
+
+
+def frame_data(frame: bytes) -> str:
+    """JSON payload of a notification frame"""
+    start = frame.index(b"data: ") + 6
+    return frame[start : frame.index(b"\r\n", start)].decode()
+
+
+def batch_message(seq: int, frames: List[bytes]) -> str:
+    """
+    WebSocket message carrying several notification frames, built from their
+    encoded payloads without decoding them
+    """
+    events = ",".join(
+        '{"id":%d,"data":%s}' % (frame_event_id(frame), frame_data(frame))
+        for frame in frames
+    )
+    return '{"type":"notifications","seq":%d,"events":[%s]}' % (seq, events)
+
+
+def _size(item) -> int:
+    return len(item) if isinstance(item, (str, bytes)) else 0
+
+
+class ConnectionQueue(asyncio.Queue):
+    """
+    Bounded message queue of one SSE connection, with its delivery metrics.
+
+    When the client falls behind, the oldest queued message is dropped to make
+    room for the newest. A client whose full queue has not moved for
+    `max_lag` seconds is stalled, and `offer` reports it should be evicted.
+    """
+
+    def __init__(self, maxsize: int = SSE_QUEUE_SIZE, max_lag: float = SSE_MAX_LAG):
+        super().__init__(maxsize)
+        self.max_lag = max_lag
+        self.connected_at = time.monotonic()
+        self.delivered = 0
+        self.dropped = 0
+        self.queued_bytes = 0
+        self.closed = False
+        self._enqueued_at: deque[float] = deque()
+
+    def offer(self, message) -> bool:
+        """Queue `message` without waiting; False if the client is stalled"""
+        if self.closed:
+            return False
+        if self.full():
+            if self.lag > self.max_lag:
+                return False
+            # coalesce: the client only misses the oldest message
+            self._drop_oldest()
+        self.put_nowait(message)
+        return True
+
+    def close(self):
+        """Discard queued messages and wake the consumer with CLOSED"""
+        self.closed = True
+        while not self.empty():
+            self._drop_oldest()
+        self.put_nowait(CLOSED)
+
+    @property
+    def lag(self) -> float:
+        """Seconds the oldest queued message has been waiting"""
+        if not self._enqueued_at:
+            return 0.0
+        return time.monotonic() - self._enqueued_at[0]
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "queued": self.qsize(),
+            "queued_bytes": self.queued_bytes,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "lag": round(self.lag, 3),
+            "connected_for": round(time.monotonic() - self.connected_at, 3),
+        }
+
+    def _drop_oldest(self):
+        item = super()._get()
+        self._dequeued(item)
+        if item is not CLOSED:
+            self.dropped += 1
+
+    def _dequeued(self, item):
+        self._enqueued_at.popleft()
+        self.queued_bytes -= _size(item)
+
+    # asyncio.Queue storage hooks, also used by put/get
+    def _put(self, item):
+        super()._put(item)
+        self._enqueued_at.append(time.monotonic())
+        self.queued_bytes += _size(item)
+
+    def _get(self):
+        item = super()._get()
+        self._dequeued(item)
+        if item is not CLOSED:
+            self.delivered += 1
+        return item
@@ -1,17 +1,33 @@
 import json
+import os
+from collections import defaultdict
+from itertools import islice
+from typing import Dict, Iterable, List, Tuple
 
 from app.core.services.redis import redis_manager
 from app.notifications.models import Notification
+from app.realtime import sharding
+from app.realtime.replay import record_events
+from app.realtime.sharding import shard_channel
 
+# Channel of messages carrying the events of several users at once
+NOTIFICATION_BATCH_CHANNEL = "notifications:batch"
 
-async def publish_notification(notification: Notification, redis_manager_instance=None):
-    """publish notification event to redis"""
+# Publish one message per batch of notifications instead of one per user
+NOTIFICATION_BATCH_MESSAGES = os.getenv("NOTIFICATION_BATCH_MESSAGES") == "1"
 
-    # use provided instance of redis manager or global one
-    manager = redis_manager_instance or redis_manager
+# Events per batch message
+NOTIFICATION_BATCH_SIZE = int(os.getenv("NOTIFICATION_BATCH_SIZE", "500"))
 
-    # create notification payload
-    notification_data = {
+
+def user_channel(user_id: int) -> str:
+    """Channel of the notifications sent to `user_id`"""
+    return f"notifications:{user_id}"
+
+
+def notification_payload(notification: Notification) -> dict:
+    """Real-time event data sent to the notification's owner"""
+    return {
         "id": notification.id,
         "type": notification.notification_type,
         "message": notification.message,
@@ -21,6 +37,95 @@ async def publish_notification(notification: Notification, redis_manager_instanc
         "is_read": notification.is_read,
     }
 
+
+async def publish_notification(notification: Notification, redis_manager_instance=None):
+    """publish notification event to redis"""
+
+    # use provided instance of redis manager or global one
+    manager = redis_manager_instance or redis_manager
+
+    # buffered first, so a client reconnecting meanwhile can replay it
+    await record_events(manager, _replay_events([notification]))
+
+    # users are spread over shard channels when sharding is enabled
+    ring = sharding.shard_ring
+    if ring is not None:
+        shard = ring.shard_for(notification.owner_id)
+        await manager.publish(*_events_message(shard_channel(shard), [notification]))
+        return
+
     # publish to redis channel specific to the user
-    channel = f"notifications:{notification.owner_id}"
-    await manager.publish(channel, json.dumps(notification_data))
+    channel = user_channel(notification.owner_id)
+    await manager.publish(channel, json.dumps(notification_payload(notification)))
+
+
+async def publish_notifications(
+    notifications: Iterable[Notification],
+    redis_manager_instance=None,
+    batched: bool | None = None,
+) -> int:
+    """
+    publish notification events to redis in pipelined round trips
+
+    With sharding enabled (NOTIFICATION_SHARDS) the events go to their users'
+    shard channels, a few messages per shard. Otherwise `batched` (default:
+    NOTIFICATION_BATCH_MESSAGES) sends them as a few messages on the batch
+    channel, each listing its target users, instead of one message per user
+    channel. Returns how many messages were published.
+    """
+    manager = redis_manager_instance or redis_manager
+    if batched is None:
+        batched = NOTIFICATION_BATCH_MESSAGES
+
+    notifications = list(notifications)
+    await record_events(manager, _replay_events(notifications))
+
+    ring = sharding.shard_ring
+    if ring is not None:
+        by_shard: Dict[int, List[Notification]] = defaultdict(list)
+        for notification in notifications:
+            by_shard[ring.shard_for(notification.owner_id)].append(notification)
+
+        messages = (
+            _events_message(shard_channel(shard), batch)
+            for shard, shard_notifications in by_shard.items()
+            for batch in _batches(shard_notifications, NOTIFICATION_BATCH_SIZE)
+        )
+    elif batched:
+        messages = (
+            _events_message(NOTIFICATION_BATCH_CHANNEL, batch)
+            for batch in _batches(notifications, NOTIFICATION_BATCH_SIZE)
+        )
+    else:
+        messages = (
+            (
+                user_channel(notification.owner_id),
+                json.dumps(notification_payload(notification)),
+            )
+            for notification in notifications
+        )
+
+    return await manager.publish_many(messages)
+
+
+def _events_message(
+    channel: str, notifications: Iterable[Notification]
+) -> Tuple[str, str]:
+    """A message carrying the events of several users"""
+    events = [
+        {"user_id": notification.owner_id, "data": notification_payload(notification)}
+        for notification in notifications
+    ]
+    return channel, json.dumps({"events": events})
+
+
+def _replay_events(notifications: Iterable[Notification]):
+    for notification in notifications:
+        data = json.dumps(notification_payload(notification))
+        yield notification.owner_id, notification.id, data
+
+
+def _batches(items: Iterable, size: int):
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
@@ -1,56 +1,247 @@
 import asyncio
 import json
-from typing import Dict, Set
+from typing import Any, Dict, Set
 
+from app.realtime import sharding
+from app.realtime.connection import (
+    HEARTBEAT,
+    SSE_HEARTBEAT_INTERVAL,
+    ConnectionQueue,
+    notification_frame,
+)
+from app.realtime.events import NOTIFICATION_BATCH_CHANNEL, user_channel
+from app.realtime.sharding import (
+    SHARD_CHANNEL_PREFIX,
+    ConsistentHashRing,
+    shard_channel,
+)
 from app.utils.logger import logger
 
+# Most lagging connections listed in the stats
+SSE_STATS_LAGGING = 10
+
 
 # Server-Sent Event Manager
 class SSEManager:
-    def __init__(self):
+    """
+    Connected SSE clients of this worker, by user.
+
+    The worker subscribes to a user's notification channel when the user's
+    first connection opens and unsubscribes when the last one closes, so it
+    only receives the notifications of users connected to it.
+
+    With a shard ring, users' notifications are published on shard channels
+    instead. The worker keeps which of its users are on each shard and runs
+    one listener per shard it has users on, so it reads a bounded number of
+    channels however many users are connected.
+    """
+
+    def __init__(self, ring: ConsistentHashRing | None = None):
         self.connections: Dict[int, Set[asyncio.Queue]] = {}
+        self.pubsub = None
+        self.ring = ring
+        self.redis_manager = None
+        # routing table: connected users and listener of each shard
+        self.shard_users: Dict[int, Set[int]] = {}
+        self.shard_tasks: Dict[int, asyncio.Task] = {}
+        self.metrics: Dict[str, int] = {"evicted": 0}
 
-    def add_connection(self, user_id: int, queue: asyncio.Queue):
+    async def add_connection(self, user_id: int, queue: asyncio.Queue):
         if user_id not in self.connections:
             self.connections[user_id] = set()
+            if self.ring is None:
+                await self._subscribe(user_channel(user_id))
+            else:
+                self._join_shard(user_id)
         self.connections[user_id].add(queue)
 
-    def remove_connection(self, user_id: int, queue: asyncio.Queue):
+    async def remove_connection(self, user_id: int, queue: asyncio.Queue):
         if user_id in self.connections:
             self.connections[user_id].discard(queue)
             if not self.connections[user_id]:
                 del self.connections[user_id]
+                if self.ring is None:
+                    await self._unsubscribe(user_channel(user_id))
+                else:
+                    self._leave_shard(user_id)
 
     async def send_to_user(self, user_id: int, data: dict):
         if user_id in self.connections:
-            message = json.dumps(data)
-            for queue in self.connections[user_id].copy():
-                try:
-                    await queue.put(message)
-                except:
-                    # Remove broken connections
-                    self.connections[user_id].discard(queue)
+            await self.send_frame(
+                user_id, notification_frame(data["id"], json.dumps(data))
+            )
+
+    async def send_frame(self, user_id: int, frame: bytes):
+        """Queue one encoded frame, shared as is, to the user's connections"""
+        queues = self.connections.get(user_id)
+        if not queues:
+            return
+        for queue in queues.copy():
+            # never wait on a slow client: drop its oldest message or evict it
+            if not self._offer(queue, frame):
+                await self._evict(user_id, queue)
+
+    def heartbeat(self) -> int:
+        """Queue the shared heartbeat frame to idle connections"""
+        sent = 0
+        for queues in self.connections.values():
+            for queue in queues:
+                # connections with messages waiting don't need one
+                if queue.empty():
+                    queue.put_nowait(HEARTBEAT)
+                    sent += 1
+        return sent
+
+    async def run_heartbeat(self, interval: float = SSE_HEARTBEAT_INTERVAL):
+        """One timer for every connection instead of a timeout per connection"""
+        while True:
+            await asyncio.sleep(interval)
+            self.heartbeat()
+
+    def stats(self) -> Dict[str, Any]:
+        """Connection counts, evictions and the most lagging connections"""
+        queues = [
+            (user_id, queue)
+            for user_id, user_queues in self.connections.items()
+            for queue in user_queues
+            if isinstance(queue, ConnectionQueue)
+        ]
+        lagging = sorted(queues, key=lambda entry: entry[1].lag, reverse=True)
+        return {
+            **self.metrics,
+            "users": len(self.connections),
+            "connections": sum(len(queues) for queues in self.connections.values()),
+            "queued_bytes": sum(queue.queued_bytes for _, queue in queues),
+            "dropped": sum(queue.dropped for _, queue in queues),
+            "lagging": [
+                {"user_id": user_id, **queue.metrics()}
+                for user_id, queue in lagging[:SSE_STATS_LAGGING]
+            ],
+        }
 
     async def start_redis_listener(self, redis_manager):
         """Listen for Redis pub/sub messages and forward to SSE connections"""
+        self.redis_manager = redis_manager
         try:
-            pubsub = await redis_manager.psubscribe("notifications:*")
-            async for message in pubsub.listen():
-                if message["type"] == "pmessage":
-                    try:
-                        # Extract user_id from channel name: notifications:123
-                        channel = message["channel"]
-                        user_id = int(channel.split(":")[-1])
+            user_channels = (
+                [user_channel(user_id) for user_id in self.connections]
+                if self.ring is None
+                else []
+            )
+            pubsub = redis_manager.get_client().pubsub()
+            # batch messages can target any user, so every worker reads them
+            await pubsub.subscribe(NOTIFICATION_BATCH_CHANNEL, *user_channels)
+            self.pubsub = pubsub
 
-                        # Parse notification data
-                        notification_data = json.loads(message["data"])
+            for shard in self.shard_users:
+                self._start_shard_listener(shard)
 
-                        # Send to all SSE connections for this user
-                        await self.send_to_user(user_id, notification_data)
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    try:
+                        await self._dispatch(message["channel"], message["data"])
                     except Exception as e:
                         logger.error(f"Error processing Redis message: {e}")
         except Exception as e:
             logger.error(f"Redis listener error: {e}")
+        finally:
+            self.pubsub = None
+            self.redis_manager = None
+            for task in self.shard_tasks.values():
+                task.cancel()
+            self.shard_tasks.clear()
+
+    async def _listen_shard(self, shard: int):
+        """Forward the events of one shard channel to local connections"""
+        pubsub = self.redis_manager.get_client().pubsub()
+        try:
+            await pubsub.subscribe(shard_channel(shard))
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    try:
+                        await self._dispatch(message["channel"], message["data"])
+                    except Exception as e:
+                        logger.error(f"Error processing Redis message: {e}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Shard {shard} listener error: {e}")
+        finally:
+            await pubsub.aclose()
+
+    def _offer(self, queue: asyncio.Queue, frame: bytes) -> bool:
+        if isinstance(queue, ConnectionQueue):
+            return queue.offer(frame)
+        try:
+            queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    async def _evict(self, user_id: int, queue: asyncio.Queue):
+        logger.warning(f"Evicting slow SSE consumer of user {user_id}")
+        self.metrics["evicted"] += 1
+        await self.remove_connection(user_id, queue)
+        if isinstance(queue, ConnectionQueue):
+            queue.close()
+
+    def _join_shard(self, user_id: int):
+        shard = self.ring.shard_for(user_id)
+        self.shard_users.setdefault(shard, set()).add(user_id)
+        self._start_shard_listener(shard)
+
+    def _leave_shard(self, user_id: int):
+        shard = self.ring.shard_for(user_id)
+        users = self.shard_users.get(shard)
+        if users is None:
+            return
+        users.discard(user_id)
+        if not users:
+            del self.shard_users[shard]
+            task = self.shard_tasks.pop(shard, None)
+            if task is not None:
+                task.cancel()
+
+    def _start_shard_listener(self, shard: int):
+        # before the main listener starts, it starts every needed shard
+        if self.redis_manager is None or shard in self.shard_tasks:
+            return
+        self.shard_tasks[shard] = asyncio.create_task(self._listen_shard(shard))
+
+    async def _dispatch(self, channel: str, data: str):
+        # Several users' events in one message; only local users get theirs
+        if channel == NOTIFICATION_BATCH_CHANNEL or channel.startswith(
+            SHARD_CHANNEL_PREFIX
+        ):
+            for event in json.loads(data)["events"]:
+                await self.send_to_user(event["user_id"], event["data"])
+            return
+
+        # Extract user_id from channel name: notifications:123
+        user_id = int(channel.split(":")[-1])
+        if user_id not in self.connections:
+            return
+
+        # the payload is framed as published, read only for its event id
+        frame = notification_frame(json.loads(data)["id"], data)
+        await self.send_frame(user_id, frame)
+
+    async def _subscribe(self, channel: str):
+        # before the listener starts, it subscribes to every connected user
+        if self.pubsub is None:
+            return
+        try:
+            await self.pubsub.subscribe(channel)
+        except Exception as e:
+            logger.error(f"Could not subscribe to {channel}: {e}")
+
+    async def _unsubscribe(self, channel: str):
+        if self.pubsub is None:
+            return
+        try:
+            await self.pubsub.unsubscribe(channel)
+        except Exception as e:
+            logger.error(f"Could not unsubscribe from {channel}: {e}")
 
 
-sse_manager = SSEManager()
+sse_manager = SSEManager(sharding.shard_ring)
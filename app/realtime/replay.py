@@ -0,0 +1,69 @@
+import os
+from typing import Iterable, List, Tuple
+
+# Recent events kept per user for clients resuming with Last-Event-ID
+SSE_REPLAY_SIZE = int(os.getenv("SSE_REPLAY_SIZE", "100"))
+
+# Seconds a user's replay buffer outlives their last event
+SSE_REPLAY_TTL = int(os.getenv("SSE_REPLAY_TTL", "86400"))
+
+# Commands per pipeline round trip when recording events
+REPLAY_BATCH_SIZE = 300
+
+
+def replay_key(user_id: int) -> str:
+    """Sorted set of the user's recent events, scored by event id"""
+    return f"notifications:replay:{user_id}"
+
+
+async def record_events(
+    redis_manager, events: Iterable[Tuple[int, int, str]]
+) -> int:
+    """
+    Keep (user_id, event_id, data) events in their users' replay buffers,
+    trimmed to the SSE_REPLAY_SIZE newest. Event ids are notification ids,
+    so they only grow and buffers stay ordered even if publishers race.
+    """
+    client = redis_manager.get_client()
+    if client is None:
+        return 0
+
+    recorded = 0
+    pipe = client.pipeline(transaction=False)
+    for user_id, event_id, data in events:
+        key = replay_key(user_id)
+        pipe.zadd(key, {data: event_id})
+        pipe.zremrangebyrank(key, 0, -SSE_REPLAY_SIZE - 1)
+        pipe.expire(key, SSE_REPLAY_TTL)
+        recorded += 1
+        if recorded % REPLAY_BATCH_SIZE == 0:
+            await pipe.execute()
+
+    if recorded % REPLAY_BATCH_SIZE:
+        await pipe.execute()
+
+    return recorded
+
+
+async def events_since(
+    redis_manager, user_id: int, last_event_id: int
+) -> Tuple[List[Tuple[int, str]], bool]:
+    """
+    The user's buffered (event_id, data) events after `last_event_id`, and
+    whether older missed events were already trimmed from the buffer, in
+    which case the client has to refetch its notifications.
+    """
+    client = redis_manager.get_client()
+    if client is None:
+        return [], False
+
+    key = replay_key(user_id)
+    pipe = client.pipeline(transaction=False)
+    pipe.zrange(key, 0, 0, withscores=True)
+    pipe.zcard(key)
+    pipe.zrangebyscore(key, f"({last_event_id}", "+inf", withscores=True)
+    oldest, size, missed = await pipe.execute()
+
+    # a full buffer starting after the last seen event may have dropped some
+    truncated = size >= SSE_REPLAY_SIZE and oldest[0][1] > last_event_id
+    return [(int(score), data) for data, score in missed], truncated
@@ -1,58 +1,134 @@
-import asyncio
 import json
 
-from fastapi import APIRouter, Depends, Request
+import anyio
+from fastapi import APIRouter, Depends, Header, Query, WebSocket
 from sse_starlette import EventSourceResponse
 
-from app.auth.dependency import get_current_user_from_query
+from app.auth.dependency import (
+    get_current_user_from_query,
+    get_current_user_from_websocket,
+)
+from app.core.services.redis import redis_manager
+from app.realtime.connection import (
+    CLOSED,
+    HEARTBEAT,
+    ConnectionQueue,
+    frame_event_id,
+    notification_frame,
+)
 from app.realtime.manager import sse_manager
+from app.realtime.replay import events_since
+from app.realtime.websocket import notification_socket
 from app.users.models import User
 from app.utils.logger import logger
 
-router = APIRouter(prefix="/sse")
+router = APIRouter()
 
 
-@router.get("/notifications")
+class NotificationStreamResponse(EventSourceResponse):
+    """
+    SSE response kept alive by the manager's shared heartbeat.
+
+    EventSourceResponse already stops the stream when the ASGI receive channel
+    reports the disconnect; only its per-connection ping timer is dropped.
+    """
+
+    async def _ping(self, send):
+        await anyio.sleep_forever()
+
+
+@router.get("/sse/notifications")
 async def stream_notifications(
-    request: Request, current_user: User = Depends(get_current_user_from_query)
+    current_user: User = Depends(get_current_user_from_query),
+    last_event_id: int | None = Header(None),
+    resume_from: int | None = Query(None, alias="last_event_id"),
+):
+    """
+    SSE endpoint for real-time notifications
+
+    Browsers resume with the Last-Event-ID header when they reconnect; clients
+    opening a new stream can pass `last_event_id` instead. Events missed in
+    between are replayed before live ones.
+    """
+    if last_event_id is None:
+        last_event_id = resume_from
+
+    return NotificationStreamResponse(
+        notification_events(current_user.id, last_event_id)  # type: ignore
+    )
+
+
+@router.websocket("/ws/notifications")
+async def websocket_notifications(
+    websocket: WebSocket,
+    current_user: User = Depends(get_current_user_from_websocket),
+    last_event_id: int | None = Query(None),
 ):
-    """SSE endpoint for real-time notifications"""
-
-    async def event_stream():
-        # create queue for this connection
-        queue = asyncio.Queue()
-
-        # add connection to manager
-        sse_manager.add_connection(current_user.id, queue)  # type: ignore
-
-        try:
-            # send connection confirmation
-            yield {
-                "event": "connected",
-                "data": json.dumps({"message": "Connected to notifications"}),
-            }
-
-            # listen for messages
-            while True:
-                try:
-                    # wait for new messages with timeout
-                    message = await asyncio.wait_for(queue.get(), timeout=30.0)
-                    yield {"event": "notification", "data": message}
-                except asyncio.TimeoutError:
-                    # send heartbeat to keep connection alive
-                    yield {
-                        "event": "heartbeat",
-                        "data": json.dumps({"timestamp": "now"}),
-                    }
-
-                # check if client disconnected
-                if await request.is_disconnected():
-                    break
-
-        except Exception as e:
-            print(f"SSE connection error: {e}")
-        finally:
-            # clean up connection
-            sse_manager.remove_connection(current_user.id, queue)  # type: ignore
-
-    return EventSourceResponse(event_stream())
+    """
+    WebSocket endpoint for real-time notifications, fed by the same hub as SSE
+
+    Server messages:
+        {"type": "notifications", "seq": n, "events": [{"id": ..., "data": ...}]}
+        {"type": "heartbeat"}
+        {"type": "resync"} when missed notifications could not all be replayed
+
+    Clients acknowledge every batch up to `seq` with {"type": "ack", "seq": n};
+    sending pauses while WS_MAX_UNACKED batches are unacknowledged. Messages
+    are compressed by the server's permessage-deflate extension, which
+    uvicorn negotiates by default.
+    """
+    await websocket.accept()
+    await notification_socket(websocket, current_user.id, last_event_id)  # type: ignore
+
+
+async def notification_events(user_id: int, last_event_id: int | None = None):
+    """Events of one SSE connection"""
+    # create bounded queue for this connection
+    queue = ConnectionQueue()
+
+    # add connection to manager before replaying, so nothing falls in between
+    await sse_manager.add_connection(user_id, queue)
+
+    try:
+        # send connection confirmation
+        yield {
+            "event": "connected",
+            "data": json.dumps({"message": "Connected to notifications"}),
+        }
+
+        # replay the events published since the client's last one
+        replayed = set()
+        if last_event_id is not None:
+            missed, truncated = await events_since(
+                redis_manager, user_id, last_event_id
+            )
+            if truncated:
+                # older missed events are gone, the client has to refetch
+                yield {
+                    "event": "resync",
+                    "data": json.dumps({"message": "Notifications were missed"}),
+                }
+            for event_id, data in missed:
+                replayed.add(event_id)
+                yield notification_frame(event_id, data)
+
+        # forward encoded frames, heartbeats included, until the client leaves
+        while True:
+            frame = await queue.get()
+            if frame is CLOSED:
+                # evicted for not keeping up
+                break
+            if (
+                replayed
+                and frame is not HEARTBEAT
+                and frame_event_id(frame) in replayed
+            ):
+                continue
+            yield frame
+
+    except Exception as e:
+        logger.error(f"SSE connection error: {e}")
+    finally:
+        # clean up connection, even though the stream was cancelled
+        with anyio.CancelScope(shield=True):
+            await sse_manager.remove_connection(user_id, queue)
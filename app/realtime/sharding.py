@@ -0,0 +1,48 @@
+import hashlib
+import os
+from bisect import bisect_right
+
+# Notification channels users are spread over (0: one channel per user)
+NOTIFICATION_SHARDS = int(os.getenv("NOTIFICATION_SHARDS", "0"))
+
+# Points per shard on the hash ring, more spread users more evenly
+RING_REPLICAS = 100
+
+
+def _hash(value: str) -> int:
+    digest = hashlib.blake2b(value.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class ConsistentHashRing:
+    """
+    Maps users to shards on a hash ring with virtual nodes.
+
+    Publishers and workers compute the same shard for a user without sharing
+    a table, and changing the shard count only moves about 1/n of the users.
+    """
+
+    def __init__(self, shards: int, replicas: int = RING_REPLICAS):
+        self.shards = shards
+        points = sorted(
+            (_hash(f"shard-{shard}-{replica}"), shard)
+            for shard in range(shards)
+            for replica in range(replicas)
+        )
+        self._hashes = [point for point, _ in points]
+        self._shards = [shard for _, shard in points]
+
+    def shard_for(self, user_id: int) -> int:
+        index = bisect_right(self._hashes, _hash(str(user_id))) % len(self._hashes)
+        return self._shards[index]
+
+
+SHARD_CHANNEL_PREFIX = "notifications:shard:"
+
+
+def shard_channel(shard: int) -> str:
+    """Channel of the notifications of every user on `shard`"""
+    return f"{SHARD_CHANNEL_PREFIX}{shard}"
+
+
+shard_ring = ConsistentHashRing(NOTIFICATION_SHARDS) if NOTIFICATION_SHARDS else None
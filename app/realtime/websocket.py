@@ -0,0 +1,149 @@
+import asyncio
+import json
+import os
+
+from fastapi import WebSocket, WebSocketDisconnect, status
+
+from app.core.services.redis import redis_manager
+from app.realtime.connection import (
+    CLOSED,
+    HEARTBEAT,
+    ConnectionQueue,
+    batch_message,
+    frame_event_id,
+    notification_frame,
+)
+from app.realtime.manager import sse_manager
+from app.realtime.replay import events_since
+from app.utils.logger import logger
+
+# Notifications sent per WebSocket message at most
+WS_BATCH_SIZE = int(os.getenv("WS_BATCH_SIZE", "50"))
+
+# Batches a client may leave unacknowledged before sending pauses
+WS_MAX_UNACKED = int(os.getenv("WS_MAX_UNACKED", "8"))
+
+WS_HEARTBEAT = json.dumps({"type": "heartbeat"})
+WS_RESYNC = json.dumps({"type": "resync"})
+
+
+class AckWindow:
+    """Batches sent over one WebSocket and not acknowledged yet"""
+
+    def __init__(self, size: int = WS_MAX_UNACKED):
+        self.size = size
+        self.sent = 0
+        self.acked = 0
+        self._acked = asyncio.Event()
+
+    def next(self) -> int:
+        """Sequence number of the next batch"""
+        self.sent += 1
+        return self.sent
+
+    def ack(self, seq: int):
+        """Acknowledge every batch up to `seq`"""
+        if seq > self.acked:
+            self.acked = min(seq, self.sent)
+            self._acked.set()
+
+    async def wait_open(self):
+        while self.sent - self.acked >= self.size:
+            self._acked.clear()
+            await self._acked.wait()
+
+
+async def notification_socket(
+    websocket: WebSocket, user_id: int, last_event_id: int | None = None
+):
+    """
+    Serve notifications over an accepted WebSocket until either side closes.
+
+    The socket registers a bounded queue with the SSE hub like a stream does,
+    so it shares its subscriptions, heartbeats and slow-consumer eviction.
+    """
+    queue = ConnectionQueue()
+    window = AckWindow(WS_MAX_UNACKED)
+    await sse_manager.add_connection(user_id, queue)
+
+    tasks = [
+        asyncio.create_task(_send(websocket, queue, window, user_id, last_event_id)),
+        asyncio.create_task(_receive(websocket, window)),
+    ]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in tasks:
+            if task.done() and not task.cancelled() and task.exception():
+                exception = task.exception()
+                if not isinstance(exception, WebSocketDisconnect):
+                    logger.error(f"WebSocket connection error: {exception}")
+    finally:
+        for task in tasks:
+            task.cancel()
+        await sse_manager.remove_connection(user_id, queue)
+
+
+async def _send(
+    websocket: WebSocket,
+    queue: ConnectionQueue,
+    window: AckWindow,
+    user_id: int,
+    last_event_id: int | None,
+):
+    # replay the events published since the client's last one
+    replayed = set()
+    if last_event_id is not None:
+        missed, truncated = await events_since(redis_manager, user_id, last_event_id)
+        if truncated:
+            await websocket.send_text(WS_RESYNC)
+        frames = [notification_frame(event_id, data) for event_id, data in missed]
+        replayed.update(event_id for event_id, _ in missed)
+        for start in range(0, len(frames), WS_BATCH_SIZE):
+            await window.wait_open()
+            batch = frames[start : start + WS_BATCH_SIZE]
+            await websocket.send_text(batch_message(window.next(), batch))
+
+    while True:
+        # messages wait in the bounded queue while the client lags behind
+        await window.wait_open()
+
+        frame = await queue.get()
+        if frame is CLOSED:
+            # evicted for not keeping up
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+            return
+        if frame is HEARTBEAT:
+            await websocket.send_text(WS_HEARTBEAT)
+            continue
+
+        # batch whatever else is already waiting
+        frames = [frame]
+        closed = False
+        while len(frames) < WS_BATCH_SIZE and not queue.empty():
+            frame = queue.get_nowait()
+            if frame is CLOSED:
+                closed = True
+                break
+            if frame is not HEARTBEAT:
+                frames.append(frame)
+
+        if replayed:
+            frames = [
+                frame for frame in frames if frame_event_id(frame) not in replayed
+            ]
+        if frames:
+            await websocket.send_text(batch_message(window.next(), frames))
+        if closed:
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+            return
+
+
+async def _receive(websocket: WebSocket, window: AckWindow):
+    while True:
+        text = await websocket.receive_text()
+        try:
+            message = json.loads(text)
+            if message.get("type") == "ack":
+                window.ack(int(message["seq"]))
+        except (ValueError, KeyError, TypeError, AttributeError):
+            logger.warning("Ignoring malformed WebSocket message")
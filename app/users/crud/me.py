@@ -5,9 +5,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from sqlmodel import func, select
 
-from app.auth.hashing import hash_password, verify_password
+from app.auth.hashing import password_hasher
+from app.auth.principal_cache import principal_cache
 from app.auth.security import check_password_strength
 from app.blogs.models import Blog
+from app.blogs.search.service import blog_search_condition
 from app.users.models import BookMark, User
 from app.utils.remove_image import remove_image
 from app.utils.save_image import save_image
@@ -22,8 +24,13 @@ async def change_user_password(
     new_password: str,
     again_new_password: str,
 ):
+    # the password hash is left out of cached users
+    await session.refresh(current_user, ["hashed_password"])
     if current_user.hashed_password:
-        if not verify_password(current_password, current_user.hashed_password):
+        valid, _ = await password_hasher.verify(
+            current_password, current_user.hashed_password
+        )
+        if not valid:
             raise HTTPException(
                 status_code=400, detail="Your old password doesn't match"
             )
@@ -37,11 +44,12 @@ async def change_user_password(
     if new_password != again_new_password:
         raise HTTPException(status_code=400, detail="New passwords doesn't match")
 
-    hashed_new_password = hash_password(new_password)
+    hashed_new_password = await password_hasher.hash(new_password)
 
     current_user.hashed_password = hashed_new_password
     session.add(current_user)
     await session.commit()
+    await principal_cache.invalidate_user(current_user)
 
 
 async def update_user_profile(
@@ -68,6 +76,7 @@ async def update_user_profile(
     session.add(current_user)
     await session.commit()
     await session.refresh(current_user)
+    await principal_cache.invalidate_user(current_user)
 
 
 async def get_user_bookmarks(
@@ -87,8 +96,7 @@ async def get_user_bookmarks(
     condition = None
 
     if search:
-        search_term = f"%{search.lower()}%"
-        condition = func.lower(Blog.title).like(search_term)
+        condition = await blog_search_condition(session, search)
         blogs_query = blogs_query.where(condition)
 
     total_query = (
@@ -6,7 +6,10 @@ from sqlalchemy.orm import selectinload
 from sqlmodel import func, select
 
 from app.blogs.models import Blog
+from app.blogs.search.service import blog_search_condition
+from app.models.schema import CountMode
 from app.users.models import BookMark, User, UserFollowLink
+from app.utils.pagination import count_rows, split_page
 
 profile_pic_path: str = "users/profile_pic"
 
@@ -20,7 +23,12 @@ async def list_user_info(session: AsyncSession, user_id: int):
 
 
 async def list_user_bookmarks(
-    user_id: int, search: str | None, limit: int, offset: int, session: AsyncSession
+    user_id: int,
+    search: str | None,
+    limit: int,
+    offset: int,
+    session: AsyncSession,
+    count: CountMode = CountMode.EXACT,
 ):
     user = await session.get(User, user_id)
 
@@ -36,8 +44,7 @@ async def list_user_bookmarks(
     condition = None
 
     if search:
-        search_term = f"%{search.lower()}%"
-        condition = func.lower(Blog.title).like(search_term)
+        condition = await blog_search_condition(session, search)
         blogs_query = blogs_query.where(condition)
 
     total_query = (
@@ -50,19 +57,22 @@ async def list_user_bookmarks(
     if condition is not None:
         total_query = total_query.where(condition)
 
-    blogs_result, total_result = await asyncio.gather(
-        session.execute(blogs_query.limit(limit).offset(offset)),
-        session.execute(total_query),
+    blogs_result, total = await asyncio.gather(
+        session.execute(blogs_query.limit(limit + 1).offset(offset)),
+        count_rows(session, total_query, count),
     )
 
-    blogs = blogs_result.scalars().all()
-    total = total_result.scalar_one()
+    blogs, has_more = split_page(blogs_result.scalars().all(), limit)
 
-    return blogs, total
+    return blogs, total, has_more
 
 
 async def list_users(
-    search: str | None, limit: int, offset: int, session: AsyncSession
+    search: str | None,
+    limit: int,
+    offset: int,
+    session: AsyncSession,
+    count: CountMode = CountMode.EXACT,
 ):
     query = select(User)
     total_query = select(func.count()).select_from(User)
@@ -71,22 +81,30 @@ async def list_users(
         search_term = f"%{search.lower()}%"
         condition = func.lower(User.full_name).like(search_term)
         query = query.where(condition)
+        total_query = total_query.where(condition)
 
-    total = await session.execute(total_query.limit(limit).offset(offset))
-    total_result = total.scalars().one()
-    users = await session.execute(query)
-    users_result = users.scalars().all()
+    total_result = await count_rows(session, total_query, count)
+    users = await session.execute(
+        query.order_by(User.id).limit(limit + 1).offset(offset)
+    )
+    users_result, has_more = split_page(users.scalars().all(), limit)
 
     return {
         "total": total_result,
         "limit": limit,
         "offset": offset,
         "data": users_result,
+        "has_more": has_more if count != CountMode.EXACT else None,
     }
 
 
 async def list_followers(
-    user_id: int, search: str | None, limit: int, offset: int, session: AsyncSession
+    user_id: int,
+    search: str | None,
+    limit: int,
+    offset: int,
+    session: AsyncSession,
+    count: CountMode = CountMode.EXACT,
 ):
     if not await session.get(User, user_id):
         raise HTTPException(status_code=404, detail="User not found")
@@ -103,19 +121,25 @@ async def list_followers(
         base_query = base_query.where(condition)
 
     total_query = select(func.count()).select_from(base_query.subquery())
-    total_result = await session.execute(total_query)
-    total_count = total_result.scalar() or 0
+    total_count = await count_rows(session, total_query, count)
 
-    followers_query = base_query.limit(limit).offset(offset).order_by(User.full_name)
+    followers_query = (
+        base_query.limit(limit + 1).offset(offset).order_by(User.full_name)
+    )
 
     followers_result = await session.execute(followers_query)
-    followers = followers_result.scalars().all()
+    followers, has_more = split_page(followers_result.scalars().all(), limit)
 
-    return followers, total_count
+    return followers, total_count, has_more
 
 
 async def list_followings(
-    user_id: int, search: str | None, limit: int, offset: int, session: AsyncSession
+    user_id: int,
+    search: str | None,
+    limit: int,
+    offset: int,
+    session: AsyncSession,
+    count: CountMode = CountMode.EXACT,
 ):
     if not await session.get(User, user_id):
         raise HTTPException(status_code=404, detail="User not found")
@@ -132,12 +156,13 @@ async def list_followings(
         base_query = base_query.where(condition)
 
     total_query = select(func.count()).select_from(base_query.subquery())
-    total_result = await session.execute(total_query)
-    total_count = total_result.scalar() or 0
+    total_count = await count_rows(session, total_query, count)
 
-    followings_query = base_query.limit(limit).offset(offset).order_by(User.full_name)
+    followings_query = (
+        base_query.limit(limit + 1).offset(offset).order_by(User.full_name)
+    )
 
     followings_result = await session.execute(followings_query)
-    followings = followings_result.scalars().all()
+    followings, has_more = split_page(followings_result.scalars().all(), limit)
 
-    return followings, total_count
+    return followings, total_count, has_more
@@ -8,7 +8,7 @@ from app.auth.dependency import get_current_user
 from app.blogs.crud.blogs import list_user_blogs
 from app.blogs.schema import BlogResponse
 from app.core.services.database import AsyncSession, get_session
-from app.models.schema import CommonParams, PaginatedResponse
+from app.models.schema import CommonParams, CountMode, PaginatedResponse
 from app.users.crud.me import change_user_password, update_user_profile
 from app.users.crud.users import list_user_bookmarks, list_user_info
 from app.users.models import User
@@ -111,13 +111,15 @@ async def list_current_user_blog_route(
     current_user: UserRead = Depends(get_current_user),
 ):
     try:
-        blogs_result, total_result = await list_user_blogs(
+        blogs_result, total_result, has_more, next_cursor = await list_user_blogs(
             session=session,
             search=params.search,
             limit=params.limit,
             offset=params.offset,
             user_id=current_user.id,
             tags=tags,
+            cursor=params.cursor,
+            count=params.count,
         )
 
         data = [
@@ -128,7 +130,12 @@ async def list_current_user_blog_route(
         ]
 
         return PaginatedResponse[BlogResponse](
-            total=total_result, limit=params.limit, offset=params.offset, data=data
+            total=total_result,
+            limit=params.limit,
+            offset=params.offset,
+            data=data,
+            has_more=has_more if params.count != CountMode.EXACT else None,
+            next_cursor=next_cursor,
         )
 
     except HTTPException:
@@ -149,12 +156,13 @@ async def list_bookmarks_route(
     current_user: UserRead = Depends(get_current_user),
 ):
     try:
-        blogs, total = await list_user_bookmarks(
+        blogs, total, has_more = await list_user_bookmarks(
             session=session,
             search=params.search,
             limit=params.limit,
             offset=params.offset,
             user_id=current_user.id,
+            count=params.count,
         )
 
         data = [
@@ -165,7 +173,11 @@ async def list_bookmarks_route(
         ]
 
         return PaginatedResponse[BlogResponse](
-            total=total, limit=params.limit, offset=params.offset, data=data
+            total=total,
+            limit=params.limit,
+            offset=params.offset,
+            data=data,
+            has_more=has_more if params.count != CountMode.EXACT else None,
         )
 
     except HTTPException:
@@ -192,13 +204,15 @@ async def get_liked_blog_route(
 ):
     """Retrieve blogs liked by the current user."""
     try:
-        blogs_result, total_result = await get_liked_blogs(
+        blogs_result, total_result, has_more, next_cursor = await get_liked_blogs(
             session=session,
             search=params.search,
             limit=params.limit,
             offset=params.offset,
             user_id=current_user.id,
             tags=tags,
+            cursor=params.cursor,
+            count=params.count,
         )
 
         data = [
@@ -209,8 +223,15 @@ async def get_liked_blog_route(
         ]
 
         return PaginatedResponse[BlogResponse](
-            total=total_result, limit=params.limit, offset=params.offset, data=data
+            total=total_result,
+            limit=params.limit,
+            offset=params.offset,
+            data=data,
+            has_more=has_more if params.count != CountMode.EXACT else None,
+            next_cursor=next_cursor,
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"{str(e)}")
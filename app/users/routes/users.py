@@ -8,7 +8,7 @@ from app.auth.dependency import get_current_user
 from app.blogs.crud.blogs import list_user_blogs
 from app.blogs.schema import BlogResponse
 from app.core.services.database import AsyncSession, get_session
-from app.models.schema import CommonParams, PaginatedResponse
+from app.models.schema import CommonParams, CountMode, PaginatedResponse
 from app.users.crud.users import list_followers, list_followings, list_users
 from app.users.schema import UserRead, UserResponse
 from app.utils.common_params import get_common_params
@@ -35,6 +35,7 @@ async def list_users_route(
             search=params.search,
             limit=params.limit,
             offset=params.offset,
+            count=params.count,
         )
     except HTTPException:
         raise
@@ -57,16 +58,21 @@ async def list_followers_route(
 ):
     try:
 
-        followers, total = await list_followers(
+        followers, total, has_more = await list_followers(
             session=session,
             user_id=user_id,
             search=params.search,
             limit=params.limit,
             offset=params.offset,
+            count=params.count,
         )
         data = [UserResponse.model_validate(user) for user in followers]
         return PaginatedResponse[UserResponse](
-            total=total, limit=params.limit, offset=params.offset, data=data
+            total=total,
+            limit=params.limit,
+            offset=params.offset,
+            data=data,
+            has_more=has_more if params.count != CountMode.EXACT else None,
         )
 
     except HTTPException:
@@ -92,17 +98,22 @@ async def list_followings_route(
     session: AsyncSession = Depends(get_session),
 ):
     try:
-        followings, total = await list_followings(
+        followings, total, has_more = await list_followings(
             session=session,
             user_id=user_id,
             search=params.search,
             limit=params.limit,
             offset=params.offset,
+            count=params.count,
         )
 
         data = [UserResponse.model_validate(user) for user in followings]
         return PaginatedResponse[UserResponse](
-            total=total, limit=params.limit, offset=params.offset, data=data
+            total=total,
+            limit=params.limit,
+            offset=params.offset,
+            data=data,
+            has_more=has_more if params.count != CountMode.EXACT else None,
         )
 
     except HTTPException:
@@ -129,13 +140,15 @@ async def list_user_blog_route(
     session: AsyncSession = Depends(get_session),
 ):
     try:
-        blogs_result, total_result = await list_user_blogs(
+        blogs_result, total_result, has_more, next_cursor = await list_user_blogs(
             session=session,
             search=params.search,
             limit=params.limit,
             offset=params.offset,
             user_id=user_id,
             tags=tags,
+            cursor=params.cursor,
+            count=params.count,
         )
 
         data = [
@@ -146,7 +159,12 @@ async def list_user_blog_route(
         ]
 
         return PaginatedResponse[BlogResponse](
-            total=total_result, limit=params.limit, offset=params.offset, data=data
+            total=total_result,
+            limit=params.limit,
+            offset=params.offset,
+            data=data,
+            has_more=has_more if params.count != CountMode.EXACT else None,
+            next_cursor=next_cursor,
         )
 
     except HTTPException:
@@ -1,5 +1,13 @@
-from app.models.schema import CommonParams
+from app.models.schema import CommonParams, CountMode
 
 
-def get_common_params(search: str | None = None, limit: int = 10, offset: int = 0):
-    return CommonParams(search=search, limit=limit, offset=offset)
+def get_common_params(
+    search: str | None = None,
+    limit: int = 10,
+    offset: int = 0,
+    cursor: str | None = None,
+    count: CountMode = CountMode.EXACT,
+):
+    return CommonParams(
+        search=search, limit=limit, offset=offset, cursor=cursor, count=count
+    )
@@ -0,0 +1,184 @@
+import base64
+import binascii
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import literal_column, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.schema import CountMode
+from app.utils.logger import logger
+
+# Below this many estimated rows an exact count is cheap, so estimates are refined
+ESTIMATE_EXACT_THRESHOLD = 1000
+
+# How long a cached count is served in estimate mode when planner stats are unavailable
+COUNT_CACHE_TTL = 60.0
+COUNT_CACHE_MAX_ENTRIES = 1024
+
+_count_cache: Dict[str, Tuple[float, int]] = {}
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Encode the keyset values of the last row of a page into an opaque cursor.
+    """
+    payload = [
+        value.isoformat() if isinstance(value, datetime) else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[Any]) -> list[Any]:
+    """
+    Decode a cursor produced by `encode_cursor` back into keyset values.
+
+    Raises 400 if the cursor is malformed or doesn't match the ordering columns.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return [_cursor_value(value, column) for value, column in zip(values, columns)]
+
+
+def _cursor_value(value: Any, column: Any) -> Any:
+    """
+    `value` converted to the type of `column`; raises 400 if it has another
+    type, rather than letting the database reject it
+    """
+    python_type = column.type.python_type
+    if python_type is datetime:
+        try:
+            return datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    # JSON has one number type, and bool is a subclass of int
+    if python_type is float and isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    if not isinstance(value, python_type) or (
+        isinstance(value, bool) and python_type is not bool
+    ):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return value
+
+
+def keyset_condition(
+    columns: Sequence[Any], cursor: str, descending: bool = False
+) -> ColumnElement[bool]:
+    """
+    Build the WHERE condition that seeks past the row encoded in `cursor`.
+
+    `columns` is the ordering key, e.g. `(Blog.engagement_score, Blog.id)` or just
+    `(Blog.id,)`. The last column must be unique so that ties are broken.
+    """
+    values = decode_cursor(cursor, columns)
+
+    if len(columns) == 1:
+        left, right = columns[0], values[0]
+    else:
+        left, right = tuple_(*columns), tuple_(*values)
+
+    return left < right if descending else left > right
+
+
+def split_page(rows: Sequence[Any], limit: int) -> Tuple[list[Any], bool]:
+    """
+    Split rows fetched with `limit + 1` into the page and a has_more flag.
+    """
+    return list(rows[:limit]), len(rows) > limit
+
+
+def build_next_cursor(rows: Sequence[Any], has_more: bool, columns: Sequence[Any]):
+    """
+    Return the cursor pointing after the last row, or None on the final page.
+    """
+    if not rows or not has_more:
+        return None
+
+    last = rows[-1]
+    return encode_cursor([getattr(last, column.key) for column in columns])
+
+
+async def count_rows(
+    session: AsyncSession, count_query: Select, mode: CountMode
+) -> int | None:
+    """
+    Resolve the total for a paginated query according to `mode`.
+
+    - exact: run the COUNT query
+    - estimate: use planner statistics on Postgres, or a briefly cached count elsewhere
+    - none: skip counting and return None
+    """
+    if mode == CountMode.NONE:
+        return None
+
+    if mode == CountMode.ESTIMATE:
+        dialect = session.get_bind().dialect.name
+        if dialect == "postgresql":
+            estimate = await _planner_estimate(session, count_query)
+            if estimate is not None and estimate >= ESTIMATE_EXACT_THRESHOLD:
+                return estimate
+        else:
+            return await _cached_count(session, count_query)
+
+    result = await session.execute(count_query)
+    return result.scalar_one()
+
+
+async def _planner_estimate(session: AsyncSession, count_query: Select) -> int | None:
+    """Read the planner's row estimate for the rows behind a COUNT query."""
+    # EXPLAIN the underlying row query; the plan of the COUNT itself is always 1 row
+    rows_query = count_query.with_only_columns(
+        literal_column("1"), maintain_column_froms=True
+    )
+    try:
+        compiled = rows_query.compile(
+            dialect=session.get_bind().dialect,
+            compile_kwargs={"literal_binds": True},
+        )
+        result = await session.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+        plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception as e:
+        logger.debug(f"Falling back to exact count, planner estimate failed: {e}")
+        return None
+
+
+async def _cached_count(session: AsyncSession, count_query: Select) -> int:
+    """Exact count reused for COUNT_CACHE_TTL seconds per distinct query."""
+    try:
+        key = str(count_query.compile(compile_kwargs={"literal_binds": True}))
+    except Exception:
+        result = await session.execute(count_query)
+        return result.scalar_one()
+
+    now = time.monotonic()
+    cached = _count_cache.get(key)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    result = await session.execute(count_query)
+    total = result.scalar_one()
+
+    # drop the oldest entry once full; dicts keep insertion order
+    if key not in _count_cache and len(_count_cache) >= COUNT_CACHE_MAX_ENTRIES:
+        _count_cache.pop(next(iter(_count_cache)))
+    _count_cache[key] = (now + COUNT_CACHE_TTL, total)
+    return total
@@ -1,6 +1,6 @@
 from fastapi import Request
 
-from app.auth.jwt_handler import decode_token
+from app.auth.jwt_handler import request_token_payload, token_subject
 
 
 async def user_identifier(request: Request) -> str:
@@ -10,15 +10,16 @@ async def user_identifier(request: Request) -> str:
             return f"ip:{(request.client.host or 'unknown') if request.client else 'unknown'}"  # Fallback to IP
 
         token = auth_header.split(" ")[1]
-        payload = decode_token(token, expected_type="access")
+        # decoded once, also for the auth dependencies of the route
+        payload = request_token_payload(request, token)
         if not payload:
             return f"ip:{(request.client.host or 'unknown') if request.client else 'unknown'}"
 
-        sub = payload.get("sub")
-        if not sub:
+        subject = token_subject(payload)
+        if not subject:
             return f"ip:{(request.client.host or 'unknown') if request.client else 'unknown'}"
 
-        return f"user:{sub}"
+        return f"user:{subject}"
 
     except Exception:
         return (
@@ -0,0 +1,85 @@
+"""
+Notification publish throughput: one awaited PUBLISH per recipient against
+the pipelined per-user messages and the batched multi-user messages.
+
+    python -m benchmarks.publish_throughput
+    python -m benchmarks.publish_throughput --redis-url redis://localhost:6379
+
+Without --redis-url it runs against fakeredis, which has no network round
+trip, so the gap to a real server is larger than shown.
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+
+from app.core.services.redis import RedisManager
+from app.notifications.models import Notification, NotificationType
+from app.realtime.events import publish_notification, publish_notifications
+
+RECIPIENTS = (1_000, 10_000, 100_000)
+
+
+def _notifications(count: int) -> list[Notification]:
+    now = datetime.now(timezone.utc)
+    return [
+        Notification(
+            id=i,
+            owner_id=i,
+            triggered_by_user_id=0,
+            notification_type=NotificationType.NEW_BLOG,
+            message="Author uploaded new blog Benchmark",
+            created_at=now,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+async def _sequential(notifications, manager):
+    for notification in notifications:
+        await publish_notification(notification, manager)
+
+
+async def _pipelined(notifications, manager):
+    await publish_notifications(notifications, manager, batched=False)
+
+
+async def _batched(notifications, manager):
+    await publish_notifications(notifications, manager, batched=True)
+
+
+MODES = {
+    "sequential": _sequential,
+    "pipelined": _pipelined,
+    "batched": _batched,
+}
+
+
+async def main(redis_url: str | None, recipients: list[int]):
+    manager = RedisManager()
+    await manager.connect(testing=redis_url is None, redis_url=redis_url or "")
+
+    print(f"{'recipients':>10}  {'mode':<10}  {'seconds':>8}  {'msgs/s':>10}")
+    try:
+        for count in recipients:
+            notifications = _notifications(count)
+            for mode, publish in MODES.items():
+                started = time.perf_counter()
+                await publish(notifications, manager)
+                elapsed = time.perf_counter() - started
+                rate = count / elapsed
+                print(f"{count:>10}  {mode:<10}  {elapsed:>8.3f}  {rate:>10.0f}")
+    finally:
+        await manager.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--redis-url", default=None)
+    parser.add_argument(
+        "--recipients", type=int, nargs="*", default=list(RECIPIENTS)
+    )
+    args = parser.parse_args()
+
+    asyncio.run(main(args.redis_url, args.recipients))
@@ -0,0 +1,188 @@
+"""
+Realtime delivery load test: N SSE consumers on one in-process worker.
+
+    python -m benchmarks.realtime_load
+    python -m benchmarks.realtime_load --consumers 2000 --rounds 20 --rate 5
+
+Runs the app in-process against fakeredis and a throwaway SQLite database,
+opens the SSE streams through the ASGI interface and calls
+create_notifications for every consumer `--rate` times a second. Reports
+end-to-end latency (insert, publish, Redis listener, stream) percentiles,
+traced memory per connection and process CPU time per delivered message.
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+# the app reads its settings on import
+_workdir = tempfile.mkdtemp(prefix="realtime_load_")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_workdir}/realtime_load.db"
+os.environ["TESTING"] = "1"
+os.environ["TEST_SSE"] = "1"
+os.environ.setdefault("SECRET_KEY", "realtime-load-benchmark-secret-key")
+
+from asgi_lifespan import LifespanManager  # noqa: E402
+
+from app.auth.jwt_handler import create_access_token, subject_claims  # noqa: E402
+from app.core.services.database import AsyncSessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.notifications.models import NotificationType  # noqa: E402
+from app.notifications.service import create_notifications  # noqa: E402
+from app.realtime.connection import frame_event_id  # noqa: E402
+from app.realtime.manager import sse_manager  # noqa: E402
+from app.users.models import User  # noqa: E402
+
+CONSUMERS = 500
+ROUNDS = 10
+RATE = 2.0
+
+
+class _Consumer:
+    """One SSE stream driven through the app's ASGI interface"""
+
+    def __init__(self, user: User):
+        self.user = user
+        self.received: dict[int, float] = {}
+        self.connected = asyncio.Event()
+        self.disconnected = asyncio.Event()
+        self.task = None
+
+    def open(self):
+        token = create_access_token(subject_claims(self.user.id))  # type: ignore
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/api/sse/notifications",
+            "raw_path": b"/api/sse/notifications",
+            "root_path": "",
+            "query_string": f"token={token}".encode(),
+            "headers": [],
+            "server": ("benchmark", 80),
+            "client": ("benchmark", 1234),
+            "state": {},
+        }
+        self.task = asyncio.create_task(app(scope, self._receive, self._send))
+
+    async def _receive(self):
+        await self.disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def _send(self, message):
+        body = message.get("body", b"")
+        if body.startswith(b"id: "):
+            self.received[frame_event_id(body)] = time.perf_counter()
+        elif body.startswith(b"event: connected"):
+            self.connected.set()
+
+    async def close(self):
+        self.disconnected.set()
+        if self.task:
+            await asyncio.wait_for(self.task, timeout=5)
+
+
+async def _users(count: int) -> tuple[User, list[User]]:
+    async with AsyncSessionLocal() as session:
+        users = [
+            User(
+                username=f"load_{i}",
+                email=f"load_{i}@example.com",
+                full_name="Load Test",
+            )
+            for i in range(count + 1)
+        ]
+        session.add_all(users)
+        await session.commit()
+    return users[0], users[1:]
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+async def main(consumers: int, rounds: int, rate: float):
+    engine.echo = False
+
+    async with LifespanManager(app):
+        author, users = await _users(consumers)
+        owner_ids = [user.id for user in users]
+        request = SimpleNamespace(app=app)
+
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        streams = [_Consumer(user) for user in users]
+        for stream in streams:
+            stream.open()
+        await asyncio.gather(*(stream.connected.wait() for stream in streams))
+        per_connection = (tracemalloc.get_traced_memory()[0] - baseline) / consumers
+        tracemalloc.stop()
+        print(f"connected {sse_manager.stats()['connections']} SSE streams")
+
+        published_at: dict[int, float] = {}
+        cpu_started = time.process_time()
+        started = time.perf_counter()
+        for round_number in range(rounds):
+            round_started = time.perf_counter()
+            async with AsyncSessionLocal() as session:
+                notifications = await create_notifications(
+                    owner_ids,  # type: ignore
+                    author.id,  # type: ignore
+                    f"Load test round {round_number}",
+                    NotificationType.NEW_BLOG,
+                    None,
+                    session,
+                    request,  # type: ignore
+                )
+            for notification in notifications:
+                published_at[notification.id] = round_started  # type: ignore
+
+            # hold the rate unless a round takes longer than its slot
+            next_round = started + (round_number + 1) / rate
+            await asyncio.sleep(max(0.0, next_round - time.perf_counter()))
+
+        # let the last round arrive
+        expected = consumers * rounds
+        deadline = time.perf_counter() + 5
+        while time.perf_counter() < deadline:
+            if sum(len(stream.received) for stream in streams) >= expected:
+                break
+            await asyncio.sleep(0.01)
+        cpu = time.process_time() - cpu_started
+
+        await asyncio.gather(*(stream.close() for stream in streams))
+
+    latencies = sorted(
+        received - published_at[event_id]
+        for stream in streams
+        for event_id, received in stream.received.items()
+        if event_id in published_at
+    )
+    print(f"delivered {len(latencies)}/{expected} notifications")
+    if latencies:
+        print(
+            "latency ms  "
+            f"p50 {_percentile(latencies, 50) * 1000:.1f}  "
+            f"p99 {_percentile(latencies, 99) * 1000:.1f}  "
+            f"max {latencies[-1] * 1000:.1f}"
+        )
+        print(f"cpu per message  {cpu / len(latencies) * 1e6:.1f} us")
+    print(f"memory per connection  {per_connection / 1024:.1f} KiB (traced)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--consumers", type=int, default=CONSUMERS)
+    parser.add_argument("--rounds", type=int, default=ROUNDS)
+    parser.add_argument(
+        "--rate", type=float, default=RATE, help="notification rounds per second"
+    )
+    args = parser.parse_args()
+
+    asyncio.run(main(args.consumers, args.rounds, args.rate))
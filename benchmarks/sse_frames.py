@@ -0,0 +1,89 @@
+"""
+SSE delivery cost per Redis message: decoding the payload, re-encoding it
+once per user and formatting an event per connection, against framing the
+published payload once and sharing the frame across connections.
+
+    python -m benchmarks.sse_frames
+    python -m benchmarks.sse_frames --messages 20000 --connections 1 4 16
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime, timezone
+
+from sse_starlette import ServerSentEvent
+
+from app.realtime.connection import notification_frame
+
+MESSAGES = 10_000
+CONNECTIONS = (1, 4, 16)
+
+
+def _payloads(count: int) -> list[str]:
+    now = datetime.now(timezone.utc).isoformat()
+    return [
+        json.dumps(
+            {
+                "id": i,
+                "type": "new_blog",
+                "message": "Author uploaded new blog Benchmark",
+                "triggered_by_user_id": 1,
+                "blog_id": i,
+                "created_at": now,
+                "is_read": False,
+            }
+        )
+        for i in range(count)
+    ]
+
+
+def _reencoded(payloads: list[str], connections: int) -> int:
+    """Decode, re-encode per user, format per connection"""
+    size = 0
+    for payload in payloads:
+        message = json.dumps(json.loads(payload))
+        for _ in range(connections):
+            event_id = json.loads(message)["id"]
+            event = ServerSentEvent(
+                id=str(event_id), event="notification", data=message
+            )
+            size += len(event.encode())
+    return size
+
+
+def _framed(payloads: list[str], connections: int) -> int:
+    """Frame the published payload once, share it across connections"""
+    size = 0
+    for payload in payloads:
+        frame = notification_frame(json.loads(payload)["id"], payload)
+        for _ in range(connections):
+            size += len(frame)
+    return size
+
+
+MODES = {"re-encoded": _reencoded, "framed": _framed}
+
+
+def main(messages: int, connections: list[int]):
+    payloads = _payloads(messages)
+
+    print(f"{'connections':>11}  {'mode':<10}  {'seconds':>8}  {'msgs/s':>10}")
+    for count in connections:
+        for mode, deliver in MODES.items():
+            started = time.perf_counter()
+            deliver(payloads, count)
+            elapsed = time.perf_counter() - started
+            rate = messages / elapsed
+            print(f"{count:>11}  {mode:<10}  {elapsed:>8.3f}  {rate:>10.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=MESSAGES)
+    parser.add_argument(
+        "--connections", type=int, nargs="*", default=list(CONNECTIONS)
+    )
+    args = parser.parse_args()
+
+    main(args.messages, args.connections)
@@ -0,0 +1,161 @@
+"""
+WebSocket fan-out load test against a running server.
+
+    uvicorn app.main:app
+    python -m benchmarks.ws_load --clients 2000 --rounds 20
+
+Creates the benchmark users in the server's database (DATABASE_URL), opens
+one socket per user, then publishes rounds of notifications to every user
+through Redis and reports the latency from publish to delivery. Run it with
+the server's SECRET_KEY and Redis so tokens and notifications reach it.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from datetime import datetime, timezone
+
+import websockets
+from sqlmodel import select
+
+from app.auth.jwt_handler import create_access_token, subject_claims
+from app.core.services.database import AsyncSessionLocal, engine
+from app.core.services.redis import RedisManager
+from app.notifications.models import Notification, NotificationType
+from app.realtime.events import publish_notifications
+from app.users.models import User
+
+USERNAME_PREFIX = "wsload_"
+
+# Sockets opened at once while connecting
+CONNECT_CONCURRENCY = 200
+
+
+async def _users(count: int) -> list[User]:
+    """The benchmark users, created on first use"""
+    usernames = [f"{USERNAME_PREFIX}{i}" for i in range(count)]
+    query = select(User).where(User.username.in_(usernames))  # type: ignore
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(query)
+        existing = {user.username for user in result.scalars()}
+        session.add_all(
+            User(
+                username=username,
+                email=f"{username}@example.com",
+                full_name="Load Test",
+            )
+            for username in usernames
+            if username not in existing
+        )
+        await session.commit()
+
+        result = await session.execute(query)
+        return list(result.scalars())
+
+
+class _Client:
+    def __init__(self, user: User):
+        self.user = user
+        self.latencies: list[float] = []
+        self.socket = None
+
+    async def connect(self, url: str, semaphore: asyncio.Semaphore):
+        token = create_access_token(subject_claims(self.user.id))  # type: ignore
+        async with semaphore:
+            self.socket = await websockets.connect(
+                f"{url}/api/ws/notifications?token={token}",
+                compression="deflate",
+                max_queue=None,
+            )
+
+    async def receive(self):
+        async for text in self.socket:  # type: ignore
+            received = time.time()
+            message = json.loads(text)
+            if message["type"] != "notifications":
+                continue
+            for event in message["events"]:
+                created_at = datetime.fromisoformat(event["data"]["created_at"])
+                self.latencies.append(received - created_at.timestamp())
+            await self.socket.send(  # type: ignore
+                json.dumps({"type": "ack", "seq": message["seq"]})
+            )
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+async def main(url: str, redis_url: str, clients: int, rounds: int, interval: float):
+    engine.echo = False
+    users = await _users(clients)
+
+    manager = RedisManager()
+    await manager.connect(redis_url=redis_url)
+
+    semaphore = asyncio.Semaphore(CONNECT_CONCURRENCY)
+    sockets = [_Client(user) for user in users]
+    started = time.perf_counter()
+    await asyncio.gather(*(client.connect(url, semaphore) for client in sockets))
+    print(f"connected {len(sockets)} sockets in {time.perf_counter() - started:.2f}s")
+
+    receivers = [asyncio.create_task(client.receive()) for client in sockets]
+    event_id = int(time.time() * 1000)
+    try:
+        for _ in range(rounds):
+            now = datetime.now(timezone.utc)
+            notifications = []
+            for user in users:
+                event_id += 1
+                notifications.append(
+                    Notification(
+                        id=event_id,
+                        owner_id=user.id,  # type: ignore
+                        triggered_by_user_id=user.id,  # type: ignore
+                        notification_type=NotificationType.NEW_BLOG,
+                        message="Load test",
+                        created_at=now,
+                    )
+                )
+            await publish_notifications(notifications, manager)
+            await asyncio.sleep(interval)
+
+        # let the last round arrive
+        await asyncio.sleep(max(1.0, interval))
+    finally:
+        for receiver in receivers:
+            receiver.cancel()
+        await asyncio.gather(
+            *(client.socket.close() for client in sockets if client.socket),
+            return_exceptions=True,
+        )
+        await manager.disconnect()
+
+    latencies = sorted(latency for client in sockets for latency in client.latencies)
+    expected = clients * rounds
+    print(f"delivered {len(latencies)}/{expected} notifications")
+    if latencies:
+        print(
+            "latency ms  "
+            f"p50 {_percentile(latencies, 50) * 1000:.1f}  "
+            f"p90 {_percentile(latencies, 90) * 1000:.1f}  "
+            f"p99 {_percentile(latencies, 99) * 1000:.1f}  "
+            f"max {latencies[-1] * 1000:.1f}  "
+            f"mean {statistics.fmean(latencies) * 1000:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="ws://localhost:8000")
+    parser.add_argument("--redis-url", default="redis://localhost:6379")
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--interval", type=float, default=0.5)
+    args = parser.parse_args()
+
+    asyncio.run(
+        main(args.url, args.redis_url, args.clients, args.rounds, args.interval)
+    )
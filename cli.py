@@ -1,5 +1,6 @@
 import asyncio
 import getpass
+import os
 import re
 import subprocess
 
@@ -14,8 +15,12 @@ load_dotenv()
 
 from app.auth.hashing import hash_password
 from app.auth.security import check_password_strength
+from app.blogs.search.memory import blog_search_index
+from app.blogs.services.leaderboard import popular_leaderboard
+from app.blogs.services.trending import recompute_engagement_scores
 from app.core.services.database import get_session
 from app.core.services.database import init_db as init_database
+from app.core.services.redis import redis_manager
 from app.users.models import User
 
 err_console = Console(stderr=True)
@@ -126,5 +131,56 @@ async def _createsuperuser():
             err_console.print(f"[bold red]Something went wrong {e}[/bold red]")
 
 
+@app.command()
+def rebuild_leaderboard(
+    redis_url: str = os.getenv("REDIS_URL", "redis://localhost:6379"),
+    recompute_scores: bool = False,
+):
+    """Rebuild the popular blogs leaderboard in Redis from the database."""
+    asyncio.run(_rebuild_leaderboard(redis_url, recompute_scores))
+
+
+async def _rebuild_leaderboard(redis_url: str, recompute_scores: bool):
+    await redis_manager.connect(redis_url=redis_url)
+    popular_leaderboard.bind(redis_manager.get_client())
+
+    try:
+        async for session in get_session():
+            if recompute_scores:
+                # engagement scores from the like/comment/bookmark/view counters
+                await recompute_engagement_scores(session)
+            total = await popular_leaderboard.rebuild(session)
+            print(f"[green]Leaderboard rebuilt with {total} blogs.[/green]")
+
+    except Exception as e:
+        err_console.print(f"[bold red]Something went wrong {e}[/bold red]")
+
+    finally:
+        await redis_manager.disconnect()
+
+
+@app.command()
+def rebuild_search_index(snapshot: str = os.getenv("SEARCH_INDEX_SNAPSHOT", "")):
+    """Rebuild the in-process blog search index and write its snapshot file."""
+    if not snapshot:
+        err_console.print("[bold red]Snapshot path cannot be empty![/bold red]")
+        return
+
+    asyncio.run(_rebuild_search_index(snapshot))
+
+
+async def _rebuild_search_index(snapshot: str):
+    blog_search_index.snapshot_path = snapshot
+
+    try:
+        async for session in get_session():
+            total = await blog_search_index.rebuild(session)
+            blog_search_index.save_snapshot()
+            print(f"[green]Search index rebuilt with {total} blogs.[/green]")
+
+    except Exception as e:
+        err_console.print(f"[bold red]Something went wrong {e}[/bold red]")
+
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,4 @@
+import os
+
+# the app reads SECRET_KEY on import, and HS256 signing refuses an empty key
+os.environ.setdefault("SECRET_KEY", "test-suite-secret-key-not-used-anywhere-else")
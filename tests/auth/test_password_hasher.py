@@ -0,0 +1,67 @@
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+from passlib.context import CryptContext
+from sqlmodel import select
+
+from app.auth.hashing import BCRYPT_ROUNDS, PasswordHasher
+from app.users.models import User
+from tests.conftest import TestAsyncSessionLocal
+from tests.utils.auth_utils import _create_user, _login_user
+
+
+class TestPasswordHasher:
+    """Test password hashing off the event loop"""
+
+    @pytest.mark.asyncio
+    async def test_hash_and_verify_in_worker_processes(self):
+        """Hashes made by the process pool verify"""
+        hasher = PasswordHasher(workers=1, max_pending=4)
+        hasher.start()
+        try:
+            hashed = await hasher.hash("SecretPassword1#")
+            assert await hasher.verify("SecretPassword1#", hashed) == (True, None)
+            assert await hasher.verify("WrongPassword1#", hashed) == (False, None)
+        finally:
+            hasher.shutdown()
+
+        assert hasher.stats()["hashes"] == 1
+        assert hasher.stats()["verifications"] == 2
+
+    @pytest.mark.asyncio
+    async def test_full_queue_is_rejected(self):
+        """Hashes past the pending limit are turned away, not queued"""
+        hasher = PasswordHasher(workers=1, max_pending=0)
+
+        with pytest.raises(HTTPException) as error:
+            await hasher.hash("SecretPassword1#")
+
+        assert error.value.status_code == 503
+        assert hasher.metrics["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_login_upgrades_outdated_hash(self, client: AsyncClient):
+        """A password hashed at a lower cost is rehashed on login"""
+        username = f"Rehash{uuid4().hex[:6]}"
+        await _create_user(client, username)
+
+        cheap = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4)
+        async with TestAsyncSessionLocal() as session:
+            result = await session.execute(
+                select(User).where(User.username == username)
+            )
+            user = result.scalars().one()
+            user.hashed_password = cheap.hash("SecretPassword1#")
+            await session.commit()
+
+        await _login_user(client, username)
+
+        async with TestAsyncSessionLocal() as session:
+            result = await session.execute(
+                select(User).where(User.username == username)
+            )
+            hashed_password = result.scalars().one().hashed_password
+        assert hashed_password.startswith(f"$2b${BCRYPT_ROUNDS:02d}$")  # type: ignore
+        await _login_user(client, username)
@@ -0,0 +1,107 @@
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import update
+
+from app.auth.dependency import get_user_by_identifier
+from app.auth.principal_cache import principal_cache
+from app.users.models import User
+from tests.conftest import TestAsyncSessionLocal
+from tests.utils.auth_utils import _create_user
+
+
+async def _set_superuser(username: str):
+    async with TestAsyncSessionLocal() as session:
+        query = update(User).where(User.username == username)  # type: ignore
+        await session.execute(query.values(is_superuser=True))
+        await session.commit()
+
+
+class TestPrincipalCache:
+    """Test the cache of users resolved from access tokens"""
+
+    @pytest.mark.asyncio
+    async def test_known_user_is_resolved_without_query(self, client: AsyncClient):
+        """Only the first lookup of a subject reads the database"""
+        username = f"Principal{uuid4().hex[:6]}"
+        await _create_user(client, username)
+        loads = []
+
+        async def loader(session, subject):
+            loads.append(subject)
+            return await get_user_by_identifier(session, subject)
+
+        async with TestAsyncSessionLocal() as session:
+            first = await principal_cache.resolve(session, username, loader)
+        async with TestAsyncSessionLocal() as session:
+            second = await principal_cache.resolve(session, username, loader)
+            # attached to the session like a loaded user
+            assert await session.get(User, second.id) is second  # type: ignore
+
+        assert loads == [username]
+        assert second is not first
+        assert (second.id, second.email) == (first.id, first.email)  # type: ignore
+
+    @pytest.mark.asyncio
+    async def test_password_hash_is_not_cached(self, client: AsyncClient):
+        """Changing the password loads the hash left out of the snapshot"""
+        username = f"PrincipalPwd{uuid4().hex[:6]}"
+        headers = await _create_user(client, username)
+        resp = await client.get("/api/users/me", headers=headers)
+
+        snapshot = await principal_cache._get(f"id:{resp.json()['id']}")
+        assert snapshot is not None
+        assert "hashed_password" not in snapshot
+
+        resp = await client.post(
+            "/api/users/me/password",
+            headers=headers,
+            json={
+                "current_password": "WrongPassword1#",
+                "new_password": "NewSecretPassword1#",
+                "again_new_password": "NewSecretPassword1#",
+            },
+        )
+        assert resp.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_admin_update_invalidates_user(self, client: AsyncClient):
+        """A user promoted by an admin is trusted as one right away"""
+        admin_name = f"PrincipalAdmin{uuid4().hex[:6]}"
+        admin_headers = await _create_user(client, admin_name)
+        await _set_superuser(admin_name)
+
+        username = f"PrincipalUser{uuid4().hex[:6]}"
+        headers = await _create_user(client, username)
+        resp = await client.get("/api/users/me", headers=headers)
+        user_id = resp.json()["id"]
+        assert (await client.get("/admin/metrics", headers=headers)).status_code == 404
+
+        resp = await client.patch(
+            f"/admin/users/{user_id}",
+            headers=admin_headers,
+            json={
+                "username": None,
+                "full_name": None,
+                "password": None,
+                "is_active": None,
+                "is_superuser": True,
+            },
+        )
+        assert resp.status_code == 200, resp.text
+
+        assert (await client.get("/admin/metrics", headers=headers)).status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_logout_drops_cached_user(self, client: AsyncClient):
+        """Logging out forgets the user resolved from the token"""
+        username = f"PrincipalLogout{uuid4().hex[:6]}"
+        headers = await _create_user(client, username)
+        resp = await client.get("/api/users/me", headers=headers)
+        subject = f"id:{resp.json()['id']}"
+        assert await principal_cache._get(subject) is not None
+
+        await client.post("/api/auth/logout", headers=headers)
+
+        assert await principal_cache._get(subject) is None
@@ -0,0 +1,81 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from app.auth.security import TokenBlacklist
+from app.core.services.bloom import BloomFilter
+
+
+class TestTokenBlacklistFilter:
+    """Test the in-process filter in front of the token blacklist"""
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        """Every added item is found, few others are"""
+        bloom = BloomFilter(1000, 0.01)
+        added = [uuid4().hex for _ in range(1000)]
+        for item in added:
+            bloom.add(item)
+
+        assert all(item in bloom for item in added)
+        false_positives = sum(uuid4().hex in bloom for _ in range(10000))
+        assert false_positives < 300
+
+    @pytest.mark.asyncio
+    async def test_unrevoked_tokens_are_checked_locally(self):
+        """Once built, the filter answers for tokens never revoked"""
+        redis = FakeAsyncRedis(decode_responses=True)
+        blacklist = TokenBlacklist(redis)
+        await blacklist.blacklist_token("revoked", expire=60)
+
+        # not built yet: Redis answers
+        assert not await blacklist.is_blacklisted("valid")
+        assert blacklist.metrics["redis_checks"] == 1
+
+        await blacklist.rebuild()
+        assert not await blacklist.is_blacklisted("valid")
+        assert await blacklist.is_blacklisted("revoked")
+        assert blacklist.metrics["local_checks"] == 1
+        assert blacklist.metrics["redis_checks"] == 2
+
+    @pytest.mark.asyncio
+    async def test_rebuild_loads_tokens_revoked_elsewhere(self):
+        """Tokens revoked before the worker started are in the filter"""
+        redis = FakeAsyncRedis(decode_responses=True)
+        await TokenBlacklist(redis).blacklist_token("earlier", expire=60)
+
+        blacklist = TokenBlacklist(redis)
+        await blacklist.rebuild()
+
+        assert "earlier" in blacklist.filter
+        assert await blacklist.is_blacklisted("earlier")
+
+    @pytest.mark.asyncio
+    async def test_revocations_reach_other_workers(self):
+        """A token revoked on one worker is in every worker's filter"""
+        redis = FakeAsyncRedis(decode_responses=True)
+        worker = TokenBlacklist(redis)
+        other = TokenBlacklist(redis)
+        listener = asyncio.create_task(worker.listen())
+        try:
+            for _ in range(100):
+                if worker.ready:
+                    break
+                await asyncio.sleep(0.01)
+            assert worker.ready
+
+            await other.blacklist_token("revoked", expire=60)
+            for _ in range(100):
+                if "revoked" in worker.filter:
+                    break
+                await asyncio.sleep(0.01)
+
+            assert await worker.is_blacklisted("revoked")
+        finally:
+            listener.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await listener
+
+        # no longer told about revocations: back to Redis
+        assert not worker.ready
@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+from jose import jwt as jose_jwt
+
+from app.auth import jwt_handler
+from tests.utils.auth_utils import _create_user
+
+
+class TestTokenDecoding:
+    """Test verification of access tokens"""
+
+    @pytest.mark.asyncio
+    async def test_token_is_decoded_once_per_request(
+        self, client: AsyncClient, monkeypatch
+    ):
+        """The rate limiter and the auth dependency share one decode"""
+        headers = await _create_user(client, f"Decode{uuid4().hex[:6]}")
+        decoded = []
+        decode_token = jwt_handler.decode_token
+
+        def counting_decode(token, expected_type=None):
+            decoded.append(token)
+            return decode_token(token, expected_type)
+
+        monkeypatch.setattr(jwt_handler, "decode_token", counting_decode)
+        resp = await client.get("/api/users/me", headers=headers)
+
+        assert resp.status_code == 200
+        assert len(decoded) == 1
+
+    @pytest.mark.asyncio
+    async def test_tokens_signed_before_upgrade_are_accepted(
+        self, client: AsyncClient
+    ):
+        """Tokens issued with python-jose verify with the current codec"""
+        username = f"DecodeJose{uuid4().hex[:6]}"
+        await _create_user(client, username)
+        token = jose_jwt.encode(
+            {
+                "sub": username,
+                "exp": datetime.now(timezone.utc) + timedelta(minutes=5),
+                "type": "access",
+                "jti": str(uuid4()),
+            },
+            jwt_handler.SECRET_KEY,
+            algorithm=jwt_handler.ALGORITHM,
+        )
+
+        resp = await client.get(
+            "/api/users/me", headers={"Authorization": f"Bearer {token}"}
+        )
+        assert resp.status_code == 200
+        assert resp.json()["username"] == username
+
+    def test_tampered_token_is_rejected(self):
+        """A token signed with another key does not decode"""
+        token = jwt_handler.create_access_token({"sub": "1"})
+        forged = jose_jwt.encode(
+            jose_jwt.get_unverified_claims(token),
+            "another-secret-key-of-the-same-length-as-ours",
+            algorithm=jwt_handler.ALGORITHM,
+        )
+
+        assert jwt_handler.decode_token(token, expected_type="access")
+        assert jwt_handler.decode_token(forged) is None
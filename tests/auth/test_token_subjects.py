@@ -0,0 +1,81 @@
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+from jose import jwt
+
+from app.auth.jwt_handler import create_access_token, create_refresh_token
+from app.users.models import User
+from tests.conftest import TestAsyncSessionLocal
+from tests.utils.auth_utils import _create_user
+
+
+class TestTokenSubjects:
+    """Test the principal carried in the `sub` claim of issued tokens"""
+
+    @pytest.mark.asyncio
+    async def test_tokens_carry_user_id(self, client: AsyncClient):
+        """Issued tokens identify the user by primary key"""
+        username = f"Subject{uuid4().hex[:6]}"
+        headers = await _create_user(client, username)
+        resp = await client.get("/api/users/me", headers=headers)
+        user_id = resp.json()["id"]
+
+        token = headers["Authorization"].split(" ")[1]
+        claims = jwt.get_unverified_claims(token)
+        assert claims["sub"] == str(user_id)
+        assert claims["sub_type"] == "user_id"
+
+    @pytest.mark.asyncio
+    async def test_legacy_username_token_is_accepted(self, client: AsyncClient):
+        """Tokens issued with the username as subject keep working"""
+        username = f"SubjectLegacy{uuid4().hex[:6]}"
+        await _create_user(client, username)
+        token = create_access_token({"sub": username})
+
+        resp = await client.get(
+            "/api/users/me", headers={"Authorization": f"Bearer {token}"}
+        )
+        assert resp.status_code == 200
+        assert resp.json()["username"] == username
+
+    @pytest.mark.asyncio
+    async def test_legacy_refresh_token_issues_id_tokens(self, client: AsyncClient):
+        """Refreshing a legacy token migrates it to the user id"""
+        username = f"SubjectRefresh{uuid4().hex[:6]}"
+        headers = await _create_user(client, username)
+        resp = await client.get("/api/users/me", headers=headers)
+        user_id = resp.json()["id"]
+
+        refresh_token = create_refresh_token({"sub": username})
+        resp = await client.post(f"/api/auth/refresh?refresh_token={refresh_token}")
+        assert resp.status_code == 200
+
+        claims = jwt.get_unverified_claims(resp.json()["access_token"])
+        assert claims["sub"] == str(user_id)
+
+    @pytest.mark.asyncio
+    async def test_numeric_username_is_not_an_id(self, client: AsyncClient):
+        """A legacy subject that looks like an id resolves by username"""
+        owner_headers = await _create_user(client, f"SubjectOwner{uuid4().hex[:6]}")
+        resp = await client.get("/api/users/me", headers=owner_headers)
+        owner = resp.json()
+
+        # a user whose username is the other user's id
+        async with TestAsyncSessionLocal() as session:
+            session.add(
+                User(
+                    username=str(owner["id"]),
+                    email=f"numeric{uuid4().hex[:6]}@example.com",
+                    full_name="Numeric Name",
+                )
+            )
+            await session.commit()
+        legacy_token = create_access_token({"sub": str(owner["id"])})
+
+        resp = await client.get("/api/users/me", headers=owner_headers)
+        assert resp.json()["username"] == owner["username"]
+        resp = await client.get(
+            "/api/users/me", headers={"Authorization": f"Bearer {legacy_token}"}
+        )
+        assert resp.json()["username"] == str(owner["id"])
@@ -0,0 +1,161 @@
+import asyncio
+import time
+
+import pytest
+from fakeredis import FakeAsyncRedis
+from httpx import AsyncClient
+
+from app.core.services import cache
+from app.core.services.cache import LRUCache, ResponseCache, response_cache
+from tests.utils.auth_utils import _create_user
+
+
+class TestLRUCache:
+    """Test the in-process cache tier"""
+
+    def test_evicts_least_recently_used(self):
+        """The oldest untouched entry goes first once full"""
+        cache = LRUCache(max_entries=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1
+
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_entries_expire(self):
+        """Entries aren't served after their TTL"""
+        cache = LRUCache(max_entries=2, ttl=60)
+        cache.set("a", 1, ttl=0.01)
+        time.sleep(0.02)
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+
+def _loader(value: str):
+    calls = []
+
+    async def load() -> str:
+        calls.append(value)
+        return value
+
+    return load, calls
+
+
+class TestResponseCacheVersions:
+    """Test namespace versions shared between workers"""
+
+    @pytest.mark.asyncio
+    async def test_local_hits_stay_local(self):
+        """Namespace versions are read from Redis once, not per lookup"""
+        worker = ResponseCache()
+        worker.bind(FakeAsyncRedis(decode_responses=True))
+        load, calls = _loader("feed")
+
+        for _ in range(3):
+            assert await worker.get_or_set("feed", {"limit": 3}, load) == "feed"
+
+        assert calls == ["feed"]
+        assert worker.metrics["local_hits"] == 2
+        assert worker.metrics["version_reads"] == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidations_reach_other_workers(self):
+        """A bump on one worker is pushed to the others' versions"""
+        redis = FakeAsyncRedis(decode_responses=True)
+        worker, other = ResponseCache(), ResponseCache()
+        worker.bind(redis)
+        other.bind(redis)
+        load, calls = _loader("feed")
+        await other.get_or_set("feed", {}, load)
+
+        listener = asyncio.create_task(other.listen())
+        try:
+            await asyncio.sleep(0.05)
+            await worker.invalidate("feed")
+            for _ in range(100):
+                if other.versions["feed"] == 1:
+                    break
+                await asyncio.sleep(0.01)
+
+            await other.get_or_set("feed", {}, load)
+        finally:
+            listener.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await listener
+
+        assert calls == ["feed", "feed"]
+        assert other.metrics["version_reads"] == 1
+
+    @pytest.mark.asyncio
+    async def test_versions_are_read_again_after_ttl(self, monkeypatch):
+        """A missed invalidation is picked up once the version expires"""
+        monkeypatch.setattr(cache, "RESPONSE_CACHE_VERSION_TTL", 0)
+        redis = FakeAsyncRedis(decode_responses=True)
+        worker, other = ResponseCache(), ResponseCache()
+        worker.bind(redis)
+        other.bind(redis)
+        load, calls = _loader("feed")
+
+        await other.get_or_set("feed", {}, load)
+        await worker.invalidate("feed")
+        await other.get_or_set("feed", {}, load)
+
+        assert calls == ["feed", "feed"]
+
+
+class TestFeedCache:
+    """Test caching of anonymous blog feeds"""
+
+    @pytest.mark.asyncio
+    async def test_repeated_feed_is_cached(self, client: AsyncClient):
+        """Identical queries, in any param order, are served from cache"""
+        resp = await client.get("/api/blogs?limit=3&offset=0")
+        assert resp.status_code == 200
+
+        hits = response_cache.stats()["local_hits"]
+        cached = await client.get("/api/blogs?offset=0&limit=3")
+        assert cached.status_code == 200
+        assert cached.json() == resp.json()
+        assert response_cache.stats()["local_hits"] == hits + 1
+
+    @pytest.mark.asyncio
+    async def test_blog_writes_invalidate_feed(self, client: AsyncClient):
+        """Creating and deleting a blog is visible on the next read"""
+        headers = await _create_user(client, "CacheUser")
+
+        resp = await client.get("/api/blogs?search=Cachefeed")
+        assert resp.json()["total"] == 0
+
+        resp = await client.post(
+            "/api/blogs",
+            data={"title": "Cachefeed Blog", "content": "Content"},
+            headers=headers,
+        )
+        assert resp.status_code == 201
+
+        resp = await client.get("/api/blogs?search=Cachefeed")
+        page = resp.json()
+        assert page["total"] == 1
+
+        blog_id = page["data"][0]["id"]
+        await client.delete(f"/api/blogs/{blog_id}", headers=headers)
+
+        resp = await client.get("/api/blogs?search=Cachefeed")
+        assert resp.json()["total"] == 0
+
+    @pytest.mark.asyncio
+    async def test_drafts_do_not_invalidate(self, client: AsyncClient):
+        """Saving a draft leaves cached feeds alone"""
+        headers = await _create_user(client, "CacheDraftUser")
+        invalidations = response_cache.stats()["invalidations"]
+
+        resp = await client.post(
+            "/api/blogs",
+            data={"title": "Cache Draft", "content": "Draft", "is_draft": True},
+            headers=headers,
+        )
+        assert resp.status_code == 201
+        assert response_cache.stats()["invalidations"] == invalidations
@@ -0,0 +1,145 @@
+import pytest
+from httpx import AsyncClient
+
+from app.blogs.services.leaderboard import member, popular_leaderboard
+from tests.conftest import TestAsyncSessionLocal
+from tests.utils.blog_utils import _create_blog
+
+
+async def _rebuild():
+    async with TestAsyncSessionLocal() as session:
+        return await popular_leaderboard.rebuild(session)
+
+
+async def _score(blog_id: int):
+    return await popular_leaderboard.redis.zscore(  # type: ignore
+        popular_leaderboard.key, member(blog_id)
+    )
+
+
+class TestPopularLeaderboard:
+    """Test the Redis backed popular blogs leaderboard"""
+
+    @pytest.mark.asyncio
+    async def test_rebuild_from_database(self, client: AsyncClient):
+        """Rebuild ranks every engaged public blog and serves the popular feed"""
+        blog_id, headers = await _create_blog(client)
+        await client.post(f"/api/blogs/{blog_id}/like", headers=headers)
+
+        await popular_leaderboard.redis.delete(  # type: ignore
+            popular_leaderboard.key, popular_leaderboard.built_key
+        )
+        assert await popular_leaderboard.page(0, 10) is None
+
+        assert await _rebuild() >= 1
+        assert await _score(blog_id) == 1.0
+
+        resp = await client.get("/api/blogs/popular?limit=100")
+        assert resp.status_code == 200
+        page = resp.json()
+        assert blog_id in [blog["id"] for blog in page["data"]]
+        assert page["total"] == len(page["data"])
+
+    @pytest.mark.asyncio
+    async def test_leaderboard_follows_engagement(self, client: AsyncClient):
+        """Likes, comments and deletes keep the leaderboard in sync"""
+        await _rebuild()
+        blog_id, headers = await _create_blog(client)
+        assert await _score(blog_id) is None
+
+        await client.post(f"/api/blogs/{blog_id}/like", headers=headers)
+        assert await _score(blog_id) == 1.0
+
+        await client.post(
+            f"/api/blogs/{blog_id}/comments",
+            json={"content": "Leaderboard comment"},
+            headers=headers,
+        )
+        assert await _score(blog_id) == 4.0
+
+        resp = await client.get("/api/blogs/popular?limit=100")
+        assert blog_id in [blog["id"] for blog in resp.json()["data"]]
+
+        resp = await client.delete(f"/api/blogs/{blog_id}", headers=headers)
+        assert resp.status_code == 200
+        assert await _score(blog_id) is None
+
+    @pytest.mark.asyncio
+    async def test_hidden_blog_is_removed(self, client: AsyncClient):
+        """Making a blog private drops it from the leaderboard"""
+        await _rebuild()
+        blog_id, headers = await _create_blog(client)
+        await client.post(f"/api/blogs/{blog_id}/like", headers=headers)
+        assert await _score(blog_id) == 1.0
+
+        resp = await client.patch(
+            f"/api/blogs/{blog_id}", data={"is_public": False}, headers=headers
+        )
+        assert resp.status_code == 200
+        assert await _score(blog_id) is None
+
+    @pytest.mark.asyncio
+    async def test_ties_page_like_the_database(self, client: AsyncClient):
+        """Equal scores rank by id, so cursor pages continue the first one"""
+        await _rebuild()
+        blog_ids = []
+        for _ in range(12):
+            blog_id, headers = await _create_blog(client)
+            await client.post(f"/api/blogs/{blog_id}/like", headers=headers)
+            blog_ids.append(blog_id)
+
+        seen = []
+        resp = await client.get("/api/blogs/popular?limit=5")
+        while True:
+            page = resp.json()
+            seen += [blog["id"] for blog in page["data"]]
+            if not page.get("next_cursor"):
+                break
+            resp = await client.get(
+                f"/api/blogs/popular?limit=5&cursor={page['next_cursor']}"
+            )
+
+        assert len(seen) == len(set(seen))
+        assert set(blog_ids) <= set(seen)
+        ours = [blog_id for blog_id in seen if blog_id in blog_ids]
+        assert ours == sorted(blog_ids, reverse=True)
+
+    @pytest.mark.asyncio
+    async def test_equal_scores_rank_by_descending_id(self, client: AsyncClient):
+        """Ids of different lengths tie like integers, not strings"""
+        await _rebuild()
+        score = 1_000_000.0
+        await popular_leaderboard.sync_scores({9: score, 10: score, 11: score})
+        try:
+            ranked = await popular_leaderboard.page(0, 2)
+            assert ranked is not None
+            assert ranked[0] == [11, 10, 9]
+        finally:
+            await popular_leaderboard.remove(9, 10, 11)
+
+    @pytest.mark.asyncio
+    async def test_writes_during_rebuild_are_kept(self, client: AsyncClient):
+        """Updates landing between the table read and the swap survive it"""
+        liked_id, headers = await _create_blog(client)
+        await client.post(f"/api/blogs/{liked_id}/like", headers=headers)
+        removed_id, headers = await _create_blog(client)
+        await client.post(f"/api/blogs/{removed_id}/like", headers=headers)
+
+        class WritesDuringRead:
+            def __init__(self, session):
+                self.session = session
+
+            async def execute(self, query):
+                result = await self.session.execute(query)
+                await popular_leaderboard.sync_scores({liked_id: 10.0})
+                await popular_leaderboard.remove(removed_id)
+                return result
+
+        async with TestAsyncSessionLocal() as session:
+            await popular_leaderboard.rebuild(WritesDuringRead(session))  # type: ignore
+
+        assert await _score(liked_id) == 10.0
+        assert await _score(removed_id) is None
+        assert not await popular_leaderboard.redis.exists(  # type: ignore
+            popular_leaderboard.rebuilding_key
+        )
@@ -0,0 +1,148 @@
+import base64
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from tests.schema.blog_and_comment_schema import BlogResponse
+from tests.schema.global_schema import PaginatedResponse
+from tests.utils.auth_utils import _create_user
+from tests.utils.validator import validate_response
+
+
+class TestCursorPagination:
+    """Test keyset (cursor) pagination on blog listings"""
+
+    @pytest.mark.asyncio
+    async def test_cursor_walks_all_blogs(self, client: AsyncClient):
+        """Following next_cursor returns every blog exactly once"""
+        headers = await _create_user(client, "CursorUser")
+
+        for i in range(5):
+            resp = await client.post(
+                "/api/blogs",
+                data={"title": f"Cursorpage Blog {i}", "content": f"Content {i}"},
+                headers=headers,
+            )
+            assert resp.status_code == 201
+
+        seen: list[int] = []
+        resp = await client.get("/api/blogs?search=Cursorpage&limit=2")
+        assert resp.status_code == 200
+        page = validate_response(resp.json(), PaginatedResponse[BlogResponse])
+        seen.extend(blog.id for blog in page.data)
+
+        while page.next_cursor:
+            resp = await client.get(
+                f"/api/blogs?search=Cursorpage&limit=2&cursor={page.next_cursor}"
+            )
+            assert resp.status_code == 200
+            page = validate_response(resp.json(), PaginatedResponse[BlogResponse])
+            seen.extend(blog.id for blog in page.data)
+
+        assert len(seen) == 5
+        assert seen == sorted(set(seen))
+
+    @pytest.mark.asyncio
+    async def test_cursor_on_drafts_is_newest_first(self, client: AsyncClient):
+        """Draft cursor pages newest first without overlap"""
+        headers = await _create_user(client, "CursorDraftUser")
+
+        for i in range(3):
+            await client.post(
+                "/api/blogs",
+                data={"title": f"Cursor Draft {i}", "content": "Draft", "is_draft": True},
+                headers=headers,
+            )
+
+        resp = await client.get("/api/blogs/drafts?limit=2", headers=headers)
+        assert resp.status_code == 200
+        first = validate_response(resp.json(), PaginatedResponse[BlogResponse])
+        assert [blog.title for blog in first.data] == ["Cursor Draft 2", "Cursor Draft 1"]
+        assert first.next_cursor is not None
+
+        resp = await client.get(
+            f"/api/blogs/drafts?limit=2&cursor={first.next_cursor}", headers=headers
+        )
+        second = validate_response(resp.json(), PaginatedResponse[BlogResponse])
+        assert [blog.title for blog in second.data] == ["Cursor Draft 0"]
+        assert second.next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor(self, client: AsyncClient):
+        """Malformed cursor is rejected"""
+        resp = await client.get("/api/blogs?cursor=not-a-cursor")
+        assert resp.status_code == 400
+        assert resp.json()["detail"] == "Invalid cursor"
+
+    @pytest.mark.asyncio
+    async def test_cursor_with_wrong_value_type(self, client: AsyncClient):
+        """Cursor values that don't match the ordering column types are rejected"""
+        for values in (["1"], [True], [1.5], [None]):
+            raw = json.dumps(values).encode()
+            cursor = base64.urlsafe_b64encode(raw).decode().rstrip("=")
+            resp = await client.get(f"/api/blogs?cursor={cursor}")
+            assert resp.status_code == 400
+            assert resp.json()["detail"] == "Invalid cursor"
+
+
+class TestCountModes:
+    """Test the count=exact|estimate|none pagination modes"""
+
+    @pytest.mark.asyncio
+    async def test_count_none_skips_total(self, client: AsyncClient):
+        """count=none returns no total but reports whether more rows exist"""
+        headers = await _create_user(client, "CountNoneUser")
+
+        for i in range(3):
+            resp = await client.post(
+                "/api/blogs",
+                data={"title": f"Countnone Blog {i}", "content": f"Content {i}"},
+                headers=headers,
+            )
+            assert resp.status_code == 201
+
+        resp = await client.get("/api/blogs?search=Countnone&limit=2&count=none")
+        assert resp.status_code == 200
+        page = validate_response(resp.json(), PaginatedResponse[BlogResponse])
+        assert page.total is None
+        assert page.has_more is True
+        assert len(page.data) == 2
+
+        resp = await client.get(
+            "/api/blogs?search=Countnone&limit=2&offset=2&count=none"
+        )
+        page = validate_response(resp.json(), PaginatedResponse[BlogResponse])
+        assert page.has_more is False
+        assert len(page.data) == 1
+
+    @pytest.mark.asyncio
+    async def test_count_estimate(self, client: AsyncClient):
+        """count=estimate returns a total for small tables"""
+        headers = await _create_user(client, "CountEstimateUser")
+
+        for i in range(2):
+            await client.post(
+                "/api/blogs",
+                data={"title": f"Countestimate Blog {i}", "content": "Content"},
+                headers=headers,
+            )
+
+        resp = await client.get("/api/blogs?search=Countestimate&count=estimate")
+        assert resp.status_code == 200
+        page = validate_response(resp.json(), PaginatedResponse[BlogResponse])
+        assert page.total == 2
+        assert page.has_more is False
+
+    @pytest.mark.asyncio
+    async def test_exact_count_omits_has_more(self, client: AsyncClient):
+        """Default exact mode keeps the original response shape"""
+        resp = await client.get("/api/blogs?limit=1")
+        assert resp.status_code == 200
+        assert "has_more" not in resp.json()
+
+    @pytest.mark.asyncio
+    async def test_invalid_count_mode(self, client: AsyncClient):
+        """Unknown count modes are rejected"""
+        resp = await client.get("/api/blogs?count=sometimes")
+        assert resp.status_code == 422
@@ -0,0 +1,104 @@
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+
+from tests.utils.auth_utils import _create_user
+
+
+def _word() -> str:
+    """A term no other test blog contains"""
+    return f"zq{uuid4().hex[:8]}"
+
+
+async def _post_blog(client: AsyncClient, headers, title: str, content: str) -> int:
+    resp = await client.post(
+        "/api/blogs",
+        data={"title": title, "content": content},
+        headers=headers,
+    )
+    assert resp.status_code == 201
+
+    resp = await client.get("/api/users/me/blogs?limit=100", headers=headers)
+    return max(blog["id"] for blog in resp.json()["data"])
+
+
+async def _search_ids(client: AsyncClient, query: str) -> list[int]:
+    resp = await client.get("/api/blogs/search", params={"q": query})
+    assert resp.status_code == 200
+    return [blog["id"] for blog in resp.json()["data"]]
+
+
+class TestBlogSearch:
+    """Test full-text search over blogs"""
+
+    @pytest.mark.asyncio
+    async def test_search_matches_content(self, client: AsyncClient):
+        """Blogs are found by words in their content, not only the title"""
+        headers = await _create_user(client, f"Searcher{uuid4().hex[:6]}")
+        word = _word()
+        blog_id = await _post_blog(client, headers, "Plain title", f"About {word} here")
+
+        assert await _search_ids(client, word) == [blog_id]
+
+        resp = await client.get("/api/blogs", params={"search": word})
+        assert [blog["id"] for blog in resp.json()["data"]] == [blog_id]
+
+    @pytest.mark.asyncio
+    async def test_search_prefix_and_all_terms(self, client: AsyncClient):
+        """Every term must match, each as a word prefix"""
+        headers = await _create_user(client, f"Searcher{uuid4().hex[:6]}")
+        first, second = _word(), _word()
+        both_id = await _post_blog(client, headers, f"{first} {second}", "content")
+        await _post_blog(client, headers, first, "content")
+
+        assert await _search_ids(client, f"{first[:6]} {second}") == [both_id]
+
+    @pytest.mark.asyncio
+    async def test_title_match_ranks_first(self, client: AsyncClient):
+        """A title match is more relevant than a content match"""
+        headers = await _create_user(client, f"Searcher{uuid4().hex[:6]}")
+        word = _word()
+        title_id = await _post_blog(client, headers, f"{word} guide", "Unrelated")
+        content_id = await _post_blog(
+            client, headers, "Some guide", f"Mentions {word} once"
+        )
+
+        assert await _search_ids(client, word) == [title_id, content_id]
+
+    @pytest.mark.asyncio
+    async def test_search_follows_updates_and_deletes(self, client: AsyncClient):
+        """Edited and deleted blogs are reindexed"""
+        headers = await _create_user(client, f"Searcher{uuid4().hex[:6]}")
+        old, new = _word(), _word()
+        blog_id = await _post_blog(client, headers, f"Title {old}", "content")
+
+        resp = await client.patch(
+            f"/api/blogs/{blog_id}", data={"title": f"Title {new}"}, headers=headers
+        )
+        assert resp.status_code == 200
+        assert await _search_ids(client, old) == []
+        assert await _search_ids(client, new) == [blog_id]
+
+        resp = await client.delete(f"/api/blogs/{blog_id}", headers=headers)
+        assert resp.status_code == 200
+        assert await _search_ids(client, new) == []
+
+    @pytest.mark.asyncio
+    async def test_search_without_terms(self, client: AsyncClient):
+        """A query with no words matches nothing"""
+        resp = await client.get("/api/blogs/search", params={"q": "%%"})
+        assert resp.status_code == 200
+        assert resp.json()["total"] == 0
+        assert resp.json()["data"] == []
+
+    @pytest.mark.asyncio
+    async def test_list_filter_without_terms(self, client: AsyncClient):
+        """A search filter with no words filters out every blog, not none"""
+        headers = await _create_user(client, f"Searcher{uuid4().hex[:6]}")
+        await _post_blog(client, headers, "Plain title", "content")
+
+        for path in ["/api/blogs", "/api/users/me/blogs"]:
+            resp = await client.get(path, params={"search": "!!!"}, headers=headers)
+            assert resp.status_code == 200
+            assert resp.json()["data"] == []
@@ -0,0 +1,319 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from fakeredis import FakeAsyncRedis
+from httpx import AsyncClient
+from sqlalchemy import update
+from sqlmodel import select
+
+from app.blogs.models import Blog
+from app.blogs.search import memory
+from app.blogs.search import service as search_service
+from app.blogs.search.inverted_index import InvertedIndex, PostingList
+from app.blogs.search.memory import (
+    BlogSearchIndex,
+    MemorySearchBackend,
+    blog_search_index,
+)
+from app.core.services.redis import RedisManager
+from app.main import app
+from tests.conftest import TestAsyncSessionLocal
+from tests.utils.auth_utils import _create_user
+
+
+@pytest.fixture
+def memory_search(monkeypatch):
+    """Route blog search to the in-process index, built fresh from the test db"""
+    monkeypatch.setattr(search_service, "SEARCH_BACKEND", "memory")
+    blog_search_index.reset()
+    yield blog_search_index
+    blog_search_index.reset()
+
+
+async def _post_blog(client: AsyncClient, headers, title: str, content: str, tags=""):
+    resp = await client.post(
+        "/api/blogs",
+        data={"title": title, "content": content, "tags": tags},
+        headers=headers,
+    )
+    assert resp.status_code == 201
+
+    resp = await client.get("/api/users/me/blogs?limit=100", headers=headers)
+    return max(blog["id"] for blog in resp.json()["data"])
+
+
+class TestInvertedIndex:
+    """Test the posting lists, BM25 ranking and snapshots"""
+
+    def test_posting_list_delta_encoding(self):
+        """Ids are stored as gaps and stay ordered when added out of order"""
+        postings = PostingList()
+        for doc_id in (3, 10, 7):
+            postings.add(doc_id, 1)
+
+        assert list(postings) == [(3, 1), (7, 1), (10, 1)]
+        assert list(postings.deltas) == [3, 4, 3]
+
+        postings.remove(7)
+        assert list(postings) == [(3, 1), (10, 1)]
+        postings.add(11, 2)
+        postings.compact()
+        assert list(postings.deltas) == [3, 7, 1]
+
+    def test_posting_list_changes_are_not_rewritten(self):
+        """Removing and re-adding a doc leaves the encoded arrays alone"""
+        postings = PostingList()
+        for doc_id in range(1, 11):
+            postings.add(doc_id, 1)
+        deltas = postings.deltas
+
+        postings.remove(4)
+        postings.add(4, 5)
+        postings.remove(6)
+        assert postings.deltas is deltas
+        assert len(postings) == 9
+        assert (4, 5) in list(postings)
+        assert 6 not in dict(postings)
+
+        # folded in once the changes cover half the list
+        for doc_id in (1, 2, 3):
+            postings.remove(doc_id)
+        assert postings.deltas is not deltas
+        assert postings.changes == {}
+        assert list(postings) == [(4, 5), (5, 1), (7, 1), (8, 1), (9, 1), (10, 1)]
+
+    def test_ranking_and_prefix_match(self):
+        """Title and tag matches outrank content, every term must prefix a word"""
+        index = InvertedIndex()
+        index.add(1, "Cooking pasta", "A recipe", ["food"])
+        index.add(2, "Travel notes", "Some pasta in Rome", [])
+        index.add(3, "Gardening", "Nothing relevant", ["pasta"])
+
+        assert [doc_id for doc_id, _ in index.search(["pasta"])] == [1, 3, 2]
+        assert [doc_id for doc_id, _ in index.search(["pas", "rom"])] == [2]
+        assert index.search(["pasta", "missing"]) == []
+
+    def test_remove_and_reindex(self):
+        """Re-adding a document replaces it, removing it drops unused terms"""
+        index = InvertedIndex()
+        index.add(1, "Old title", "content")
+        index.add(1, "New title", "content")
+
+        assert index.search(["old"]) == []
+        assert [doc_id for doc_id, _ in index.search(["new"])] == [1]
+
+        index.remove(1)
+        assert len(index) == 0
+        assert index.vocabulary == []
+        assert index.total_length == 0
+
+    def test_snapshot_round_trip(self, tmp_path):
+        """A loaded snapshot answers queries like the saved index"""
+        index = InvertedIndex()
+        index.add(1, "Cooking pasta", "A recipe", ["food"])
+        index.add(5, "Travel notes", "Some pasta in Rome", [])
+        path = str(tmp_path / "search.snapshot")
+        index.save(path, max_id=index.max_doc_id)
+
+        loaded, meta = InvertedIndex.load(path)
+
+        assert meta == {"max_id": 5}
+        assert loaded.search(["pasta"]) == index.search(["pasta"])
+        loaded.remove(5)
+        assert [doc_id for doc_id, _ in loaded.search(["pasta"])] == [1]
+
+    def test_corrupt_snapshot(self, tmp_path):
+        """Unreadable snapshots are rejected"""
+        path = tmp_path / "search.snapshot"
+        path.write_bytes(b"not a snapshot")
+
+        with pytest.raises(ValueError):
+            InvertedIndex.load(str(path))
+
+
+class TestMemorySearchBackend:
+    """Test blog search served from the in-process index"""
+
+    @pytest.mark.asyncio
+    async def test_search_by_tag_and_content(self, client: AsyncClient, memory_search):
+        """Blogs are found by tag names and content"""
+        headers = await _create_user(client, f"Indexer{uuid4().hex[:6]}")
+        tag, word = f"zq{uuid4().hex[:8]}", f"zq{uuid4().hex[:8]}"
+        tagged_id = await _post_blog(client, headers, "Tagged", "content", f"#{tag}")
+        content_id = await _post_blog(client, headers, "Plain", f"Has {word} inside")
+
+        resp = await client.get("/api/blogs", params={"search": tag})
+        assert [blog["id"] for blog in resp.json()["data"]] == [tagged_id]
+
+        resp = await client.get("/api/blogs/search", params={"q": word})
+        assert [blog["id"] for blog in resp.json()["data"]] == [content_id]
+        assert memory_search.is_built
+
+    @pytest.mark.asyncio
+    async def test_index_follows_writes(self, client: AsyncClient, memory_search):
+        """Created, edited and deleted blogs are reindexed incrementally"""
+        headers = await _create_user(client, f"Indexer{uuid4().hex[:6]}")
+        old, new = f"zq{uuid4().hex[:8]}", f"zq{uuid4().hex[:8]}"
+
+        # build the index before the blog exists
+        resp = await client.get("/api/blogs/search", params={"q": old})
+        assert resp.json()["data"] == []
+
+        blog_id = await _post_blog(client, headers, f"Title {old}", "content")
+        resp = await client.get("/api/blogs/search", params={"q": old})
+        assert [blog["id"] for blog in resp.json()["data"]] == [blog_id]
+
+        await client.patch(
+            f"/api/blogs/{blog_id}", data={"title": f"Title {new}"}, headers=headers
+        )
+        resp = await client.get("/api/blogs/search", params={"q": old})
+        assert resp.json()["data"] == []
+
+        await client.delete(f"/api/blogs/{blog_id}", headers=headers)
+        assert blog_id not in memory_search.index  # type: ignore
+
+    @pytest.mark.asyncio
+    async def test_matches_beyond_ranked_limit_are_kept(
+        self, client: AsyncClient, memory_search, monkeypatch
+    ):
+        """Only ranking is capped; filters and totals see every match"""
+        monkeypatch.setattr(memory, "SEARCH_MAX_RESULTS", 1)
+        headers = await _create_user(client, f"Indexer{uuid4().hex[:6]}")
+        word = f"zq{uuid4().hex[:8]}"
+        blog_ids = [
+            await _post_blog(client, headers, f"Post {i}", f"About {word}")
+            for i in range(3)
+        ]
+
+        resp = await client.get("/api/blogs", params={"search": word})
+        page = resp.json()
+        assert page["total"] == 3
+        assert sorted(blog["id"] for blog in page["data"]) == sorted(blog_ids)
+
+        resp = await client.get("/api/blogs/search", params={"q": word})
+        assert len(resp.json()["data"]) == 3
+
+    @pytest.mark.asyncio
+    async def test_statement_size_does_not_grow_with_matches(self, monkeypatch):
+        """Match ids are sent as one parameter, not inlined into the SQL"""
+        monkeypatch.setattr(memory, "SEARCH_MAX_RESULTS", 1)
+        search_index = BlogSearchIndex()
+        search_index.index = InvertedIndex()
+        for doc_id in range(1, 501):
+            search_index.index.add(doc_id, "common", "", [])
+        search_index.index.add(501, "rare", "", [])
+        backend = MemorySearchBackend(search_index)
+
+        async with TestAsyncSessionLocal() as session:
+            common = await backend.match(session, ["common"])
+            rare = await backend.match(session, ["rare"])
+            dialect = session.get_bind().dialect
+            assert str(common.compile(dialect=dialect)) == str(
+                rare.compile(dialect=dialect)
+            )
+
+            # the ids still filter the blog table
+            matched = (await session.execute(common)).scalars().all()
+            result = await session.execute(
+                select(Blog.id).where(Blog.id <= 500)  # type: ignore
+            )
+            assert sorted(matched) == sorted(result.scalars().all())
+
+    @pytest.mark.asyncio
+    async def test_warm_start_reindexes_edited_blogs(
+        self, client: AsyncClient, memory_search, tmp_path
+    ):
+        """Blogs edited while the snapshot was on disk are reindexed on load"""
+        headers = await _create_user(client, f"Indexer{uuid4().hex[:6]}")
+        old, new = f"zq{uuid4().hex[:8]}", f"zq{uuid4().hex[:8]}"
+        blog_id = await _post_blog(client, headers, f"Title {old}", "content")
+
+        snapshot = str(tmp_path / "search.snapshot")
+        async with TestAsyncSessionLocal() as session:
+            await memory_search.ensure_built(session)
+        memory_search.snapshot_path = snapshot
+        memory_search.save_snapshot()
+
+        async with TestAsyncSessionLocal() as session:
+            await session.execute(
+                update(Blog)
+                .where(Blog.id == blog_id)  # type: ignore
+                .values(title=f"Title {new}")
+            )
+            await session.commit()
+
+        restarted = BlogSearchIndex(snapshot)
+        async with TestAsyncSessionLocal() as session:
+            index = await restarted.ensure_built(session)
+
+        assert index.search([old]) == []
+        assert [doc_id for doc_id, _ in index.search([new])] == [blog_id]
+
+    @pytest.mark.asyncio
+    async def test_writes_are_not_announced_for_other_backends(
+        self, client: AsyncClient
+    ):
+        """Without the in-process index nothing is published on blog writes"""
+        pubsub = await app.state.redis_manager.subscribe(BlogSearchIndex.channel)
+        try:
+            headers = await _create_user(client, f"Indexer{uuid4().hex[:6]}")
+            await _post_blog(client, headers, "Unannounced", "content")
+
+            # the first read only consumes the subscribe confirmation
+            messages = [
+                await pubsub.get_message(ignore_subscribe_messages=True, timeout=0.1)
+                for _ in range(2)
+            ]
+            assert messages == [None, None]
+        finally:
+            await pubsub.aclose()
+
+    @pytest.mark.asyncio
+    async def test_writes_reach_other_workers(
+        self, client: AsyncClient, memory_search
+    ):
+        """A blog indexed on one worker is reindexed on the others"""
+        headers = await _create_user(client, f"Indexer{uuid4().hex[:6]}")
+        word = f"zq{uuid4().hex[:8]}"
+        manager = RedisManager()
+        manager.redis_client = FakeAsyncRedis(decode_responses=True)
+
+        other = BlogSearchIndex()
+        other.bind(manager)
+        async with TestAsyncSessionLocal() as session:
+            await other.ensure_built(session)
+        listener = asyncio.create_task(other.listen(TestAsyncSessionLocal))
+        await asyncio.sleep(0.05)
+
+        memory_search.bind(manager)
+        try:
+            resp = await client.post(
+                "/api/blogs",
+                data={"title": f"Title {word}", "content": "content"},
+                headers=headers,
+            )
+            assert resp.status_code == 201
+            async with TestAsyncSessionLocal() as session:
+                result = await session.execute(
+                    select(Blog.id).where(Blog.title == f"Title {word}")
+                )
+                blog_id = result.scalar_one()
+            for _ in range(100):
+                if blog_id in other.index:  # type: ignore
+                    break
+                await asyncio.sleep(0.01)
+            matches = other.index.search([word])  # type: ignore
+            assert [doc_id for doc_id, _ in matches] == [blog_id]
+
+            await client.delete(f"/api/blogs/{blog_id}", headers=headers)
+            for _ in range(100):
+                if blog_id not in other.index:  # type: ignore
+                    break
+                await asyncio.sleep(0.01)
+            assert blog_id not in other.index  # type: ignore
+        finally:
+            memory_search.bind(None)
+            listener.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await listener
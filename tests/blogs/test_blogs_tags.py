@@ -0,0 +1,116 @@
+import asyncio
+import json
+from uuid import uuid4
+
+import pytest
+from httpx import AsyncClient
+from sqlmodel import col, func, select
+
+from app.blogs.crud.tags import parse_tags, upsert_tags
+from app.blogs.models import Tag
+from app.blogs.services.tag_cache import tag_cache
+from app.core.services.redis import redis_manager
+from tests.conftest import TestAsyncSessionLocal
+from tests.utils.auth_utils import _create_user
+
+
+class TestTagUpsert:
+    """Test bulk tag resolution when creating blogs"""
+
+    def test_parse_tags(self):
+        """Tags are stripped and deduplicated, keeping their order"""
+        assert parse_tags(" #python# fastapi##python ") == ["python", "fastapi"]
+        assert parse_tags(None) == []
+
+    @pytest.mark.asyncio
+    async def test_upsert_reuses_existing_tags(self, client: AsyncClient):
+        """Existing tags keep their ids and missing ones are created once"""
+        existing, new = f"tag{uuid4().hex[:8]}", f"tag{uuid4().hex[:8]}"
+
+        async with TestAsyncSessionLocal() as session:
+            first, created = await upsert_tags(session, [existing])
+            await session.commit()
+
+        async with TestAsyncSessionLocal() as session:
+            second, created_second = await upsert_tags(session, [existing, new])
+            again, created_again = await upsert_tags(session, [new, existing])
+            await session.commit()
+
+            count = await session.execute(
+                select(func.count()).where(col(Tag.title).in_([existing, new]))
+            )
+
+        assert created == [existing]
+        assert second[existing] == first[existing]
+        assert created_second == [new]
+        assert again == second
+        assert created_again == []
+        assert count.scalar() == 2
+
+    @pytest.mark.asyncio
+    async def test_blog_created_with_duplicate_tags(self, client: AsyncClient):
+        """A blog links each of its tags once"""
+        headers = await _create_user(client, f"Tagger{uuid4().hex[:6]}")
+        tag = f"tag{uuid4().hex[:8]}"
+
+        resp = await client.post(
+            "/api/blogs",
+            data={"title": "Tagged", "content": "content", "tags": f"#{tag}#{tag}#x"},
+            headers=headers,
+        )
+        assert resp.status_code == 201
+
+        resp = await client.get("/api/users/me/blogs", headers=headers)
+        assert resp.json()["data"][0]["tags"] == [tag, "x"]
+
+
+class TestTagCache:
+    """Test tag filters resolved through the tag title -> id cache"""
+
+    @pytest.mark.asyncio
+    async def test_filter_by_cached_tags(self, client: AsyncClient):
+        """Blogs must have every requested tag, unknown tags match nothing"""
+        headers = await _create_user(client, f"Tagger{uuid4().hex[:6]}")
+        first, second = f"tag{uuid4().hex[:8]}", f"tag{uuid4().hex[:8]}"
+
+        for tags in (f"#{first}#{second}", f"#{first}"):
+            resp = await client.post(
+                "/api/blogs",
+                data={"title": "Tagged", "content": "content", "tags": tags},
+                headers=headers,
+            )
+            assert resp.status_code == 201
+
+        resp = await client.get("/api/blogs", params={"tags": [first, second]})
+        assert resp.json()["total"] == 1
+
+        resp = await client.get("/api/blogs", params={"tags": [first]})
+        assert resp.json()["total"] == 2
+
+        resp = await client.get("/api/blogs", params={"tags": [first, "missing"]})
+        assert resp.json()["total"] == 0
+        assert first in tag_cache.ids
+
+    @pytest.mark.asyncio
+    async def test_invalidation_reaches_other_workers(self, client: AsyncClient):
+        """A published invalidation drops the titles from the local map"""
+        title = f"tag{uuid4().hex[:8]}"
+        async with TestAsyncSessionLocal() as session:
+            await upsert_tags(session, [title])
+            await session.commit()
+            await tag_cache.resolve(session, [title])
+        assert title in tag_cache.ids
+
+        listener = asyncio.create_task(tag_cache.listen())
+        try:
+            await asyncio.sleep(0.05)
+            # published by another worker after renaming the tag
+            await redis_manager.publish(tag_cache.channel, json.dumps([title]))
+            for _ in range(20):
+                if title not in tag_cache.ids:
+                    break
+                await asyncio.sleep(0.05)
+        finally:
+            listener.cancel()
+
+        assert title not in tag_cache.ids
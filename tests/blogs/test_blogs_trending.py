@@ -0,0 +1,132 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from httpx import AsyncClient
+
+from app.blogs.crud.bookmarks import add_blog_to_bookmark
+from app.blogs.models import Blog
+from app.blogs.services.trending import (
+    EMPTY_SCORE,
+    EVENT_WEIGHTS,
+    TRENDING_HALF_LIFE_HOURS,
+    EngagementEvent,
+    current_score,
+    decayed_add,
+)
+from app.blogs.services.views import apply_view_counts
+from tests.conftest import TestAsyncSessionLocal
+from tests.utils.blog_utils import _create_blog
+
+
+async def _ranked_ids(client: AsyncClient, path: str) -> list[int]:
+    resp = await client.get(f"{path}?limit=100")
+    assert resp.status_code == 200
+    return [blog["id"] for blog in resp.json()["data"]]
+
+
+class TestDecayedScore:
+    """Test the time decayed trending score"""
+
+    def test_score_halves_after_half_life(self):
+        """An engagement is worth half as much one half-life later"""
+        now = datetime.now(timezone.utc)
+        score = decayed_add(EMPTY_SCORE, 2.0, now)
+
+        assert current_score(score, now) == pytest.approx(2.0)
+        later = now + timedelta(hours=TRENDING_HALF_LIFE_HOURS)
+        assert current_score(score, later) == pytest.approx(1.0)
+
+    def test_recent_engagement_outranks_older(self):
+        """The same engagement scores higher the more recent it is"""
+        now = datetime.now(timezone.utc)
+        old = decayed_add(EMPTY_SCORE, 5.0, now - timedelta(days=7))
+        recent = decayed_add(EMPTY_SCORE, 1.0, now)
+
+        assert recent > old
+
+    def test_removal_is_clamped(self):
+        """Removing engagement never goes below an empty score"""
+        now = datetime.now(timezone.utc)
+        score = decayed_add(EMPTY_SCORE, 1.0, now)
+        score = decayed_add(score, 3.0, now)
+
+        assert current_score(decayed_add(score, -1.0, now), now) == pytest.approx(3.0)
+        assert decayed_add(score, -10.0, now) == EMPTY_SCORE
+
+
+class TestTrendingBlogs:
+    """Test /blogs/trending and /blogs/popular ordering"""
+
+    @pytest.mark.asyncio
+    async def test_trending_orders_by_engagement(self, client: AsyncClient):
+        """A commented blog outranks a liked one, and unengaged blogs are excluded"""
+        liked_id, headers = await _create_blog(client)
+        commented_id, _ = await _create_blog(client)
+        quiet_id, _ = await _create_blog(client)
+
+        resp = await client.post(f"/api/blogs/{liked_id}/like", headers=headers)
+        assert resp.status_code == 200
+        resp = await client.post(
+            f"/api/blogs/{commented_id}/comments",
+            json={"content": "Trending comment"},
+            headers=headers,
+        )
+        assert resp.status_code == 200
+
+        for path in ("/api/blogs/trending", "/api/blogs/popular"):
+            ids = await _ranked_ids(client, path)
+            assert ids.index(commented_id) < ids.index(liked_id)
+            assert quiet_id not in ids
+
+    @pytest.mark.asyncio
+    async def test_unlike_removes_from_trending(self, client: AsyncClient):
+        """Undoing the only engagement drops the blog from trending"""
+        blog_id, headers = await _create_blog(client)
+
+        await client.post(f"/api/blogs/{blog_id}/like", headers=headers)
+        assert blog_id in await _ranked_ids(client, "/api/blogs/trending")
+
+        await client.post(f"/api/blogs/{blog_id}/like", headers=headers)
+        assert blog_id not in await _ranked_ids(client, "/api/blogs/trending")
+
+    @pytest.mark.asyncio
+    async def test_bookmark_toggle_updates_count(self, client: AsyncClient):
+        """Removing a bookmark decrements the counter again"""
+        blog_id, headers = await _create_blog(client)
+
+        await client.post(f"/api/blogs/{blog_id}/bookmark", headers=headers)
+        await client.post(f"/api/blogs/{blog_id}/bookmark", headers=headers)
+
+        resp = await client.get("/api/users/me/blogs", headers=headers)
+        blog = next(b for b in resp.json()["data"] if b["id"] == blog_id)
+        assert blog["bookmarks_count"] == 0
+
+    @pytest.mark.asyncio
+    async def test_engagement_keeps_concurrently_flushed_views(
+        self, client: AsyncClient
+    ):
+        """A bookmark doesn't write back scores read before a view flush"""
+        blog_id, headers = await _create_blog(client)
+        resp = await client.get("/api/users/me", headers=headers)
+        user_id = resp.json()["id"]
+
+        async with TestAsyncSessionLocal() as session:
+            loaded = await session.get(Blog, blog_id)
+
+            # views flushed by another worker after the blog was loaded
+            async with TestAsyncSessionLocal() as other:
+                await apply_view_counts(other, {blog_id: 10})
+
+            await add_blog_to_bookmark(session, user_id, blog_id)
+            assert loaded.bookmarks_count == 1  # type: ignore
+
+        async with TestAsyncSessionLocal() as session:
+            blog = await session.get(Blog, blog_id)
+        assert blog.views == 10  # type: ignore
+        assert blog.engagement_score == pytest.approx(  # type: ignore
+            10 * EVENT_WEIGHTS[EngagementEvent.VIEW]
+            + EVENT_WEIGHTS[EngagementEvent.BOOKMARK]
+        )
+        assert current_score(blog.trending_score) == pytest.approx(  # type: ignore
+            blog.engagement_score, rel=1e-3  # type: ignore
+        )
@@ -0,0 +1,45 @@
+import pytest
+from httpx import AsyncClient
+
+from app.blogs.services.views import view_counter
+from tests.conftest import TestAsyncSessionLocal
+from tests.utils.blog_utils import _create_blog
+
+
+async def _get_views(client: AsyncClient, headers: dict[str, str], blog_id: int):
+    resp = await client.get("/api/users/me/blogs", headers=headers)
+    assert resp.status_code == 200
+    return next(blog["views"] for blog in resp.json()["data"] if blog["id"] == blog_id)
+
+
+class TestBlogViews:
+    """Test buffered blog view counting"""
+
+    @pytest.mark.asyncio
+    async def test_views_are_buffered_until_flush(self, client: AsyncClient):
+        """Reading a blog doesn't write; flushing applies all buffered views"""
+        blog_id, headers = await _create_blog(client)
+
+        for _ in range(3):
+            resp = await client.get(f"/api/blogs/{blog_id}")
+            assert resp.status_code == 200
+
+        assert await _get_views(client, headers, blog_id) == 0
+
+        async with TestAsyncSessionLocal() as session:
+            assert await view_counter.flush(session) >= 1
+
+        assert await _get_views(client, headers, blog_id) == 3
+
+        # nothing left to flush
+        async with TestAsyncSessionLocal() as session:
+            assert await view_counter.flush(session) == 0
+
+    @pytest.mark.asyncio
+    async def test_views_of_missing_blog_not_buffered(self, client: AsyncClient):
+        """A 404 read doesn't record a view"""
+        resp = await client.get("/api/blogs/999999")
+        assert resp.status_code == 404
+
+        async with TestAsyncSessionLocal() as session:
+            assert await view_counter.flush(session) == 0
@@ -0,0 +1,173 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from fakeredis import FakeAsyncRedis
+from httpx import AsyncClient
+
+from app.notifications import fanout
+from app.notifications.fanout import notification_fanout
+from app.notifications.models import NotificationType
+from tests.conftest import TestAsyncSessionLocal
+from tests.utils.auth_utils import _create_user
+
+
+@pytest.fixture
+def queued_fanout(monkeypatch):
+    """Queue jobs in a Redis stream instead of running them in the request"""
+    monkeypatch.setattr(fanout, "FANOUT_BATCH_SIZE", 2)
+    redis = FakeAsyncRedis(decode_responses=True)
+    notification_fanout.bind(redis)
+    yield redis
+    notification_fanout.bind(None, inline=True)
+
+
+async def _author_with_followers(client: AsyncClient, count: int):
+    author_headers = await _create_user(client, f"FanoutAuthor{uuid4().hex[:6]}")
+    resp = await client.get("/api/users/me", headers=author_headers)
+    author_id = resp.json()["id"]
+
+    followers = []
+    for _ in range(count):
+        headers = await _create_user(client, f"FanoutFollower{uuid4().hex[:6]}")
+        await client.post(f"/api/users/{author_id}/follow", headers=headers)
+        resp = await client.get("/api/users/me", headers=headers)
+        followers.append((resp.json()["id"], headers))
+
+    return author_id, sorted(followers, key=lambda follower: follower[0])
+
+
+async def _notification_total(client: AsyncClient, headers) -> int:
+    resp = await client.get("/api/notifications", headers=headers)
+    return resp.json()["total"]
+
+
+class TestNotificationFanout:
+    """Test the queued fan-out of new blog notifications"""
+
+    @pytest.mark.asyncio
+    async def test_worker_notifies_followers_in_batches(
+        self, client: AsyncClient, queued_fanout
+    ):
+        """Jobs are only queued by the request and run by the worker"""
+        author_id, followers = await _author_with_followers(client, 3)
+
+        async with TestAsyncSessionLocal() as session:
+            await notification_fanout.enqueue(
+                session, author_id, NotificationType.NEW_BLOG, None, "New blog"
+            )
+
+        for _, headers in followers:
+            assert await _notification_total(client, headers) == 0
+
+        assert await notification_fanout.process(TestAsyncSessionLocal) == 1
+
+        for _, headers in followers:
+            assert await _notification_total(client, headers) == 1
+        assert await queued_fanout.xlen(notification_fanout.stream) == 0
+        assert await notification_fanout.process(TestAsyncSessionLocal) == 0
+
+    @pytest.mark.asyncio
+    async def test_interrupted_job_resumes(self, client: AsyncClient, queued_fanout):
+        """A job resumes after the last follower batch it checkpointed"""
+        author_id, followers = await _author_with_followers(client, 3)
+
+        async with TestAsyncSessionLocal() as session:
+            message_id = await notification_fanout.enqueue(
+                session, author_id, NotificationType.NEW_BLOG, None, "New blog"
+            )
+        # the first follower was notified before a crash
+        await queued_fanout.hset(
+            notification_fanout.progress_key, message_id, followers[0][0]
+        )
+
+        await notification_fanout.process(TestAsyncSessionLocal)
+
+        totals = [await _notification_total(client, headers) for _, headers in followers]
+        assert totals == [0, 1, 1]
+        assert not await queued_fanout.hexists(
+            notification_fanout.progress_key, message_id
+        )
+
+    @pytest.mark.asyncio
+    async def test_failed_job_is_retried_by_running_worker(
+        self, client: AsyncClient, queued_fanout, monkeypatch
+    ):
+        """A job that failed is swept up again without restarting the worker"""
+        monkeypatch.setattr(fanout, "FANOUT_CLAIM_IDLE_MS", 0)
+        monkeypatch.setattr(fanout, "FANOUT_RECLAIM_INTERVAL", 0)
+        author_id, followers = await _author_with_followers(client, 1)
+        fan_out = notification_fanout.fan_out
+        calls = []
+
+        async def flaky_fan_out(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == 1:
+                raise RuntimeError("database unavailable")
+            return await fan_out(*args, **kwargs)
+
+        async def idle_process(*args, **kwargs):
+            # stands in for a blocking read of an empty stream
+            await asyncio.sleep(0.01)
+            return 0
+
+        monkeypatch.setattr(notification_fanout, "fan_out", flaky_fan_out)
+        monkeypatch.setattr(notification_fanout, "process", idle_process)
+        worker = asyncio.create_task(
+            notification_fanout.run_worker(TestAsyncSessionLocal)
+        )
+        try:
+            async with TestAsyncSessionLocal() as session:
+                await notification_fanout.enqueue(
+                    session, author_id, NotificationType.NEW_BLOG, None, "New blog"
+                )
+            # delivered once and failed, after the worker started
+            await fanout.NotificationFanout.process(
+                notification_fanout, TestAsyncSessionLocal
+            )
+            assert len(calls) == 1
+
+            for _ in range(100):
+                if await queued_fanout.xlen(notification_fanout.stream) == 0:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            worker.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await worker
+
+        assert len(calls) == 2
+        assert await _notification_total(client, followers[0][1]) == 1
+        assert not await queued_fanout.hlen(notification_fanout.attempts_key)
+
+    @pytest.mark.asyncio
+    async def test_job_failing_every_attempt_is_dead_lettered(
+        self, client: AsyncClient, queued_fanout, monkeypatch
+    ):
+        """A job stops being retried after the attempt limit"""
+        monkeypatch.setattr(fanout, "FANOUT_CLAIM_IDLE_MS", 0)
+        monkeypatch.setattr(fanout, "FANOUT_MAX_ATTEMPTS", 2)
+
+        async def failing_fan_out(*args, **kwargs):
+            raise RuntimeError("database unavailable")
+
+        monkeypatch.setattr(notification_fanout, "fan_out", failing_fan_out)
+        async with TestAsyncSessionLocal() as session:
+            message_id = await notification_fanout.enqueue(
+                session, 1, NotificationType.NEW_BLOG, None, "New blog"
+            )
+
+        assert await notification_fanout.process(TestAsyncSessionLocal) == 1
+        assert await notification_fanout.reclaim(TestAsyncSessionLocal) == 1
+        assert await queued_fanout.xlen(notification_fanout.dead_letter_stream) == 0
+
+        # third delivery: over the limit
+        assert await notification_fanout.reclaim(TestAsyncSessionLocal) == 1
+        assert await notification_fanout.reclaim(TestAsyncSessionLocal) == 0
+
+        assert await queued_fanout.xlen(notification_fanout.stream) == 0
+        [(_, fields)] = await queued_fanout.xrange(
+            notification_fanout.dead_letter_stream
+        )
+        assert fields["message_id"] == message_id
+        assert fields["attempts"] == "2"
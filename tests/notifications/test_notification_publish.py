@@ -0,0 +1,99 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from app.core.services.redis import RedisManager
+from app.notifications.models import Notification, NotificationType
+from app.realtime.connection import frame_data
+from app.realtime.events import NOTIFICATION_BATCH_CHANNEL, publish_notifications
+from app.realtime.manager import SSEManager
+
+
+@pytest.fixture
+def manager() -> RedisManager:
+    redis_manager = RedisManager()
+    redis_manager.redis_client = FakeAsyncRedis(decode_responses=True)
+    return redis_manager
+
+
+def _notifications(count: int) -> list[Notification]:
+    return [
+        Notification(
+            id=i,
+            owner_id=i,
+            triggered_by_user_id=0,
+            notification_type=NotificationType.NEW_BLOG,
+            message="New blog",
+            created_at=datetime.now(timezone.utc),
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+async def _received(pubsub, expected: int) -> list[dict]:
+    messages = []
+    for _ in range(100):
+        message = await pubsub.get_message(
+            ignore_subscribe_messages=True, timeout=0.05
+        )
+        if message:
+            messages.append(message)
+        if len(messages) == expected:
+            break
+    return messages
+
+
+class TestBatchPublish:
+    """Test pipelined and batched publishing of notifications"""
+
+    @pytest.mark.asyncio
+    async def test_publish_many_pipelines_every_message(self, manager: RedisManager):
+        """Every pair is published, however the pipeline batches split"""
+        pubsub = await manager.psubscribe("bench:*")
+
+        published = await manager.publish_many(
+            ((f"bench:{i}", str(i)) for i in range(25)), batch_size=10
+        )
+
+        assert published == 25
+        messages = await _received(pubsub, 25)
+        assert [int(message["data"]) for message in messages] == list(range(25))
+
+    @pytest.mark.asyncio
+    async def test_batched_messages_target_several_users(
+        self, manager: RedisManager
+    ):
+        """Batch messages list the user each event is for"""
+        pubsub = await manager.subscribe(NOTIFICATION_BATCH_CHANNEL)
+
+        published = await publish_notifications(
+            _notifications(3), manager, batched=True
+        )
+
+        assert published == 1
+        [message] = await _received(pubsub, 1)
+        events = json.loads(message["data"])["events"]
+        assert [event["user_id"] for event in events] == [1, 2, 3]
+        assert events[0]["data"]["type"] == NotificationType.NEW_BLOG
+
+    @pytest.mark.asyncio
+    async def test_listener_delivers_batched_events(self, manager: RedisManager):
+        """The SSE listener hands each event of a batch to its user"""
+        sse_manager = SSEManager()
+        queue: asyncio.Queue = asyncio.Queue()
+        await sse_manager.add_connection(2, queue)
+
+        listener = asyncio.create_task(sse_manager.start_redis_listener(manager))
+        try:
+            await asyncio.sleep(0.05)
+            await publish_notifications(_notifications(3), manager, batched=True)
+            frame = await asyncio.wait_for(queue.get(), timeout=1)
+            data = json.loads(frame_data(frame))
+        finally:
+            listener.cancel()
+
+        assert data["id"] == 2
+        assert queue.empty()
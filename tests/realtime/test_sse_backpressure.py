@@ -0,0 +1,83 @@
+import asyncio
+import json
+
+import pytest
+
+from app.realtime.connection import (
+    CLOSED,
+    ConnectionQueue,
+    frame_event_id,
+    notification_frame,
+)
+from app.realtime.manager import SSEManager
+
+
+class TestSSEBackpressure:
+    """Test bounded SSE queues and slow-consumer eviction"""
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_oldest_message(self):
+        """A lagging client keeps the newest messages"""
+        sse_manager = SSEManager()
+        queue = ConnectionQueue(maxsize=2)
+        await sse_manager.add_connection(1, queue)
+
+        for i in range(4):
+            await sse_manager.send_to_user(1, {"id": i})
+
+        assert queue.dropped == 2
+        assert [frame_event_id(queue.get_nowait()) for _ in range(2)] == [2, 3]
+        assert queue.delivered == 2
+        assert queue.queued_bytes == 0
+
+    @pytest.mark.asyncio
+    async def test_stalled_consumer_is_evicted(self):
+        """A full queue that stopped moving closes its connection"""
+        sse_manager = SSEManager()
+        stalled = ConnectionQueue(maxsize=1, max_lag=0)
+        healthy = ConnectionQueue(maxsize=10)
+        await sse_manager.add_connection(1, stalled)
+        await sse_manager.add_connection(1, healthy)
+
+        await sse_manager.send_to_user(1, {"id": 1})
+        await asyncio.sleep(0.01)
+        await sse_manager.send_to_user(1, {"id": 2})
+
+        assert sse_manager.connections[1] == {healthy}
+        assert sse_manager.metrics["evicted"] == 1
+        assert await stalled.get() is CLOSED
+        assert healthy.qsize() == 2
+
+    @pytest.mark.asyncio
+    async def test_stats_report_lagging_connections(self):
+        """Per-connection metrics list the most lagging connections first"""
+        sse_manager = SSEManager()
+        slow, fast = ConnectionQueue(), ConnectionQueue()
+        await sse_manager.add_connection(1, slow)
+        await sse_manager.send_to_user(1, {"id": 1})
+        await asyncio.sleep(0.01)
+        await sse_manager.add_connection(2, fast)
+
+        stats = sse_manager.stats()
+
+        assert stats["users"] == 2
+        assert stats["connections"] == 2
+        assert stats["queued_bytes"] == len(
+            notification_frame(1, json.dumps({"id": 1}))
+        )
+        assert [entry["user_id"] for entry in stats["lagging"]] == [1, 2]
+        assert stats["lagging"][0]["lag"] > 0
+
+    @pytest.mark.asyncio
+    async def test_frame_is_shared_by_every_connection(self):
+        """A user's connections queue the same encoded frame object"""
+        sse_manager = SSEManager()
+        first, second = ConnectionQueue(), ConnectionQueue()
+        await sse_manager.add_connection(1, first)
+        await sse_manager.add_connection(1, second)
+
+        await sse_manager._dispatch("notifications:1", json.dumps({"id": 7}))
+
+        frame = first.get_nowait()
+        assert frame is second.get_nowait()
+        assert frame == b'id: 7\r\nevent: notification\r\ndata: {"id": 7}\r\n\r\n'
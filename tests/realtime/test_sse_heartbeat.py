@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from app.realtime.connection import HEARTBEAT, ConnectionQueue
+from app.realtime.manager import SSEManager, sse_manager
+from app.realtime.routes import NotificationStreamResponse, notification_events
+
+
+async def _wait_for(condition, timeout: float = 1.0):
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+
+
+class TestSSEHeartbeat:
+    """Test the shared heartbeat and disconnect handling of SSE streams"""
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_goes_to_idle_connections(self):
+        """Every idle connection gets the same pre-encoded frame"""
+        manager = SSEManager()
+        idle, other_idle, busy = ConnectionQueue(), ConnectionQueue(), ConnectionQueue()
+        await manager.add_connection(1, idle)
+        await manager.add_connection(2, other_idle)
+        await manager.add_connection(3, busy)
+        await manager.send_to_user(3, {"id": 1})
+        busy_size = busy.qsize()
+
+        assert manager.heartbeat() == 2
+
+        assert idle.get_nowait() is HEARTBEAT
+        assert other_idle.get_nowait() is HEARTBEAT
+        assert busy.qsize() == busy_size
+
+    @pytest.mark.asyncio
+    async def test_disconnect_closes_stream(self):
+        """The ASGI disconnect message ends the stream and its connection"""
+        user_id = 9001
+        sent = []
+        disconnected = asyncio.Event()
+
+        async def receive():
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+
+        response = NotificationStreamResponse(notification_events(user_id))
+        stream = asyncio.create_task(response({"type": "http"}, receive, send))
+        try:
+            await _wait_for(lambda: user_id in sse_manager.connections)
+            sse_manager.heartbeat()
+            await _wait_for(
+                lambda: any(message.get("body") == HEARTBEAT for message in sent)
+            )
+            assert any(message.get("body") == HEARTBEAT for message in sent)
+
+            disconnected.set()
+            await asyncio.wait_for(stream, timeout=1)
+        finally:
+            stream.cancel()
+
+        assert user_id not in sse_manager.connections
@@ -0,0 +1,91 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from app.core.services.redis import RedisManager, redis_manager
+from app.notifications.models import Notification, NotificationType
+from app.realtime import replay
+from app.realtime.connection import frame_event_id
+from app.realtime.events import publish_notification, publish_notifications
+from app.realtime.manager import sse_manager
+from app.realtime.replay import events_since
+from app.realtime.routes import notification_events
+
+
+@pytest.fixture
+def manager(monkeypatch) -> RedisManager:
+    monkeypatch.setattr(
+        redis_manager, "redis_client", FakeAsyncRedis(decode_responses=True)
+    )
+    return redis_manager
+
+
+def _notifications(*ids: int, owner_id: int = 1) -> list[Notification]:
+    return [
+        Notification(
+            id=notification_id,
+            owner_id=owner_id,
+            triggered_by_user_id=0,
+            notification_type=NotificationType.NEW_BLOG,
+            message="New blog",
+            created_at=datetime.now(timezone.utc),
+        )
+        for notification_id in ids
+    ]
+
+
+class TestSSEReplay:
+    """Test Last-Event-ID replay of missed notifications"""
+
+    @pytest.mark.asyncio
+    async def test_published_events_are_buffered_per_user(
+        self, manager: RedisManager
+    ):
+        """Only the user's events after the last seen id are replayed"""
+        await publish_notifications(_notifications(1, 2, 3))
+        await publish_notifications(_notifications(4, owner_id=2))
+
+        missed, truncated = await events_since(manager, 1, 1)
+
+        assert [event_id for event_id, _ in missed] == [2, 3]
+        assert json.loads(missed[0][1])["id"] == 2
+        assert not truncated
+
+    @pytest.mark.asyncio
+    async def test_buffer_keeps_newest_events(
+        self, manager: RedisManager, monkeypatch
+    ):
+        """A trimmed buffer tells the client it missed too much to replay"""
+        monkeypatch.setattr(replay, "SSE_REPLAY_SIZE", 3)
+        for notification in _notifications(1, 2, 3, 4, 5):
+            await publish_notification(notification)
+
+        missed, truncated = await events_since(manager, 1, 1)
+        assert [event_id for event_id, _ in missed] == [3, 4, 5]
+        assert truncated
+
+        missed, truncated = await events_since(manager, 1, 3)
+        assert [event_id for event_id, _ in missed] == [4, 5]
+        assert not truncated
+
+    @pytest.mark.asyncio
+    async def test_stream_replays_then_goes_live(self, manager: RedisManager):
+        """Replayed events carry their ids and are not delivered twice"""
+        await publish_notifications(_notifications(1, 2, 3))
+        events = notification_events(1, last_event_id=1)
+        try:
+            assert (await anext(events))["event"] == "connected"
+            replayed = [await anext(events) for _ in range(2)]
+            assert [frame_event_id(frame) for frame in replayed] == [2, 3]
+
+            # a replayed event also arriving live is skipped
+            await sse_manager.send_to_user(1, {"id": 3})
+            await sse_manager.send_to_user(1, {"id": 4})
+            frame = await anext(events)
+            assert frame.startswith(b"id: 4\r\nevent: notification\r\n")
+        finally:
+            await events.aclose()
+
+        assert 1 not in sse_manager.connections
@@ -0,0 +1,186 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from app.core.services.redis import RedisManager
+from app.notifications.models import Notification, NotificationType
+from app.realtime import sharding
+from app.realtime.connection import frame_data
+from app.realtime.events import publish_notification, publish_notifications
+from app.realtime.manager import SSEManager
+from app.realtime.sharding import SHARD_CHANNEL_PREFIX, ConsistentHashRing
+
+
+@pytest.fixture
+def manager() -> RedisManager:
+    redis_manager = RedisManager()
+    redis_manager.redis_client = FakeAsyncRedis(decode_responses=True)
+    return redis_manager
+
+
+@pytest.fixture
+def ring(monkeypatch) -> ConsistentHashRing:
+    """Publish on 4 shard channels"""
+    shard_ring = ConsistentHashRing(4)
+    monkeypatch.setattr(sharding, "shard_ring", shard_ring)
+    return shard_ring
+
+
+def _notifications(*owner_ids: int) -> list[Notification]:
+    return [
+        Notification(
+            id=owner_id,
+            owner_id=owner_id,
+            triggered_by_user_id=0,
+            notification_type=NotificationType.NEW_BLOG,
+            message="New blog",
+            created_at=datetime.now(timezone.utc),
+        )
+        for owner_id in owner_ids
+    ]
+
+
+async def _wait_for(condition, timeout: float = 1.0):
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+
+
+def _users_on_different_shards(ring: ConsistentHashRing) -> tuple[int, int]:
+    first = 1
+    second = next(
+        user_id
+        for user_id in range(2, 1000)
+        if ring.shard_for(user_id) != ring.shard_for(first)
+    )
+    return first, second
+
+
+class TestShardRing:
+    """Test the consistent hash ring users are sharded with"""
+
+    def test_shards_are_stable_and_balanced(self):
+        """A user always maps to the same shard and every shard gets users"""
+        ring = ConsistentHashRing(8)
+        counts = [0] * 8
+        for user_id in range(10_000):
+            assert ring.shard_for(user_id) == ring.shard_for(user_id)
+            counts[ring.shard_for(user_id)] += 1
+
+        assert min(counts) > 10_000 / 8 / 2
+
+    def test_adding_a_shard_moves_few_users(self):
+        """Growing from 8 to 9 shards only moves users to the new shard"""
+        before, after = ConsistentHashRing(8), ConsistentHashRing(9)
+        moved = [
+            user_id
+            for user_id in range(10_000)
+            if before.shard_for(user_id) != after.shard_for(user_id)
+        ]
+
+        assert len(moved) < 10_000 * 0.2
+        assert all(after.shard_for(user_id) == 8 for user_id in moved)
+
+
+class TestShardedPublish:
+    """Test publishing notifications on shard channels"""
+
+    @pytest.mark.asyncio
+    async def test_publish_groups_notifications_by_shard(
+        self, manager: RedisManager, ring: ConsistentHashRing
+    ):
+        """One message per shard, listing the users on that shard"""
+        pubsub = await manager.psubscribe(f"{SHARD_CHANNEL_PREFIX}*")
+        owner_ids = list(range(1, 21))
+
+        published = await publish_notifications(_notifications(*owner_ids), manager)
+
+        shards = {ring.shard_for(owner_id) for owner_id in owner_ids}
+        assert published == len(shards)
+        messages = []
+        for _ in range(100):
+            if len(messages) == published:
+                break
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=0.05
+            )
+            if message:
+                messages.append(message)
+
+        for message in messages:
+            shard = int(message["channel"].split(":")[-1])
+            events = json.loads(message["data"])["events"]
+            assert {event["user_id"] for event in events} == {
+                owner_id for owner_id in owner_ids if ring.shard_for(owner_id) == shard
+            }
+
+
+class TestShardedSSEManager:
+    """Test the shard routing table of the SSE manager"""
+
+    @pytest.mark.asyncio
+    async def test_listens_only_to_shards_of_connected_users(
+        self, manager: RedisManager, ring: ConsistentHashRing
+    ):
+        """Shard listeners start with their first user and stop with the last"""
+        first, second = _users_on_different_shards(ring)
+        sse_manager = SSEManager(ring)
+        queue: asyncio.Queue = asyncio.Queue()
+        # connected before the listener starts
+        await sse_manager.add_connection(first, queue)
+
+        listener = asyncio.create_task(sse_manager.start_redis_listener(manager))
+        try:
+            await _wait_for(lambda: sse_manager.pubsub is not None)
+            assert set(sse_manager.shard_tasks) == {ring.shard_for(first)}
+
+            other: asyncio.Queue = asyncio.Queue()
+            await sse_manager.add_connection(second, other)
+            assert set(sse_manager.shard_tasks) == {
+                ring.shard_for(first),
+                ring.shard_for(second),
+            }
+
+            task = sse_manager.shard_tasks[ring.shard_for(second)]
+            await sse_manager.remove_connection(second, other)
+            await _wait_for(task.done)
+            assert task.cancelled()
+            assert set(sse_manager.shard_tasks) == {ring.shard_for(first)}
+        finally:
+            listener.cancel()
+
+    @pytest.mark.asyncio
+    async def test_delivers_only_local_users_events(
+        self, manager: RedisManager, ring: ConsistentHashRing
+    ):
+        """Events of users on a shard but connected elsewhere are dropped"""
+        first = 1
+        neighbour = next(
+            user_id
+            for user_id in range(2, 1000)
+            if ring.shard_for(user_id) == ring.shard_for(first)
+        )
+        sse_manager = SSEManager(ring)
+        queue: asyncio.Queue = asyncio.Queue()
+
+        listener = asyncio.create_task(sse_manager.start_redis_listener(manager))
+        try:
+            await _wait_for(lambda: sse_manager.pubsub is not None)
+            await sse_manager.add_connection(first, queue)
+            # let the shard listener subscribe
+            await asyncio.sleep(0.05)
+
+            [notification] = _notifications(first)
+            await publish_notifications(_notifications(neighbour), manager)
+            await publish_notification(notification, manager)
+
+            frame = await asyncio.wait_for(queue.get(), timeout=1)
+            data = json.loads(frame_data(frame))
+            assert data["id"] == first
+            assert neighbour not in sse_manager.connections
+        finally:
+            listener.cancel()
@@ -0,0 +1,77 @@
+import asyncio
+import json
+
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from app.core.services.redis import RedisManager
+from app.realtime.connection import frame_data
+from app.realtime.events import user_channel
+from app.realtime.manager import SSEManager
+
+
+@pytest.fixture
+def manager() -> RedisManager:
+    redis_manager = RedisManager()
+    redis_manager.redis_client = FakeAsyncRedis(decode_responses=True)
+    return redis_manager
+
+
+async def _wait_for(condition, timeout: float = 1.0):
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+
+
+class TestSSESubscriptions:
+    """Test per-user channel subscriptions of the SSE manager"""
+
+    @pytest.mark.asyncio
+    async def test_subscribes_only_connected_users(self, manager: RedisManager):
+        """A worker only receives the notifications of its connected users"""
+        sse_manager = SSEManager()
+        listener = asyncio.create_task(sse_manager.start_redis_listener(manager))
+        try:
+            await _wait_for(lambda: sse_manager.pubsub is not None)
+            queue: asyncio.Queue = asyncio.Queue()
+            await sse_manager.add_connection(1, queue)
+
+            assert user_channel(1) in sse_manager.pubsub.channels  # type: ignore
+            assert user_channel(2) not in sse_manager.pubsub.channels  # type: ignore
+
+            await manager.publish(user_channel(2), json.dumps({"id": 2}))
+            await manager.publish(user_channel(1), json.dumps({"id": 1}))
+
+            frame = await asyncio.wait_for(queue.get(), timeout=1)
+            data = json.loads(frame_data(frame))
+            assert data == {"id": 1}
+        finally:
+            listener.cancel()
+
+    @pytest.mark.asyncio
+    async def test_unsubscribes_after_last_connection(self, manager: RedisManager):
+        """The channel is kept while any of the user's connections is open"""
+        sse_manager = SSEManager()
+        first: asyncio.Queue = asyncio.Queue()
+        second: asyncio.Queue = asyncio.Queue()
+        # connected before the listener starts
+        await sse_manager.add_connection(1, first)
+
+        listener = asyncio.create_task(sse_manager.start_redis_listener(manager))
+        try:
+            await _wait_for(lambda: sse_manager.pubsub is not None)
+            pubsub = sse_manager.pubsub
+            await sse_manager.add_connection(1, second)
+            await _wait_for(lambda: user_channel(1) in pubsub.channels)  # type: ignore
+
+            await sse_manager.remove_connection(1, first)
+            assert user_channel(1) in pubsub.channels  # type: ignore
+
+            await sse_manager.remove_connection(1, second)
+            channel = user_channel(1)
+            await _wait_for(lambda: channel not in pubsub.channels)  # type: ignore
+            assert channel not in pubsub.channels  # type: ignore
+            assert 1 not in sse_manager.connections
+        finally:
+            listener.cancel()
@@ -0,0 +1,119 @@
+import asyncio
+import json
+
+import pytest
+from httpx import AsyncClient
+
+from app.main import app
+from app.realtime import websocket as realtime_websocket
+from app.realtime.manager import sse_manager
+from tests.utils.auth_utils import _create_user
+
+
+class _WebSocketClient:
+    """Talks to the app's ASGI websocket interface directly"""
+
+    def __init__(self, path: str, query: str):
+        self.to_app: asyncio.Queue = asyncio.Queue()
+        self.from_app: asyncio.Queue = asyncio.Queue()
+        scope = {
+            "type": "websocket",
+            "asgi": {"version": "3.0"},
+            "scheme": "ws",
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "query_string": query.encode(),
+            "headers": [],
+            "server": ("test", 80),
+            "client": ("test", 1234),
+            "subprotocols": [],
+            "state": {},
+        }
+        self.to_app.put_nowait({"type": "websocket.connect"})
+        self.task = asyncio.create_task(
+            app(scope, self.to_app.get, self.from_app.put)
+        )
+
+    async def receive(self) -> dict:
+        return await asyncio.wait_for(self.from_app.get(), timeout=1)
+
+    async def receive_json(self) -> dict:
+        message = await self.receive()
+        assert message["type"] == "websocket.send", message
+        return json.loads(message["text"])
+
+    def send_json(self, data: dict):
+        message = {"type": "websocket.receive", "text": json.dumps(data)}
+        self.to_app.put_nowait(message)
+
+    async def close(self):
+        self.to_app.put_nowait({"type": "websocket.disconnect", "code": 1000})
+        await asyncio.wait_for(self.task, timeout=1)
+
+
+async def _connect(client: AsyncClient, username: str):
+    headers = await _create_user(client, username)
+    token = headers["Authorization"].removeprefix("Bearer ")
+    resp = await client.get("/api/users/me", headers=headers)
+    user_id = resp.json()["id"]
+
+    socket = _WebSocketClient("/api/ws/notifications", f"token={token}")
+    assert (await socket.receive())["type"] == "websocket.accept"
+    return user_id, socket
+
+
+class TestWebSocketNotifications:
+    """Test the WebSocket transport of real-time notifications"""
+
+    @pytest.mark.asyncio
+    async def test_rejects_invalid_token(self, client: AsyncClient):
+        """The handshake is closed without accepting the socket"""
+        socket = _WebSocketClient("/api/ws/notifications", "token=invalid")
+
+        message = await socket.receive()
+
+        assert message["type"] == "websocket.close"
+        assert message["code"] == 1008
+        await asyncio.wait_for(socket.task, timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_waiting_notifications_are_batched(self, client: AsyncClient):
+        """Notifications queued meanwhile go out in one message"""
+        user_id, socket = await _connect(client, "WsBatchUser")
+        try:
+            await sse_manager.send_to_user(user_id, {"id": 1, "message": "a"})
+            await sse_manager.send_to_user(user_id, {"id": 2, "message": "b"})
+
+            batch = await socket.receive_json()
+            assert batch["type"] == "notifications"
+            assert batch["seq"] == 1
+            events = list(batch["events"])
+            while len(events) < 2:
+                events += (await socket.receive_json())["events"]
+            assert [event["id"] for event in events] == [1, 2]
+            assert events[1]["data"] == {"id": 2, "message": "b"}
+        finally:
+            await socket.close()
+
+        assert user_id not in sse_manager.connections
+
+    @pytest.mark.asyncio
+    async def test_sending_pauses_until_ack(self, client: AsyncClient, monkeypatch):
+        """Only WS_MAX_UNACKED batches are in flight at once"""
+        monkeypatch.setattr(realtime_websocket, "WS_MAX_UNACKED", 1)
+        user_id, socket = await _connect(client, "WsAckUser")
+        try:
+            await sse_manager.send_to_user(user_id, {"id": 1})
+            assert (await socket.receive_json())["seq"] == 1
+
+            await sse_manager.send_to_user(user_id, {"id": 2})
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(socket.from_app.get(), timeout=0.1)
+
+            socket.send_json({"type": "ack", "seq": 1})
+            batch = await socket.receive_json()
+            assert batch["seq"] == 2
+            assert [event["id"] for event in batch["events"]] == [2]
+        finally:
+            await socket.close()
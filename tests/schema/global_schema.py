@@ -6,10 +6,12 @@ T = TypeVar("T")
 
 
 class PaginatedResponse(BaseModel, Generic[T]):
-    total: int
+    total: int | None
     limit: int
     offset: int
     data: List[T]
+    has_more: bool | None = None
+    next_cursor: str | None = None
 
 
 class CommonParams(BaseModel):